@@ -14,6 +14,14 @@
 
 # pylint: disable=wrong-import-order
 # pylint: disable=wrong-import-position
+"""Qiskit Metal.
+
+Only the config, logger, Dict and a few helpers are imported with the package.
+The subpackages and the GUI are imported on first use, see __getattr__, so that
+scripts that only build designs do not load Qt, matplotlib or the analyses.
+"""
+
+import importlib
 
 __version__ = '0.0.3'
 __license__ = "Apache 2.0"
@@ -25,12 +33,21 @@ __status__ = "Development"
 ###########################################################################
 ### Basic Setups
 ## Setup Qt
-def __setup_Qt_backend():
+_QT_BACKEND_IS_SET = False
+
+
+def _setup_Qt_backend():
     """Setup matplotlib to use Qt5's visualization.
 
     This function needs to remain in the __init__ of the library's root
-    to prevent Qt windows from hanging.
+    to prevent Qt windows from hanging. It is called the first time the GUI
+    or the plotting utilities are used, and only sets up once.
     """
+    global _QT_BACKEND_IS_SET  # pylint: disable=global-statement
+    if _QT_BACKEND_IS_SET:
+        return
+    _QT_BACKEND_IS_SET = True
+
     import os
     os.environ["QT_API"] = "pyside2"
 
@@ -84,9 +101,6 @@ def __setup_Qt_backend():
         plt.ion()  # interactive
 
 
-__setup_Qt_backend()
-del __setup_Qt_backend
-
 ## Setup logging
 from . import config
 from .toolbox_python._logging import setup_logger
@@ -108,28 +122,62 @@ from ._is_design import is_design, is_component
 
 # Core modules for user to use
 from .toolbox_metal.parsing import is_true
-from . import qlibrary
-from . import designs
-from . import draw
-from . import renderers
-from . import qgeometries
-from . import analyses
-from . import toolbox_python
-from . import toolbox_metal
-
-# Metal GUI
-from ._gui.main_window import MetalGUI
-
-# Utility modules
-# For plotting in matplotlib;  May be superseded by a renderer?
-from .renderers.renderer_mpl import mpl_toolbox as plt
-
-# Utility functions
-from .toolbox_python.display import Headings
-
-# Import default renderers
-from .renderers import setup_renderers
-
-# Common-use
-from .qlibrary import QComponent
-from .toolbox_metal.about import about, open_docs
+
+# Imported on first use by __getattr__: name -> (module, attribute or None for the module)
+_LAZY_ATTRIBUTES = {
+    # Core modules for user to use
+    'qlibrary': ('.qlibrary', None),
+    'designs': ('.designs', None),
+    'draw': ('.draw', None),
+    'renderers': ('.renderers', None),
+    'qgeometries': ('.qgeometries', None),
+    'analyses': ('.analyses', None),
+    'toolbox_python': ('.toolbox_python', None),
+    'toolbox_metal': ('.toolbox_metal', None),
+    # Metal GUI
+    'MetalGUI': ('._gui.main_window', 'MetalGUI'),
+    # Utility modules
+    # For plotting in matplotlib;  May be superseded by a renderer?
+    'plt': ('.renderers.renderer_mpl.mpl_toolbox', None),
+    # Utility functions
+    'Headings': ('.toolbox_python.display', 'Headings'),
+    # Import default renderers
+    'setup_renderers': ('.renderers', 'setup_renderers'),
+    # Common-use
+    'QComponent': ('.qlibrary', 'QComponent'),
+    'about': ('.toolbox_metal.about', 'about'),
+    'open_docs': ('.toolbox_metal.about', 'open_docs'),
+}
+
+# Need Qt and matplotlib to be set up before they are imported
+_QT_ATTRIBUTES = {'MetalGUI', 'plt'}
+
+
+def __getattr__(name: str):
+    """Import the subpackages and user-accessible objects on first use.
+
+    Args:
+        name (str): Name of the attribute, such as 'designs' or 'MetalGUI'
+
+    Returns:
+        The module or object. It is then stored in the package, so this is
+        called only once per name.
+
+    Raises:
+        AttributeError: The name is not an attribute of qiskit_metal
+    """
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    if name in _QT_ATTRIBUTES:
+        _setup_Qt_backend()
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name, __name__)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -38,6 +38,11 @@ Main Window
 import logging
 from .. import __version__
 
+# Qt and matplotlib have to be set up before the GUI is imported
+from .. import _setup_Qt_backend
+
+_setup_Qt_backend()
+
 from .. import config
 if config.is_building_docs():
     # imported here for the docstrings
@@ -664,7 +664,7 @@ class MetalGUI(QMainWindowBaseHandler):
 
     def refresh_plot(self):
         """Redraw only the plot window contents."""
-        self.plot_win.replot()
+        self.plot_win.replot(clear=False)
 
     def autoscale(self):
         """Shortcut to autoscale all views."""
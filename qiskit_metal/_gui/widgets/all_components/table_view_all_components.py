@@ -156,7 +156,7 @@ class QTableView_AllComponents(QTableView, QWidget_PlaceholderText):
         self.logger.info(f'Deleting {name}')
         self.design.delete_component(name)
         # replot
-        self.gui.plot_win.replot()
+        self.gui.plot_win.replot(clear=False)
 
     def do_menu_rename(self, event):
         """Called when the user clicks the context menu rename.
@@ -93,10 +93,16 @@ class QMainWindowPlot(QMainWindow):
         """Returns the design."""
         return self.gui.design
 
-    def replot(self):
-        """Tells the canvas to replot."""
+    def replot(self, clear: bool = True):
+        """Tells the canvas to replot.
+
+        Args:
+            clear (bool): True to clear the canvas and draw every component
+                again, False to draw only the components that changed.
+                Defaults to True.
+        """
         # self.logger.debug("Force replot")
-        self.canvas.plot()
+        self.canvas.plot(clear=clear)
 
     def auto_scale(self):
         """Tells the canvas to perform an automatic scale."""
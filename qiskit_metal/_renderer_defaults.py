@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2017, 2021.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+"""File contains the columns that the renderers add to the QGeometry tables.
+
+They are the element_table_data of the renderer classes, and are declared in
+config.renderers_to_load too, so that a QDesign can add these columns without
+importing the renderers.  This file must not import any renderer.
+"""
+
+ANSYS_ELEMENT_TABLE_DATA = dict(
+    path=dict(wire_bonds=False),
+    # Same as the Lj, Cj, _Rj and max_mesh_length_jj of
+    # QAnsysRenderer.default_options
+    junction=dict(inductance='10nH',
+                  capacitance=0,
+                  resistance=0,
+                  mesh_kw_jj=7e-06))
+"""Element table data of QAnsysRenderer, QHFSSRenderer and QQ3DRenderer"""
+
+GDS_ELEMENT_TABLE_DATA = dict(
+    # Cell_name must exist in gds file with: path_filename
+    junction=dict(cell_name='my_other_junction'))
+"""Element table data of QGDSRenderer"""
@@ -21,17 +21,26 @@ Mostly internal.
 
 from .toolbox_python.attr_dict import Dict
 from ._defaults import DefaultMetalOptions, DefaultOptionsRenderer
+from ._renderer_defaults import ANSYS_ELEMENT_TABLE_DATA, GDS_ELEMENT_TABLE_DATA
 
 renderers_to_load = Dict(
     hfss=Dict(path_name='qiskit_metal.renderers.renderer_ansys.hfss_renderer',
-              class_name='QHFSSRenderer'),
+              class_name='QHFSSRenderer',
+              element_table_data=ANSYS_ELEMENT_TABLE_DATA),
     q3d=Dict(path_name='qiskit_metal.renderers.renderer_ansys.q3d_renderer',
-             class_name='QQ3DRenderer'),
+             class_name='QQ3DRenderer',
+             element_table_data=ANSYS_ELEMENT_TABLE_DATA),
     gds=Dict(path_name='qiskit_metal.renderers.renderer_gds.gds_renderer',
-             class_name='QGDSRenderer'),
+             class_name='QGDSRenderer',
+             element_table_data=GDS_ELEMENT_TABLE_DATA),
 )
 """
 Define the renderes to load. Just provide the module names here.
+
+If element_table_data is given, it must be the same as the element_table_data of
+the renderer class, so both are taken from _renderer_defaults. The renderer is
+then only imported and instantiated by a QDesign on first access, such as
+design.renderers.gds. Otherwise, it is instantiated with every QDesign.
 """
 
 GUI_CONFIG = Dict(
@@ -56,7 +65,7 @@ GUI_CONFIG = Dict(
     logger=Dict(
         style=
         ".DEBUG {color: green;}\n.WARNING,.ERROR,.CRITICAL {color: red;}\n.'\
-                'ERROR,.CRITICAL {font-weight: bold;}\n",
+                'ERROR,.CRITICAL {font-weight: bold;}\n"                                                        ,
         num_lines=500,
         level='DEBUG',
         stream_to_std=False,  # stream to jupyter notebook
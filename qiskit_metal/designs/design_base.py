@@ -13,16 +13,20 @@
 # that they have been altered from the originals.
 """The base class of all QDesigns in Qiskit Metal."""
 
+import heapq
 import importlib
+import zipfile
 #import inspect
 #import os
+from collections.abc import Mapping
 from datetime import datetime
 from typing import Any, Dict as Dict_, Iterable, List, TYPE_CHECKING, Union
 
 import pandas as pd
 
 from qiskit_metal.qgeometries.qgeometries_handler import QGeometryTables
-from qiskit_metal.toolbox_metal.parsing import is_true, parse_options, parse_value
+from qiskit_metal.toolbox_metal.parsing import is_true, parse_options, parse_value_cached
+from qiskit_metal.toolbox_metal.parsing import VariablesDict, VariableUseRecorder
 from qiskit_metal.designs.interface_components import Components
 from qiskit_metal.designs.net_info import QNet
 from qiskit_metal import Dict, config, logger
@@ -31,6 +35,7 @@ from qiskit_metal.toolbox_metal.exceptions import QiskitMetalDesignError
 
 if not config.is_building_docs():
     from qiskit_metal.toolbox_metal.import_export import load_metal_design, save_metal
+    from qiskit_metal.toolbox_metal.import_export import load_metal_archive, save_metal_archive
     from qiskit_metal.toolbox_python._logging import LogStore
 
 if TYPE_CHECKING:
@@ -44,6 +49,98 @@ __all__ = ['QDesign']
 #:ivar var1: initial value: par2
 
 
+class _RendererRegistry(Mapping):
+    """The renderers of a design, by name, such as design.renderers.gds.
+
+    Renderers can be registered by their module and class name, in which case
+    the module is imported and the renderer instantiated on first access.  The
+    element_table_data declared for it is then checked against its class.
+    """
+
+    def __init__(self, design: 'QDesign'):
+        """
+        Args:
+            design (QDesign): The design the renderers are instantiated with.
+        """
+        self._design = design
+        # Renderer name -> (path_name, class_name, element_table_data), for
+        # renderers not yet instantiated.
+        self._deferred = dict()
+        self._instances = dict()
+
+    def register_deferred(self,
+                          name: str,
+                          path_name: str,
+                          class_name: str,
+                          element_table_data: dict = None):
+        """Register a renderer to be instantiated on first access.
+
+        Args:
+            name (str): Name of the renderer, such as 'gds'
+            path_name (str): Module of the renderer class
+            class_name (str): Name of the renderer class
+            element_table_data (dict): The element_table_data declared for the
+                                       renderer in config.  Defaults to None.
+        """
+        self._deferred[name] = (path_name, class_name, element_table_data)
+
+    def is_instantiated(self, name: str) -> bool:
+        """Has the renderer been instantiated?
+
+        Args:
+            name (str): Name of the renderer, such as 'gds'
+
+        Returns:
+            bool: True if the renderer is instantiated
+        """
+        return name in self._instances
+
+    def __setitem__(self, name: str, renderer: 'QRenderer'):
+        self._deferred.pop(name, None)
+        self._instances[name] = renderer
+
+    def __getitem__(self, name: str) -> 'QRenderer':
+        if name not in self._instances:
+            if name not in self._deferred:
+                raise KeyError(name)
+            path_name, class_name, element_table_data = self._deferred[name]
+            # pylint: disable=protected-access
+            renderer = self._design._instantiate_renderer(
+                name, path_name, class_name)
+            if renderer is None:
+                raise KeyError(name)
+            if (element_table_data is not None and
+                    renderer.element_table_data != element_table_data):
+                self._design.logger.warning(
+                    f'Renderer={name}: the element_table_data in '
+                    f'config.renderers_to_load is not the same as '
+                    f'{class_name}.element_table_data.  Components built '
+                    f'before have the columns declared in config.')
+            self[name] = renderer
+        return self._instances[name]
+
+    def __getattr__(self, name: str) -> 'QRenderer':
+        if name.startswith('_'):
+            # Do not look up private attributes, such as in unpickling
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError as error:
+            raise AttributeError(
+                f'No renderer named {name!r} in the design.') from error
+
+    def __iter__(self):
+        yield from self._instances
+        yield from (
+            name for name in self._deferred if name not in self._instances)
+
+    def __len__(self):
+        return len(self._instances) + len(self._deferred)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self)})'
+
+
 class QDesign():
     """QDesign is the base class for Qiskit Metal Designs.
 
@@ -112,7 +209,25 @@ class QDesign():
         # Cache for component ids.  Hold the reverse of _components dict,
         self.name_to_id = Dict()
 
-        self._variables = Dict()
+        # Dependency graph between components, by component id.
+        # _dependency_children[parent_id] is the set of ids which depend on parent_id,
+        # _dependency_parents[child_id] is the set of ids on which child_id depends.
+        # Populated by add_dependency() and from the pin_inputs of the components.
+        self._dependency_children = dict()
+        self._dependency_parents = dict()
+        # The parents of each component that came from its pin_inputs.
+        # Replaced every time the component is rebuilt.
+        self._pin_input_parents = dict()
+
+        # Reverse index of the design variables read by each component during make().
+        # _variable_readers[variable_name] is the set of ids of components which read it,
+        # _component_variables[component_id] is the set of variable names it read.
+        self._variable_readers = dict()
+        self._component_variables = dict()
+        # Stack of the sets of variable names being recorded. See parse_value().
+        self._variable_recordings = []
+
+        self._variables = VariablesDict()
         self._chips = Dict()
 
         self._metadata = self._init_metadata()
@@ -146,8 +261,8 @@ class QDesign():
         # junction, poly etc.
         self.renderer_defaults_by_table = Dict()
 
-        # Instantiate and register renderers to Qdesign.renderers
-        self._renderers = Dict()
+        # Register renderers to Qdesign.renderers, they are instantiated on first use
+        self._renderers = _RendererRegistry(self)
         if enable_renderers:
             self._start_renderers()
 
@@ -194,8 +309,10 @@ class QDesign():
         return self._template_options
 
     @property
-    def renderers(self) -> Dict:
-        """Return a Dict of all the renderers registered within QDesign."""
+    def renderers(self) -> Mapping:
+        """Return a Mapping of all the renderers registered within QDesign.
+        Renderers are instantiated on first access, such as design.renderers.gds
+        """
 
         return self._renderers
 
@@ -298,7 +415,89 @@ class QDesign():
         values = list(self._variables.values())
 
         keys[keys.index(old_key)] = new_key
-        self._variables = Dict(zip(keys, values))
+        self._variables = VariablesDict(zip(keys, values))
+
+    def set_variable(self,
+                     name: str,
+                     value: Any,
+                     rebuild: bool = True) -> List[str]:
+        """Set the value of a design variable, and rebuild only the components
+        that used the variable during their last make(), together with the
+        components that depend on them.
+
+        Args:
+            name (str): Name of the variable, such as 'cpw_width'.
+            value (Any): New value, such as '12um'.
+            rebuild (bool): Rebuild the components that use the variable.
+                            Defaults to True.
+
+        Returns:
+            List[str]: Names of the components that were rebuilt, in order.
+        """
+        self._variables[name] = value
+        if not rebuild:
+            return []
+
+        to_rebuild = set(self._variable_readers.get(name, set()))
+        for component_id in list(to_rebuild):
+            to_rebuild |= self._get_downstream_ids(component_id)
+
+        rebuilt = []
+        for component_id in self._topological_order(to_rebuild):
+            self._components[component_id].rebuild()
+            rebuilt.append(self._components[component_id].name)
+        return rebuilt
+
+    def get_components_using_variable(self, name: str) -> List[str]:
+        """Get the names of the components that read a design variable during
+        their last make().
+
+        Args:
+            name (str): Name of the variable.
+
+        Returns:
+            List[str]: Names of the components, in order of creation.
+        """
+        return [
+            self._components[component_id].name
+            for component_id in sorted(self._variable_readers.get(name, set()))
+        ]
+
+    def _begin_variable_recording(self):
+        """Start recording the design variables read by parse_value.
+
+        Called by QComponent.rebuild() around make(). Must be matched by
+        _end_variable_recording().
+        """
+        self._variable_recordings.append(set())
+
+    def _end_variable_recording(self, component_id: int):
+        """Stop recording, and store the variables read as the ones used by
+        a component.
+
+        Args:
+            component_id (int): ID of the component that was made.
+        """
+        used = self._variable_recordings.pop()
+        self._set_variables_read_by_component(component_id, used)
+
+    def _set_variables_read_by_component(self, component_id: int, names: set):
+        """Replace the variables read by a component in the reverse index.
+
+        Args:
+            component_id (int): ID of the component.
+            names (set): Names of the variables. Empty to remove the component.
+        """
+        for name in self._component_variables.pop(component_id, set()):
+            readers = self._variable_readers.get(name)
+            if readers is not None:
+                readers.discard(component_id)
+                if not readers:
+                    self._variable_readers.pop(name)
+        if names:
+            self._component_variables[component_id] = names
+            for name in names:
+                self._variable_readers.setdefault(name, set()).add(component_id)
 
     def delete_all_pins(self) -> 'QNet':
         """Clear all pins in the net_Info and update the pins in components.
@@ -426,6 +625,13 @@ class QDesign():
         self.name_to_id.clear()
         self._components.clear()
 
+        self._dependency_children.clear()
+        self._dependency_parents.clear()
+        self._pin_input_parents.clear()
+
+        self._variable_readers.clear()
+        self._component_variables.clear()
+
         self._qgeometry.clear_all_tables()
 
     def _get_new_qcomponent_id(self):
@@ -453,8 +659,15 @@ class QDesign():
 
     def rebuild(self):  # remake_all_components
         """Remakes all components with their current parameters."""
-        for _, obj in self._components.items():  # pylint: disable=unused-variable
-            obj.rebuild()
+        # Each component deletes only its own rows, through the row index of the
+        # tables, so rows that no component owns are kept. The new rows are
+        # buffered by the tables and appended in a single pass when done.
+        try:
+            # Parents are made before the components that depend on them.
+            for component_id in self._topological_order(self._components):
+                self._components[component_id].rebuild()
+        finally:
+            self._qgeometry.flush_buffers()
 
     def reload_and_rebuild_components(self, qis_abs_path: str):
         """
@@ -644,6 +857,9 @@ class QDesign():
             # pins of component to delete.
             self._qnet.delete_all_pins_for_component(component_id)
 
+            self._delete_dependencies_of_component(component_id)
+            self._set_variables_read_by_component(component_id, set())
+
             # Even though the qgeometry table has string for component_id, dataframe is
             # storing as an integer.
             self._qgeometry.delete_component_id(component_id)
@@ -753,26 +969,34 @@ class QDesign():
 #########I/O###############################################################
 
     @classmethod
-    def load_design(cls, path: str):
+    def load_design(cls, path: str, rebuild: bool = False):
         """Load a Metal design from a saved Metal file. Will also update
         default dictionaries. (Class method).
 
         Args:
             path (str): Path to saved Metal design.
+            rebuild (bool): For a design saved with structured=True, make the
+                            components from their options instead of restoring
+                            the QGeometry tables.  Defaults to False.
 
         Returns:
             QDesign: Loaded metal design.
         """
         logger.warning("Loading is a beta feature.")
+        if zipfile.is_zipfile(path):
+            return load_metal_archive(path, rebuild=rebuild)
         design = load_metal_design(path)
         return design
 
-    def save_design(self, path: str = None):
+    def save_design(self, path: str = None, structured: bool = False):
         """Save the metal design to a Metal file. If no path is given, then
         tried to use self.save_path if it is set.
 
         Args:
             path (str): Path to save the design to.  Defaults to None.
+            structured (bool): Save as a zip archive of json and columnar
+                               QGeometry tables, instead of a pickle. See
+                               toolbox_metal.import_export.  Defaults to False.
 
         Returns:
             bool: True if successful; False if failure
@@ -793,7 +1017,10 @@ class QDesign():
 
         # Do the actual saving
         self.logger.info(f'Saving design to {path}')
-        result = save_metal(path, self)
+        if structured:
+            result = save_metal_archive(path, self)
+        else:
+            result = save_metal(path, self)
         if result:
             self.logger.info('Saving successful.')
         else:
@@ -847,7 +1074,7 @@ class QDesign():
             See the docstring for this module.
                 qiskit_metal.toolbox_metal.parsing
         """
-        return parse_value(value, self.variables)
+        return parse_value_cached(value, self._variables_for_parsing())
 
     def parse_options(self, params: dict, param_names: str) -> dict:
         """Extra utility function that can call parse_value on individual
@@ -862,7 +1089,21 @@ class QDesign():
         Returns:
             dict: Dictionary of the keys contained in `param_names` with values that are parsed.
         """
-        return parse_options(params, param_names, variable_dict=self.variables)
+        return parse_options(params,
+                             param_names,
+                             variable_dict=self._variables_for_parsing())
+
+    def _variables_for_parsing(self) -> Union[Dict, VariableUseRecorder]:
+        """The variables to parse with. While a component is being made, they
+        record the names of the variables that it uses.
+
+        Returns:
+            Union[Dict, VariableUseRecorder]: The design variables
+        """
+        if self._variable_recordings:
+            return VariableUseRecorder(self.variables,
+                                       self._variable_recordings[-1])
+        return self.variables
 
     def get_design_name(self) -> str:
         """Get the name of the design from the metadata.
@@ -893,13 +1134,59 @@ class QDesign():
 ####################################################################################
 # Dependencies
 
+    def _get_component_id(self, component: Union[str, int]) -> Union[int, None]:
+        """Get the id of a component from its name or id.
+
+        Args:
+            component (Union[str, int]): Name or id of the component.
+
+        Returns:
+            Union[int, None]: The id, or None if the component is not in the design.
+        """
+        if isinstance(component, str):
+            return self.name_to_id.get(component, None)
+        if component in self._components:
+            return component
+        return None
+
     def add_dependency(self, parent: str, child: str):
         """Add a dependency between one component and another.
 
+        A dependency that would make a cycle is not added.
+
         Args:
             parent (str): The component on which the child depends.
             child (str): The child cannot live without the parent.
         """
+        parent_id = self._get_component_id(parent)
+        child_id = self._get_component_id(child)
+        if parent_id is None or child_id is None:
+            self.logger.warning(
+                f'Called add_dependency, parent={parent}, child={child}, but '
+                f'one of them is not in design.components dictionary.')
+            return
+        self._add_dependency_id(parent_id, child_id)
+
+    def _add_dependency_id(self, parent_id: int, child_id: int) -> bool:
+        """Add a dependency between two component ids, unless it makes a
+        cycle.
+
+        Args:
+            parent_id (int): The component on which the child depends.
+            child_id (int): The child cannot live without the parent.
+
+        Returns:
+            bool: True if the dependency is in the graph.
+        """
+        if parent_id == child_id or parent_id in self._get_downstream_ids(
+                child_id):
+            self.logger.warning(
+                f'Dependency of component_id={child_id} on component_id='
+                f'{parent_id} was not added, since it would make a cycle.')
+            return False
+        self._dependency_children.setdefault(parent_id, set()).add(child_id)
+        self._dependency_parents.setdefault(child_id, set()).add(parent_id)
+        return True
 
     def remove_dependency(self, parent: str, child: str):
         """Remove a dependency between one component and another.
@@ -908,17 +1195,138 @@ class QDesign():
             parent (str): The component on which the child depends.
             child (str): The child cannot live without the parent.
         """
+        parent_id = self._get_component_id(parent)
+        child_id = self._get_component_id(child)
+        self._remove_dependency_id(parent_id, child_id)
+
+    def _remove_dependency_id(self, parent_id: int, child_id: int):
+        """Remove a dependency between two component ids, if it exists.
+
+        Args:
+            parent_id (int): The component on which the child depends.
+            child_id (int): The child cannot live without the parent.
+        """
+        self._dependency_children.get(parent_id, set()).discard(child_id)
+        self._dependency_parents.get(child_id, set()).discard(parent_id)
+
+    def _update_pin_input_dependencies(self, component: 'QComponent'):
+        """Replace the dependencies of a component which come from the
+        components named in its options.pin_inputs.
+
+        Called by QComponent.rebuild(), since the options may have changed.
+
+        Args:
+            component (QComponent): The component that depends on the pins.
+        """
+        child_id = component.id
+        for parent_id in self._pin_input_parents.pop(child_id, set()):
+            self._remove_dependency_id(parent_id, child_id)
+
+        pin_inputs = component.options.get('pin_inputs', None)
+        if not isinstance(pin_inputs, dict):
+            return
+
+        parents = set()
+        for pin_input in pin_inputs.values():
+            if not isinstance(pin_input, dict):
+                continue
+            parent_id = self._get_component_id(pin_input.get('component', ''))
+            if parent_id is not None and self._add_dependency_id(
+                    parent_id, child_id):
+                parents.add(parent_id)
+        if parents:
+            self._pin_input_parents[child_id] = parents
+
+    def _delete_dependencies_of_component(self, component_id: int):
+        """Remove a component from the dependency graph.
+
+        Args:
+            component_id (int): ID of the component.
+        """
+        for child_id in self._dependency_children.pop(component_id, set()):
+            self._dependency_parents.get(child_id, set()).discard(component_id)
+        for parent_id in self._dependency_parents.pop(component_id, set()):
+            self._dependency_children.get(parent_id,
+                                          set()).discard(component_id)
+        self._pin_input_parents.pop(component_id, None)
+
+    def _get_downstream_ids(self, component_id: int) -> set:
+        """Get the ids of all the components which depend, directly or not, on
+        a component.
+
+        Args:
+            component_id (int): ID of the component.
+
+        Returns:
+            set: IDs of the dependent components, not including component_id.
+        """
+        downstream = set()
+        to_visit = [component_id]
+        while to_visit:
+            for child_id in self._dependency_children.get(to_visit.pop(), ()):
+                if child_id not in downstream:
+                    downstream.add(child_id)
+                    to_visit.append(child_id)
+        return downstream
+
+    def _topological_order(self, component_ids: Iterable[int]) -> List[int]:
+        """Sort component ids so that each component comes after the components
+        it depends on. Otherwise, the ids are kept in order of creation.
+
+        Args:
+            component_ids (Iterable[int]): IDs to sort.
+
+        Returns:
+            List[int]: The sorted ids.
+        """
+        component_ids = set(component_ids)
+        num_parents = {
+            component_id:
+                len(
+                    self._dependency_parents.get(component_id, set()) &
+                    component_ids) for component_id in component_ids
+        }
+        ready = [
+            component_id for component_id, count in num_parents.items()
+            if count == 0
+        ]
+        heapq.heapify(ready)
+
+        ordered = []
+        while ready:
+            component_id = heapq.heappop(ready)
+            ordered.append(component_id)
+            for child_id in self._dependency_children.get(component_id, ()):
+                if child_id in num_parents:
+                    num_parents[child_id] -= 1
+                    if num_parents[child_id] == 0:
+                        heapq.heappush(ready, child_id)
+        return ordered
 
     def update_component(self, component_name: str, dependencies: bool = True):
         """Update the component and any dependencies it may have. Mediator type
         function to update all children.
 
+        Only the component and the components which depend on it, such as the
+        routes connected to its pins, are rebuilt, in dependency order.
+
         Args:
             component_name (str): Component name to update
             dependencies (bool): True to update all dependencies.  Defaults to True.
         """
-        # Get dependency graph
-        # Remake components in order
+        component_id = self._get_component_id(component_name)
+        if component_id is None:
+            self.logger.warning(
+                f'Called update_component, component_name={component_name}, '
+                f'but it is not in design.components dictionary.')
+            return
+
+        to_rebuild = {component_id}
+        if dependencies:
+            to_rebuild |= self._get_downstream_ids(component_id)
+
+        for an_id in self._topological_order(to_rebuild):
+            self._components[an_id].rebuild()
 
 
 ######### Renderers ###############################################################
@@ -926,9 +1334,13 @@ class QDesign():
     def _start_renderers(self):
         """Start the renderers.
 
-        First import the renderers identified in
-        config.renderers_to_load. Then register them into QDesign.
-        Finally populate self.renderer_defaults_by_table
+        Register the renderers identified in config.renderers_to_load into
+        QDesign, and populate self.renderer_defaults_by_table.
+
+        Renderers which declare their element_table_data in config are only
+        imported and instantiated on first access to design.renderers.<name>.
+        The others are imported and instantiated now, since their columns in the
+        QGeometry tables are only known from their class.
         """
 
         for renderer_key, import_info in config.renderers_to_load.items():
@@ -950,30 +1362,77 @@ class QDesign():
                 )
                 continue
 
-            # check if module_name exists
-            if importlib.util.find_spec(path_name):
-                class_renderer = getattr(importlib.import_module(path_name),
-                                         class_name, None)
-
-                # check if class_name is in module
-                if class_renderer is not None:
-                    a_renderer = class_renderer(self)
-
-                    # register renderers here.
-                    self._renderers[renderer_key] = a_renderer
-                else:
-                    self.logger.warning(
-                        f'Renderer={renderer_key} is not registered in QDesign.  '
-                        f'The class_name={class_name} was not found.')
-                    continue
-            else:
-                self.logger.warning(
-                    f'Renderer={renderer_key} is not registered in QDesign.  '
-                    f'The module_name={path_name} was not found.')
+            if 'element_table_data' in import_info:
+                self._declare_renderer_table_data(
+                    renderer_key, import_info.element_table_data)
+                self._renderers.register_deferred(
+                    renderer_key, path_name, class_name,
+                    import_info.element_table_data)
                 continue
 
-        for _, a_render in self._renderers.items():
-            a_render.add_table_data_to_QDesign(a_render.name)
+            a_renderer = self._instantiate_renderer(renderer_key, path_name,
+                                                    class_name)
+            if a_renderer is not None:
+                # register renderers here.
+                self._renderers[renderer_key] = a_renderer
+
+    def _declare_renderer_table_data(self, renderer_key: str,
+                                     element_table_data: dict):
+        """Add the columns of a renderer to the QGeometry tables and populate
+        self.renderer_defaults_by_table, without importing the renderer.
+
+        Does what QRenderer.load() and QRenderer.add_table_data_to_QDesign() do
+        when the renderer is instantiated.
+
+        Args:
+            renderer_key (str): Name of the renderer, such as 'gds'
+            element_table_data (dict): Table -> column name -> default value,
+                                       as the element_table_data of the renderer class.
+        """
+        QGeometryTables.add_renderer_extension(
+            renderer_key, {
+                table: {
+                    col_name: type(col_value)
+                    for col_name, col_value in a_dict.items()
+                } for table, a_dict in element_table_data.items()
+            })
+        for table, a_dict in element_table_data.items():
+            for col_name, col_value in a_dict.items():
+                self.add_default_data_for_qgeometry_tables(
+                    table, renderer_key, col_name, col_value)
+
+    def _instantiate_renderer(self, renderer_key: str, path_name: str,
+                              class_name: str) -> Union['QRenderer', None]:
+        """Import and instantiate a renderer for the design.
+
+        Args:
+            renderer_key (str): Name of the renderer, such as 'gds'
+            path_name (str): Module of the renderer class
+            class_name (str): Name of the renderer class
+
+        Returns:
+            Union[QRenderer, None]: The renderer, None if it could not be imported.
+        """
+        # check if module_name exists
+        if not importlib.util.find_spec(path_name):
+            self.logger.warning(
+                f'Renderer={renderer_key} is not registered in QDesign.  '
+                f'The module_name={path_name} was not found.')
+            return None
+
+        class_renderer = getattr(importlib.import_module(path_name), class_name,
+                                 None)
+
+        # check if class_name is in module
+        if class_renderer is None:
+            self.logger.warning(
+                f'Renderer={renderer_key} is not registered in QDesign.  '
+                f'The class_name={class_name} was not found.')
+            return None
+
+        a_renderer = class_renderer(self)
+        a_renderer.add_table_data_to_QDesign(a_renderer.name)
+        return a_renderer
 
     def add_default_data_for_qgeometry_tables(self, table_name: str,
                                               renderer_name: str,
@@ -12,6 +12,8 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 
+import importlib
+
 import shapely
 import shapely.wkt as wkt
 
@@ -23,10 +25,44 @@ from shapely.ops import cascaded_union
 
 from . import basic
 from . import utility
-from . import mpl
 
 # Useful functions
 from .utility import get_poly_pts, Vector
 from .basic import rectangle, is_rectangle, flip_merge, rotate, translate, scale, buffer,\
     rotate_position, _iter_func_geom_, union, subtract
-from .mpl import render, figure_spawn
+
+# Imported on first use by __getattr__, since they load Qt and matplotlib:
+# name -> (module, attribute or None for the module)
+_LAZY_ATTRIBUTES = {
+    'mpl': ('.mpl', None),
+    'render': ('.mpl', 'render'),
+    'figure_spawn': ('.mpl', 'figure_spawn'),
+}
+
+
+def __getattr__(name: str):
+    """Import the matplotlib draw functions on first use.
+
+    Args:
+        name (str): Name of the attribute, such as 'mpl' or 'render'
+
+    Returns:
+        The module or function. It is then stored in the package, so this is
+        called only once per name.
+
+    Raises:
+        AttributeError: The name is not an attribute of qiskit_metal.draw
+    """
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name, __name__)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
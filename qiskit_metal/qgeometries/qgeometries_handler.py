@@ -18,6 +18,7 @@ See the docstring of `QGeometryTables`
 
 import inspect
 import logging
+import numpy as np
 import pandas as pd
 import shapely
 
@@ -30,7 +31,9 @@ from .. import Dict
 from ..draw import BaseGeometry
 from qiskit_metal.draw.utility import round_coordinate_sequence
 
+from shapely.geometry import box
 from shapely.geometry.multipolygon import MultiPolygon  #to avoid MultiPolygons
+from shapely.strtree import STRtree
 from .. import config
 if not config.is_building_docs():
     from qiskit_metal.toolbox_python.utility_functions import get_range_of_vertex_to_not_fillet, data_frame_empty_typed
@@ -254,6 +257,34 @@ class QGeometryTables(object):
 
         self._tables = Dict()
 
+        # Rows from add_qgeometry that have not been appended to their table yet.
+        # Key is the table name, value is a dict of column name -> list of values.
+        # See flush_buffers().
+        self._buffers = dict()
+        # Key is the table name, value is the set of component ids in the buffer.
+        self._buffered_components = dict()
+
+        # Key is the table name, value is a tuple of the table object that was
+        # indexed and a dict of component id -> list of row positions (iloc).
+        # See _get_row_index().
+        self._row_index = dict()
+        # Key is the table name, value is the set of row positions of deleted
+        # rows which are still in the table.  See _drop_deleted_rows().
+        self._deleted_rows = dict()
+
+        # Key is the table name, value is a tuple of the table object that was
+        # indexed, its STRtree and the data needed to map hits back to rows.
+        # Built on first use by query(). See _get_spatial_index().
+        self._spatial_index = dict()
+
+        # Key is the component id, value is the revision of its rows.  Deleting
+        # the rows of a component, as rebuilding it does, gives it a new
+        # revision.  Clearing the tables gives every component a new revision.
+        # See get_component_revision().
+        self._revision = 0
+        self._cleared_revision = 0
+        self._component_revisions = dict()
+
         # Need to call after columns are added by add_renderer_extension is run by all the renderers.
         # self.create_tables()
 
@@ -271,12 +302,110 @@ class QGeometryTables(object):
     def tables(self) -> Dict_[str, GeoDataFrame]:
         """The dictionary of tables containing qgeometry.
 
+        Any rows still waiting in the append buffers are flushed into
+        the tables first, and deleted rows are removed.
+
         Returns:
             Dict_[str, GeoDataFrame]: The keys of this dictionary are
             also obtained from `self.get_element_types()`
         """
+        self.flush_buffers()
+        for table_name in list(self._deleted_rows.keys()):
+            self._drop_deleted_rows(table_name)
         return self._tables
 
+    def flush_buffers(self, kind: str = None):
+        """Append the buffered rows from add_qgeometry to their tables.
+
+        Rows are collected as per-column lists and only turned into a
+        GeoDataFrame here, so that adding n elements costs a single
+        concatenation rather than n copies of the table.
+
+        Args:
+            kind (str): Name of the table to flush.  Defaults to None,
+                        which flushes all the tables.
+        """
+        kinds = [kind] if kind else list(self._buffers.keys())
+        for table_name in kinds:
+            buffer = self._buffers.pop(table_name, None)
+            self._buffered_components.pop(table_name, None)
+            if not buffer or not buffer['name']:
+                continue
+
+            row_index = self._get_row_index(table_name)
+            offset = len(self._tables[table_name])
+            for position, component_id in enumerate(buffer['component'],
+                                                    offset):
+                row_index.setdefault(component_id, []).append(position)
+
+            df = GeoDataFrame(buffer)
+            table = pd.concat([self._tables[table_name], df],
+                              sort=False,
+                              ignore_index=True)
+            self._tables[table_name] = table
+            self._row_index[table_name] = (table, row_index)
+
+    def _get_row_index(self, table_name: str) -> Dict_[Any, List[int]]:
+        """Get the index of the rows of each component in a table.
+
+        The index is kept up to date by add, delete and rename.  If the table
+        was replaced from outside of this class, the index is rebuilt.
+
+        Args:
+            table_name (str): Name of element table (e.g., 'poly')
+
+        Returns:
+            Dict_[Any, List[int]]: Key is component id, value is the list of
+            row positions (for iloc) of the component in the table.
+        """
+        table = self._tables[table_name]
+        indexed = self._row_index.get(table_name)
+        if indexed is None or indexed[0] is not table:
+            # Rows marked as deleted refer to the table that was replaced.
+            self._deleted_rows.pop(table_name, None)
+            row_index = dict()
+            for position, component_id in enumerate(table['component']):
+                row_index.setdefault(component_id, []).append(position)
+            indexed = (table, row_index)
+            self._row_index[table_name] = indexed
+        return indexed[1]
+
+    def _drop_deleted_rows(self, table_name: str):
+        """Remove the rows marked as deleted by delete_component_id from a
+        table.
+
+        Deleting only marks the rows, so that rebuilding a component does not
+        copy the table. The copy is done once here, when the table is read.
+
+        Args:
+            table_name (str): Name of element table (e.g., 'poly')
+        """
+        deleted = self._deleted_rows.pop(table_name, None)
+        if not deleted:
+            return
+        table = self._tables[table_name]
+        keep = np.ones(len(table), dtype=bool)
+        keep[list(deleted)] = False
+        self._tables[table_name] = table[keep]
+        # Positions have shifted, rebuild on next use.
+        self._row_index.pop(table_name, None)
+
+    def _get_component_rows(self, table_name: str,
+                            component_id: Any) -> GeoDataFrame:
+        """Return the rows of a component in a table, using the row index.
+
+        Args:
+            table_name (str): Name of element table (e.g., 'poly')
+            component_id (Any): Unique id of the component
+
+        Returns:
+            GeoDataFrame: Rows of the component, in table order
+        """
+        if component_id in self._buffered_components.get(table_name, ()):
+            self.flush_buffers(table_name)
+        positions = self._get_row_index(table_name).get(component_id, [])
+        return self._tables[table_name].iloc[positions]
+
     @classmethod
     def add_renderer_extension(cls, renderer_name: str, qgeometry: dict):
         """Add renderer element extension to ELEMENT_COLUMNS. Called when the
@@ -375,7 +504,7 @@ class QGeometryTables(object):
             table.name = table_name
 
             # Assign
-            self.tables[table_name] = table
+            self._tables[table_name] = table
 
     def _validate_column_dictionary(self, table_name: str, column_dict: dict):
         """Validate A possible error here is if the user did not pass a valid
@@ -473,6 +602,7 @@ class QGeometryTables(object):
                 f'name = `{component_name}`.\n'
                 f' The call was with subtract={subtract} and helper={helper}'
                 f' and layer={layer}, and options={other_options}')
+            return
 
         #Checks if (any) of the geometry are MultiPolygons, and breaks them up into
         #individual polygons. Rounds the coordinate sequences of those values to avoid
@@ -512,23 +642,27 @@ class QGeometryTables(object):
         #        options[keyC] = ???[keyC] -> alternative manner to pass options to the add_qgeometry function?
         #                                       instead have the add_qeometry in baseComponent generate the dict?
 
-        #Could we just append rather than make a new table each time? This seems slow
-        table = self.tables[kind]
+        # Buffer the rows as columns, the table is only rebuilt when it is read.
+        # See flush_buffers().
+        names = list(geometry.keys())
+        num_rows = len(names)
+        if num_rows == 0:
+            return
 
-        # assert that all names in options are in table columns! TODO: New approach will not be wanting
-        #to do this (maybe check that all columns are in options?)
-        df = GeoDataFrame.from_dict(geometry,
-                                    orient='index',
-                                    columns=['geometry'])
-        df.index.name = 'name'
-        df = df.reset_index()
+        new_columns = dict(name=names, geometry=list(geometry.values()))
+        for key, value in options.items():
+            new_columns[key] = [value] * num_rows
 
-        df = df.assign(**options)
+        buffer = self._buffers.setdefault(kind, dict())
+        self._buffered_components.setdefault(kind, set()).add(component_name)
+        num_buffered = len(buffer['name']) if buffer else 0
 
-        # Set new table. Unfortunately, this creates a new instance. Can just direct append
-        self.tables[kind] = table.append(df, sort=False, ignore_index=True)
-        # concat([table,df], axis=0, join='outer', ignore_index=True,sort=False,
-        #          verify_integrity=False, copy=False)
+        # Columns not given by every call are NaN, as they would be from an append.
+        for column in new_columns:
+            if column not in buffer:
+                buffer[column] = [np.nan] * num_buffered
+        for column, values in buffer.items():
+            values.extend(new_columns.get(column, [np.nan] * num_rows))
 
     def check_lengths(self, geometry: shapely.geometry.base.BaseGeometry,
                       kind: str, component_name: str, layer: Union[int, str],
@@ -592,7 +726,15 @@ class QGeometryTables(object):
 
         Use when clearing a design and starting from scratch.
         """
-        self.tables.clear()
+        self._buffers.clear()
+        self._buffered_components.clear()
+        self._row_index.clear()
+        self._deleted_rows.clear()
+        self._spatial_index.clear()
+        self._revision += 1
+        self._cleared_revision = self._revision
+        self._component_revisions.clear()
+        self._tables.clear()
         self.create_tables()  # remake all tables
 
     def delete_component(self, name: str):
@@ -602,12 +744,9 @@ class QGeometryTables(object):
             name (str): Name of component (case sensitive)
         """
         # TODO: Add unit test
-        # TODO: is this the best way to do this, or is there a faster way?
         a_comp = self.design.components[name]
         if a_comp is not None:
-            for table_name in self.tables:
-                df = self.tables[table_name]
-                self.tables[table_name] = df[df['component'] != a_comp.id]
+            self.delete_component_id(a_comp.id)
 
     def delete_component_id(self, component_id: int):
         """Drop the components within the qgeometry.tables.
@@ -615,11 +754,33 @@ class QGeometryTables(object):
         Args:
             component_id (int): Unique number to describe the component.
         """
-        for table_name in self.tables:
-            df_table_name = self.tables[table_name]
-            # self.tables[table_name] = df_table_name.drop(df_table_name[df_table_name['component'] == component_id].index)
-            self.tables[table_name] = df_table_name[
-                df_table_name['component'] != component_id]
+        # Only the rows of the component are touched. They are marked as
+        # deleted and removed from the table the next time it is read.
+        for table_name in self._tables:
+            if component_id in self._buffered_components.get(table_name, ()):
+                self.flush_buffers(table_name)
+            positions = self._get_row_index(table_name).pop(component_id, None)
+            if positions:
+                self._deleted_rows.setdefault(table_name,
+                                              set()).update(positions)
+
+        self._revision += 1
+        self._component_revisions[component_id] = self._revision
+
+    def get_component_revision(self, component_id: int) -> int:
+        """Return the revision of the rows of a component.  It changes each
+        time the rows of the component are deleted, so when the component is
+        rebuilt or deleted, and when the tables are cleared.  Renderers can
+        use it to keep what they made from the rows of a component.
+
+        Args:
+            component_id (int): Unique number to describe the component.
+
+        Returns:
+            int: The revision.
+        """
+        return self._component_revisions.get(component_id,
+                                             self._cleared_revision)
 
     def get_component(
         self,
@@ -646,13 +807,12 @@ class QGeometryTables(object):
                 tables[table_name] = self.get_component(name, table_name)
             return tables
         else:
-            df = self.tables[table_name]
             a_comp = self.design.components[name]
             if a_comp is None:
                 # Component not found.
                 return None
             else:
-                return df[df.component == a_comp.id]
+                return self._get_component_rows(table_name, a_comp.id)
 
             # comp_id = self.design.components[name].id
             # return df[df.component == comp_id]
@@ -688,10 +848,17 @@ class QGeometryTables(object):
         if a_comp is None:
             return None
         else:
-            # TODO: is this the best way to do this, or is there a faster way?
-            for table_name in self.tables:
-                table = self.tables[table_name]
-                table.component[table.component == a_comp.id] = new_name
+            for table_name in self._tables:
+                if a_comp.id in self._buffered_components.get(table_name, ()):
+                    self.flush_buffers(table_name)
+                row_index = self._get_row_index(table_name)
+                positions = row_index.pop(a_comp.id, None)
+                if positions:
+                    table = self._tables[table_name]
+                    table.iloc[positions,
+                               table.columns.get_loc('component')] = new_name
+                    row_index[new_name] = sorted(
+                        row_index.get(new_name, []) + positions)
 
     def get_component_geometry_list(self,
                                     name: str,
@@ -714,9 +881,9 @@ class QGeometryTables(object):
                 qgeometry += self.get_component_geometry_list(name, table)
 
         else:
-            table = self.tables[table_name]
             comp_id = self.design.components[name].id
-            qgeometry = table.geometry[table.component == comp_id].to_list()
+            qgeometry = self._get_component_rows(table_name,
+                                                 comp_id).geometry.to_list()
 
         return qgeometry
 
@@ -732,8 +899,8 @@ class QGeometryTables(object):
         comp_id = self.design.components[name].id
         qgeometry = {}
         for table_name in self.get_element_types():
-            table = self.tables[table_name]
-            qgeometry[table_name] = table.geometry[table.component == comp_id]
+            qgeometry[table_name] = self._get_component_rows(
+                table_name, comp_id).geometry
         qgeometry = pd.concat(qgeometry)
 
         # when concatenating empty GeoSeries, returns Series (ugly fix)
@@ -764,12 +931,10 @@ class QGeometryTables(object):
             return qgeometry  # return pd.concat(qgeometry, axis=0)
 
         else:
-            table = self.tables[table_name]
-
-            # mask the rows nad get only 2 columns
+            # get the rows of the component and only 2 columns
             comp_id = self.design.components[name].id
-            df_comp_id = table.loc[table.component == comp_id,
-                                   ['name', 'geometry']]
+            df_comp_id = self._get_component_rows(table_name,
+                                                  comp_id)[['name', 'geometry']]
             df_geometry = df_comp_id.geometry
             df_geometry.index = df_comp_id.name
             return df_geometry.to_dict()
@@ -807,9 +972,147 @@ class QGeometryTables(object):
         unique_layers = list()
         for table_name in self.design.qgeometry.get_element_types():
             table = self.design.qgeometry.tables[table_name]
-            temp = table[table['chip'] == chip_name]
-            layers = temp['layer'].unique().tolist()
+            # Take just the layer column, not a copy of every row.
+            layers = table.loc[table['chip'] == chip_name,
+                               'layer'].unique().tolist()
             unique_layers += layers
         unique_layers = list(set(unique_layers))
 
         return unique_layers
+
+    def _get_spatial_index(self, table_name: str) -> tuple:
+        """Get the R-tree (STRtree) over the envelopes of the rows of a table.
+
+        The tree is built lazily, and rebuilt when the table has changed since
+        it was built.  Any change to a table (add, delete, clear) replaces the
+        table object, which is what is checked.  The envelope of a path or
+        junction is grown by half of its width.
+
+        Args:
+            table_name (str): Name of element table (e.g., 'poly')
+
+        Returns:
+            tuple: (tree, positions, lookup, pad), where tree is the STRtree or
+            None when there is nothing to index, positions are the row
+            positions (iloc) of the indexed envelopes, lookup maps the id of an
+            envelope to its index in positions, and pad is half the width of
+            every row of the table.
+        """
+        table = self.tables[table_name]
+        indexed = self._spatial_index.get(table_name)
+        if indexed is not None and indexed[0] is table:
+            return indexed[1]
+
+        if 'width' in table.columns:
+            pad = pd.to_numeric(table['width'],
+                                errors='coerce').fillna(0).to_numpy() / 2
+        else:
+            pad = np.zeros(len(table))
+
+        tree, positions, lookup = None, np.array([], dtype=int), dict()
+        if len(table) > 0:
+            bounds = table.geometry.bounds.to_numpy(dtype=float)
+            bounds[:, :2] -= pad[:, None]
+            bounds[:, 2:] += pad[:, None]
+            # Skip empty or missing geometry, which have NaN bounds.
+            positions = np.flatnonzero(np.isfinite(bounds).all(axis=1))
+            envelopes = [box(*bounds[position]) for position in positions]
+            if envelopes:
+                tree = STRtree(envelopes)
+                lookup = {
+                    id(envelope): index
+                    for index, envelope in enumerate(envelopes)
+                }
+
+        indexed = (table, (tree, positions, lookup, pad))
+        self._spatial_index[table_name] = indexed
+        return indexed[1]
+
+    def query(
+        self,
+        bounds: Union[Tuple[float, float, float, float], BaseGeometry],
+        table_name: str = 'all',
+        chip: str = None,
+        layer: Union[int, str] = None
+    ) -> Union[GeoDataFrame, Dict_[str, GeoDataFrame]]:
+        """Return the rows of the qgeometry that intersect a region.
+
+        An R-tree (STRtree) over each table is used to find the candidates, so
+        only the elements near the region are tested.  The tree is built on the
+        first query and rebuilt only after the table changes.
+
+        Args:
+            bounds (Union[tuple, BaseGeometry]): Region to search, either as
+                (minx, miny, maxx, maxy) or as a shapely geometry.
+            table_name (str): Element table name ('poly', 'path', etc.).
+                Defaults to 'all'.
+            chip (str): Only return rows on this chip.  Defaults to None,
+                which is all the chips.
+            layer (Union[int, str]): Only return rows on this layer.  Defaults
+                to None, which is all the layers.
+
+        Returns:
+            Union[GeoDataFrame, Dict_[str, GeoDataFrame]]: The rows, in table
+            order. If table_name is 'all', a dict with table names as keys and
+            the rows of each table as values.
+
+        Example usage:
+            ```design.qgeometry.query((0, 0, 1, 1), 'poly', chip='main')```
+        """
+        if table_name == 'all':
+            return {
+                name: self.query(bounds, name, chip=chip, layer=layer)
+                for name in self.get_element_types()
+            }
+
+        region = bounds if isinstance(bounds, BaseGeometry) else box(*bounds)
+
+        tree, positions, lookup, pad = self._get_spatial_index(table_name)
+        table = self.tables[table_name]
+
+        hits = []
+        if tree is not None:
+            candidates = tree.query(region)
+            if len(candidates) > 0:
+                if isinstance(candidates[0], BaseGeometry):
+                    # shapely < 2.0 returns the envelopes
+                    indices = [lookup[id(envelope)] for envelope in candidates]
+                else:
+                    # shapely >= 2.0 returns their indices
+                    indices = candidates
+                hits = np.sort(positions[np.asarray(indices, dtype=int)])
+
+        rows = table.iloc[hits]
+        if len(rows) > 0:
+            # The tree only compares envelopes, check the geometry itself.
+            mask = rows.geometry.distance(region).to_numpy() <= pad[hits]
+            if chip is not None:
+                mask &= (rows['chip'] == chip).to_numpy()
+            if layer is not None:
+                mask &= (rows['layer'] == int(layer)).to_numpy()
+            rows = rows[mask]
+        return rows
+
+    def query_components(self,
+                         bounds: Union[Tuple[float, float, float, float],
+                                       BaseGeometry],
+                         table_name: str = 'all',
+                         chip: str = None,
+                         layer: Union[int, str] = None) -> List[int]:
+        """Return the ids of the components with qgeometry that intersects a
+        region.
+
+        See query() for the arguments.
+
+        Returns:
+            List[int]: Sorted list of unique component ids
+        """
+        found = self.query(bounds, table_name, chip=chip, layer=layer)
+        if isinstance(found, dict):
+            tables = list(found.values())
+        else:
+            tables = [found]
+        component_ids = set()
+        for rows in tables:
+            component_ids.update(rows['component'].tolist())
+        return sorted(component_ids)
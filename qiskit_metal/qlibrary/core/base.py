@@ -545,7 +545,16 @@ class QComponent():
                 # pylint: disable=protected-access
                 self.design._delete_all_pins_for_component(self.id)
 
-            self.make()
+            # Components named in pin_inputs have to be made before this one.
+            # pylint: disable=protected-access
+            self.design._update_pin_input_dependencies(self)
+
+            # Keep track of the design variables used, see design.set_variable.
+            self.design._begin_variable_recording()
+            try:
+                self.make()
+            finally:
+                self.design._end_variable_recording(self.id)
             self._made = True
             self.status = 'good'
 
@@ -887,6 +896,9 @@ class QComponent():
 
         net_id_rtn = self.design.connect_pins(self.id, pin_name_self, comp2_id,
                                               pin2_name)
+        if net_id_rtn:
+            # This component is now attached to a pin of comp2_id.
+            self.design.add_dependency(comp2_id, self.id)
 
         return net_id_rtn
 
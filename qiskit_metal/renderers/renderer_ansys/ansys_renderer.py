@@ -13,6 +13,7 @@
 # that they have been altered from the originals.
 # pylint: disable=too-many-lines
 
+from copy import deepcopy
 from typing import List, Tuple, Union
 
 import re
@@ -37,6 +38,7 @@ from qiskit_metal.renderers.renderer_base import QRenderer
 from qiskit_metal.toolbox_metal.parsing import is_true
 
 from qiskit_metal import Dict
+from qiskit_metal._renderer_defaults import ANSYS_ELEMENT_TABLE_DATA
 
 from .. import config
 if not config.is_building_docs():
@@ -170,13 +172,7 @@ class QAnsysRenderer(QRenderer):
     # Keeping this as a cls dict so could be edited before renderer is instantiated.
     # To update component.options junction table.
 
-    element_table_data = dict(path=dict(wire_bonds=False),
-                              junction=dict(
-                                  inductance=default_options['Lj'],
-                                  capacitance=default_options['Cj'],
-                                  resistance=default_options['_Rj'],
-                                  mesh_kw_jj=parse_units(
-                                      default_options['max_mesh_length_jj'])))
+    element_table_data = deepcopy(ANSYS_ELEMENT_TABLE_DATA)
     """Element table data"""
 
     def __init__(self,
@@ -14,13 +14,17 @@
 """ This module has a QRenderer to export QDesign to a GDS file."""
 # pylint: disable=too-many-lines
 
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from operator import itemgetter
 from typing import TYPE_CHECKING
 #from typing import Dict as Dict_
 from typing import Tuple, Union
 #from typing import List, Any, Iterable
+import hashlib
+import json
 import math
+import numbers
 import os
 from shapely.geometry import LineString
 #from pandas.api.types import is_numeric_dtype
@@ -28,6 +32,7 @@ from shapely.geometry import LineString
 import gdspy
 import geopandas
 import shapely
+import shapely.affinity
 from scipy.spatial import distance
 import pandas as pd
 import numpy as np
@@ -36,6 +41,7 @@ from qiskit_metal.renderers.renderer_base import QRenderer
 from qiskit_metal.renderers.renderer_gds.make_cheese import Cheesing
 from qiskit_metal.toolbox_metal.parsing import is_true
 from qiskit_metal import draw
+from qiskit_metal._renderer_defaults import GDS_ELEMENT_TABLE_DATA
 
 from ... import Dict
 
@@ -51,6 +57,390 @@ if TYPE_CHECKING:
     from qiskit_metal.designs import QDesign
 
 
+def _ground_difference(
+        rectangle_points: list,
+        q_subtract_true: list,
+        q_subtract_false: list,
+        is_neg_mask: bool,
+        chip_layer: int,
+        precision: float,
+        max_points: int,
+        tile_points: list = None) -> Union[gdspy.PolygonSet, None]:
+    """Boolean the subtract geometries of one chip and layer. For a positive
+    mask, the subtract==True elements are removed from the rectangle of the
+    chip.  For a negative mask, the subtract==False elements are removed from
+    the subtract==True elements.
+
+    Kept at module level so it can be pickled and run in a process pool by
+    QGDSRenderer.export_to_gds(parallel=N).
+
+    Args:
+        rectangle_points (list): The subtract-rectangle for the chip.
+        q_subtract_true (list): gdspy elements with subtract==True.
+        q_subtract_false (list): gdspy elements with subtract==False.
+        is_neg_mask (bool): Export a negative mask for chip and layer.
+        chip_layer (int): Layer of the chip to render.
+        precision (float): Used for gdspy.
+        max_points (int): Used for gdspy. GDSpy uses 199 as the default.
+        tile_points (list): If given, only the part of the difference within
+                            this rectangle is computed.  Defaults to None.
+
+    Returns:
+        Union[gdspy.PolygonSet, None]: The difference, None if empty.
+    """
+    # Cell.get_polygons() converts all elements, both poly & path, to
+    # polygons for gdspy.boolean().  The cells are not added to any library.
+    subtract_true_cell = gdspy.Cell(f'SUBTRACT_true_{chip_layer}',
+                                    exclude_from_current=True)
+    subtract_true_cell.add(list(q_subtract_true))
+
+    if is_neg_mask:
+        subtract_false_cell = gdspy.Cell(f'SUBTRACT_false_{chip_layer}',
+                                         exclude_from_current=True)
+        subtract_false_cell.add(list(q_subtract_false))
+        operand_a = subtract_true_cell.get_polygons()
+        operand_b = subtract_false_cell.get_polygons()
+        if tile_points is not None:
+            operand_a = gdspy.boolean(operand_a,
+                                      gdspy.Polygon(tile_points, chip_layer),
+                                      'and',
+                                      max_points=max_points,
+                                      precision=precision,
+                                      layer=chip_layer)
+            if operand_a is None:
+                return None
+    else:
+        operand_a = gdspy.Polygon(
+            rectangle_points if tile_points is None else tile_points,
+            chip_layer)
+        operand_b = subtract_true_cell.get_polygons()
+
+    return gdspy.boolean(operand_a,
+                         operand_b,
+                         'not',
+                         max_points=max_points,
+                         precision=precision,
+                         layer=chip_layer)
+
+
+def _element_polygons(elements: list) -> list:
+    """Convert gdspy elements, both poly & path, to polygons.
+
+    Args:
+        elements (list): gdspy elements.
+
+    Returns:
+        list: Each entry is a numpy.ndarray with the vertices of a polygon.
+    """
+    a_cell = gdspy.Cell('ELEMENT_polygons', exclude_from_current=True)
+    a_cell.add(list(elements))
+    return a_cell.get_polygons()
+
+
+def _ground_tiles(rectangle_points: list, q_subtract_true: list,
+                  q_subtract_false: list, is_neg_mask: bool, tiles_x: int,
+                  tiles_y: int) -> list:
+    """Cut the ground plane of one chip and layer into a grid of tiles, and
+    assign the subtract geometries to the tiles by bounding box.  A polygon
+    which crosses the edge of a tile is assigned to every tile it overlaps.
+
+    Args:
+        rectangle_points (list): The subtract-rectangle for the chip.
+        q_subtract_true (list): gdspy elements with subtract==True.
+        q_subtract_false (list): gdspy elements with subtract==False.
+        is_neg_mask (bool): Export a negative mask for chip and layer.  Then,
+                    the tiles cover the subtract==True elements rather than
+                    the rectangle.
+        tiles_x (int): Number of tiles in x.
+        tiles_y (int): Number of tiles in y.
+
+    Returns:
+        list: For each tile that has something to compute, a tuple of
+        (tile_points, subtract_true, subtract_false), where subtract_true and
+        subtract_false are lists with the gdspy.PolygonSet of the tile.
+    """
+    # pylint: disable=too-many-locals
+    polygons_true = _element_polygons(q_subtract_true)
+    polygons_false = _element_polygons(q_subtract_false) if is_neg_mask else []
+
+    if is_neg_mask:
+        if not polygons_true:
+            return []
+        all_points = np.vstack(polygons_true)
+    else:
+        all_points = np.asarray(rectangle_points, dtype=float)
+    x_edges = np.linspace(all_points[:, 0].min(), all_points[:, 0].max(),
+                          tiles_x + 1)
+    y_edges = np.linspace(all_points[:, 1].min(), all_points[:, 1].max(),
+                          tiles_y + 1)
+
+    def assign(polygons: list) -> dict:
+        by_tile = dict()
+        for polygon in polygons:
+            minx, miny = polygon.min(axis=0)
+            maxx, maxy = polygon.max(axis=0)
+            x_first, x_last = _tile_range(x_edges, minx, maxx)
+            y_first, y_last = _tile_range(y_edges, miny, maxy)
+            for x_index in range(x_first, x_last + 1):
+                for y_index in range(y_first, y_last + 1):
+                    by_tile.setdefault((x_index, y_index), []).append(polygon)
+        return by_tile
+
+    true_by_tile = assign(polygons_true)
+    false_by_tile = assign(polygons_false)
+
+    tiles = []
+    for x_index in range(tiles_x):
+        for y_index in range(tiles_y):
+            true_in_tile = true_by_tile.get((x_index, y_index))
+            # Negative mask, without subtract==True there is nothing to keep.
+            if is_neg_mask and true_in_tile is None:
+                continue
+            false_in_tile = false_by_tile.get((x_index, y_index))
+            minx, maxx = x_edges[x_index], x_edges[x_index + 1]
+            miny, maxy = y_edges[y_index], y_edges[y_index + 1]
+            tile_points = [(minx, miny), (maxx, miny), (maxx, maxy),
+                           (minx, maxy)]
+            subtract_true, subtract_false = [], []
+            if true_in_tile:
+                subtract_true.append(gdspy.PolygonSet(true_in_tile))
+            if false_in_tile:
+                subtract_false.append(gdspy.PolygonSet(false_in_tile))
+            tiles.append((tile_points, subtract_true, subtract_false))
+    return tiles
+
+
+def _tile_range(edges: np.ndarray, low: float, high: float) -> Tuple[int, int]:
+    """First and last index of the tiles, given by edges, which overlap the
+    interval from low to high.  A polygon which only touches a tile is not
+    assigned to it.
+
+    Args:
+        edges (np.ndarray): Edges of the tiles, in increasing order.
+        low (float): Start of the interval.
+        high (float): End of the interval.
+
+    Returns:
+        Tuple[int, int]: First and last index.
+    """
+    last_tile = len(edges) - 2
+    first = int(np.clip(np.searchsorted(edges, low, 'right') - 1, 0, last_tile))
+    last = int(np.clip(np.searchsorted(edges, high, 'left') - 1, 0, last_tile))
+    return first, max(first, last)
+
+
+def _stitch_ground_tiles(results: list) -> Union[gdspy.PolygonSet, list, None]:
+    """Combine the differences of the tiles of a ground plane.  The tiles
+    share their edges, so the polygons of neighbor tiles abut without gaps.
+
+    Args:
+        results (list): The return of _ground_difference() for each tile.
+
+    Returns:
+        Union[gdspy.PolygonSet, list, None]: The difference of the single
+        tile, or the list of differences of the tiles, None if empty.
+    """
+    if len(results) == 1:
+        return results[0]
+    results = [result for result in results if result is not None]
+    return results if results else None
+
+
+def _no_cheese_union(
+        poly_sub_geo: list, path_sub_geo: list, path_sub_width: list,
+        no_cheese_buffer: float, style_cap: int, style_join: int
+) -> Union[None, shapely.geometry.multipolygon.MultiPolygon]:
+    """Combine the polygons and the buffered linestrings of one chip and
+    layer, then buffer the result by no_cheese_buffer.
+
+    Kept at module level so it can be pickled and run in a process pool by
+    QGDSRenderer.export_to_gds(parallel=N).
+
+    Args:
+        poly_sub_geo (list): Shapely polygons with subtract==True.
+        path_sub_geo (list): Shapely linestrings with subtract==True.
+        path_sub_width (list): The width of each linestring.
+        no_cheese_buffer (float): Size of buffer.
+        style_cap (int): Shapely cap_style.
+        style_join (int): Shapely join_style.
+
+    Returns:
+        Union[None, shapely.geometry.multipolygon.MultiPolygon]: The no-cheese
+        region, None if empty.
+    """
+    path_sub_geo = [
+        geom.buffer(width / 2, cap_style=style_cap, join_style=style_join)
+        for geom, width in zip(path_sub_geo, path_sub_width)
+    ]
+
+    combo_shapely = draw.union(path_sub_geo + poly_sub_geo)
+    if combo_shapely.is_empty:
+        return None
+
+    #Can return either Multipolygon or just one polygon.
+    combo_shapely = combo_shapely.buffer(no_cheese_buffer,
+                                         cap_style=style_cap,
+                                         join_style=style_join)
+    if isinstance(combo_shapely, shapely.geometry.polygon.Polygon):
+        combo_shapely = shapely.geometry.MultiPolygon([combo_shapely])
+    return combo_shapely
+
+
+# Cells read from junction GDS files, shared by every export of the process.
+# Key is (absolute path, modification time, unit, precision).
+_JUNCTION_LIBRARIES = dict()
+
+
+def _read_junction_cells(path_filename: str, unit: float,
+                         precision: float) -> dict:
+    """Read the cells of a junction GDS file once per process, converted to
+    the unit and precision of the library that exports the design.  The file
+    is read again if it was modified since.
+
+    Args:
+        path_filename (str): Path of the GDS file with the junctions.
+        unit (float): Unit of the library to export.
+        precision (float): Precision of the library to export.
+
+    Returns:
+        dict: The cells of the file, by name.  Shared, don't edit them.
+    """
+    path_filename = os.path.abspath(path_filename)
+    key = (path_filename, os.path.getmtime(path_filename), unit, precision)
+    if key not in _JUNCTION_LIBRARIES:
+        for old_key in list(_JUNCTION_LIBRARIES):
+            if old_key[0] == path_filename and old_key[1] != key[1]:
+                del _JUNCTION_LIBRARIES[old_key]
+        junction_lib = gdspy.GdsLibrary(unit=unit, precision=precision)
+        junction_lib.read_gds(path_filename, units='convert')
+        _JUNCTION_LIBRARIES[key] = junction_lib.cells
+    return _JUNCTION_LIBRARIES[key]
+
+
+# Placeholder for a tile of the ground plane which still needs computing.
+_NOT_COMPUTED = object()
+
+
+def _table_fingerprint(table: pd.DataFrame) -> bytes:
+    """Hash the rows of a QGeometry table, as a set.  The order of the rows,
+    and their index in the QGeometry table, do not change the hash.
+
+    Args:
+        table (pd.DataFrame): Rows of QGeometry tables.
+
+    Returns:
+        bytes: The digest.
+    """
+    if len(table) == 0:
+        return b'empty'
+
+    # Hash the columns as numpy arrays; going through a DataFrame, or
+    # factorizing the object columns first, costs more than the hashing
+    # itself for the small tables of one chip and layer.
+    columns = sorted(set(table.columns) - {'geometry', 'index'})
+    row_hashes = np.zeros(len(table), dtype=np.uint64)
+    for column in columns:
+        values = table[column].to_numpy()
+        if values.dtype.kind == 'b':
+            # Before pandas 1.4, hash_array() can not hash a bool array
+            # unless it is factorized first.
+            values = values.astype(np.uint8)
+        row_hashes = row_hashes * np.uint64(31) + pd.util.hash_array(
+            values, categorize=False)
+    geometry_hashes = pd.util.hash_array(
+        np.array([geom.wkb for geom in table['geometry']], dtype=object))
+    combined = np.sort(row_hashes * np.uint64(31) ^ geometry_hashes)
+
+    digest = hashlib.sha1(repr(columns).encode())
+    digest.update(combined.tobytes())
+    return digest.digest()
+
+
+def _tile_job_key(job: tuple) -> str:
+    """Hash the arguments of _ground_difference() for a tile.
+
+    Args:
+        job (tuple): Positional arguments of _ground_difference(), with
+                     tile_points.
+
+    Returns:
+        str: The digest.
+    """
+    (rectangle_points, subtract_true, subtract_false, is_neg_mask, chip_layer,
+     precision, max_points, tile_points) = job
+    digest = hashlib.sha1(
+        repr((rectangle_points, is_neg_mask, chip_layer, precision, max_points,
+              tile_points)).encode())
+    for polygon_sets in (subtract_true, subtract_false):
+        digest.update(b'|')
+        for polygon_set in polygon_sets:
+            for polygon in polygon_set.polygons:
+                digest.update(np.ascontiguousarray(polygon).tobytes())
+                digest.update(b';')
+    return digest.hexdigest()
+
+
+def _packed_coordinates(geometries: list) -> list:
+    """Coordinates of each geometry as an array.  With shapely 2, the
+    coordinates of all geometries are read in one call, then split.
+
+    Args:
+        geometries (list): Shapely LineStrings or LinearRings.
+
+    Returns:
+        list: For each geometry, a numpy.ndarray of shape (N, 2).
+    """
+    if not hasattr(shapely, 'get_coordinates'):
+        return [np.asarray(geom.coords) for geom in geometries]
+
+    geometries = np.asarray(geometries, dtype=object)
+    coordinates = shapely.get_coordinates(geometries)
+    counts = shapely.get_num_coordinates(geometries)
+    return np.split(coordinates, np.cumsum(counts)[:-1])
+
+
+def _has_short_segments(geometries: list, fillets: np.ndarray,
+                        precision: int) -> np.ndarray:
+    """Flag the LineStrings which may have a vertex too close to its
+    neighbors to be fillet'd, by the test of bad_fillet_idxs(), done for the
+    packed coordinates of all LineStrings at once.  The lengths are compared
+    unrounded, with a margin of 10**-precision, so a LineString is flagged if
+    bad_fillet_idxs() could find a vertex.
+
+    Args:
+        geometries (list): Shapely LineStrings.
+        fillets (np.ndarray): Fillet radius of each LineString.
+        precision (int): Digits of precision used by bad_fillet_idxs().
+
+    Returns:
+        np.ndarray: True for the LineStrings to check with _check_length().
+    """
+    coordinates = _packed_coordinates(geometries)
+    counts = np.array([len(coords) for coords in coordinates], dtype=int)
+    if counts.sum() == 0:
+        return np.zeros(len(counts), dtype=bool)
+
+    points = np.concatenate(coordinates)
+    line = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(len(points)) - (np.cumsum(counts) - counts)[line]
+    length = counts[line]
+    fillet = np.repeat(np.asarray(fillets, dtype=float), counts)
+
+    # The segment before vertex k is lengths[k - 1], the one after it is
+    # lengths[k].  Both are within the same LineString for the vertices which
+    # are not endpoints.
+    lengths = np.hypot(*np.diff(points, axis=0).T)
+    vertex = np.nonzero((local >= 1) & (local <= length - 2))[0]
+    is_second = local[vertex] == 1
+    is_second_to_last = local[vertex] == length[vertex] - 2
+    margin = 10.0**-precision
+    before_limit = np.where(is_second, 1, 2) * fillet[vertex] + margin
+    after_limit = np.where(is_second_to_last, 1, 2) * fillet[vertex] + margin
+    is_bad = ((lengths[vertex - 1] < before_limit) |
+              (lengths[vertex] < after_limit))
+    return np.bincount(line[vertex[is_bad]], minlength=len(counts)) > 0
+
+
 class QGDSRenderer(QRenderer):
     """Extends QRenderer to export GDS formatted files. The methods which a
     user will need for GDS export should be found within this class.
@@ -85,6 +475,8 @@ class QGDSRenderer(QRenderer):
         * check_short_segments_by_scaling_fillet: '2.0'
         * gds_unit: '1'
         * ground_plane: 'True'
+        * ground_plane_tiles: Dict(x='1', y='1')
+        * hierarchical: 'False'
         * negative_mask: Dict(main=[])
         * corners: 'circular bend'
         * tolerance: '0.00001'
@@ -140,6 +532,20 @@ class QGDSRenderer(QRenderer):
         # placed placed in same layer as ground_plane.
         ground_plane='True',
 
+        # Cut the ground plane of each chip and layer into a grid of x by y
+        # tiles, and do the boolean subtraction for each tile. Since each
+        # boolean only has the elements of its tile, the memory and time
+        # depend on the size of tile, rather than the number of elements.
+        # The tiles are stitched back in the ground cell of the layer.
+        # Using x='1', y='1' does one boolean for the whole chip.
+        ground_plane_tiles=Dict(x='1', y='1'),
+
+        # Export the subtract==False geometry of QComponents as a hierarchy.
+        # QComponents with the same class and options, other than pos_x, pos_y
+        # and orientation, share one cell.  Each QComponent is placed with a
+        # CellReference. Used for the layers with a positive mask.
+        hierarchical='False',
+
         # By default, export_to_gds() will create a positive_mask for every
         # chip and layer.  Within the Dict, there needs to be an entry for each
         # chip.  Each chip has a list of layers that should export as a
@@ -276,9 +682,7 @@ class QGDSRenderer(QRenderer):
     # Keeping this as a cls dict so could be edited before renderer is
     # instantiated.  To update component.options junction table.
 
-    element_table_data = dict(
-        # Cell_name must exist in gds file with: path_filename
-        junction=dict(cell_name='my_other_junction'))
+    element_table_data = deepcopy(GDS_ELEMENT_TABLE_DATA)
     """Element table data"""
 
     def __init__(self,
@@ -312,6 +716,11 @@ class QGDSRenderer(QRenderer):
         # Updated each time export_to_gds() is called.
         self.chip_info = dict()
 
+        # Results of the last export_to_gds() for each (chip_name, layer).
+        # Reused by the next export for the layers and tiles which have not
+        # changed.
+        self._export_cache = dict()
+
         # check the scale
         self._check_bounding_box_scale()
 
@@ -548,7 +957,8 @@ class QGDSRenderer(QRenderer):
         return unique_qcomponents, 0
 
     def _create_qgeometry_for_gds(self,
-                                  highlight_qcomponents: list = None) -> int:
+                                  highlight_qcomponents: list = None,
+                                  chip_names: list = None) -> int:
         """Using self.design, this method does the following:
 
         1. Gather the QGeometries to be used to write to file.
@@ -570,6 +980,8 @@ class QGDSRenderer(QRenderer):
                             If empty, render all components in design.
                             If QComponent names are duplicated,
                             duplicates will be ignored.
+            chip_names (list): Chips to iterate through.  Defaults to None,
+                            which is every chip in self.chip_info.
 
         Returns:
             int: 0 if all ended well.
@@ -577,12 +989,14 @@ class QGDSRenderer(QRenderer):
         """
         if highlight_qcomponents is None:
             highlight_qcomponents = []
+        if chip_names is None:
+            chip_names = list(self.chip_info)
         unique_qcomponents, status = self._check_qcomps(highlight_qcomponents)
         if status == 1:
             return 1
         self.dict_bounds.clear()
 
-        for chip_name in self.chip_info:
+        for chip_name in chip_names:
             # put the QGeometry into GDS format.
             # There can be more than one chip in QGeometry.
             # They all export to one gds file.
@@ -595,6 +1009,14 @@ class QGDSRenderer(QRenderer):
             all_table_subtracts = []
             all_table_no_subtracts = []
 
+            # The bounds of the QGeometry are only needed when the chip does
+            # not give the subtract-box.  Each costs a call into GEOS per row.
+            if highlight_qcomponents:
+                chip_box, status = None, 1
+            else:
+                chip_box, status = self.design.get_x_y_for_chip(chip_name)
+            need_bounds = status != 0
+
             for table_name in self.design.qgeometry.get_element_types():
 
                 # Get table for chip and table_name, and reduce
@@ -609,17 +1031,21 @@ class QGDSRenderer(QRenderer):
                     # and "no_subtract" elements and gather bounds.
                     # dict_bounds[chip_name] = list_bounds
                     self._gather_subtract_elements_and_bounds(
-                        chip_name, table_name, table, all_table_subtracts,
-                        all_table_no_subtracts)
+                        chip_name,
+                        table_name,
+                        table,
+                        all_table_subtracts,
+                        all_table_no_subtracts,
+                        gather_bounds=need_bounds)
 
             # If list of QComponents provided, use the
             # bounding_box_scale(x and y), otherwise use self._chips.
-            scaled_max_bound, max_bound = self._scale_max_bounds(
-                chip_name, self.dict_bounds[chip_name]['gather'])
+            if need_bounds:
+                scaled_max_bound, max_bound = self._scale_max_bounds(
+                    chip_name, self.dict_bounds[chip_name]['gather'])
             if highlight_qcomponents:
                 self.dict_bounds[chip_name]['for_subtract'] = scaled_max_bound
             else:
-                chip_box, status = self.design.get_x_y_for_chip(chip_name)
                 if status == 0:
                     self.dict_bounds[chip_name]['for_subtract'] = chip_box
                 else:
@@ -646,7 +1072,7 @@ class QGDSRenderer(QRenderer):
         segments get fillet'ed.  Add the multiple LINESTRINGS back to table.
         Also remove "bad" LINESTRING from table.
 
-        Then use _qgeometry_to_gds() to convert the QGeometry elements to gdspy
+        Then use _qgeometry_table_to_gds() to convert the QGeometry elements to gdspy
         elements.  The gdspy elements are placed in
         self.chip_info[chip_name]['q_subtract_true'].
 
@@ -660,31 +1086,30 @@ class QGDSRenderer(QRenderer):
             self.options.short_segments_to_not_fillet)
         all_layers = self.design.qgeometry.get_all_unique_layers(chip_name)
 
-        for chip_layer in all_layers:
-            copy_subtract = []
-            copy_no_subtract = []
-            copy_subtract = deepcopy(all_table_subtracts)
-            copy_no_subtract = deepcopy(all_table_no_subtracts)
-
-            for item in copy_subtract:
-                item.drop(item.index[item['layer'] != chip_layer], inplace=True)
-
-            for item_no in copy_no_subtract:
-                item_no.drop(item_no.index[item_no['layer'] != chip_layer],
-                             inplace=True)
-
-            self.chip_info[chip_name][chip_layer][
-                'all_subtract_true'] = geopandas.GeoDataFrame(
-                    pd.concat(copy_subtract, ignore_index=False))
+        # One pass over the rows, rather than a copy of every table per layer.
+        subtract_by_layer = self._split_tables_by_layer(all_table_subtracts,
+                                                        all_layers)
+        no_subtract_by_layer = self._split_tables_by_layer(
+            all_table_no_subtracts, all_layers)
 
+        for chip_layer in all_layers:
             self.chip_info[chip_name][chip_layer][
-                'all_subtract_false'] = geopandas.GeoDataFrame(
-                    pd.concat(copy_no_subtract, ignore_index=False))
+                'all_subtract_true'] = subtract_by_layer[chip_layer]
 
             self.chip_info[chip_name][chip_layer][
-                'all_subtract_true'].reset_index(inplace=True)
-            self.chip_info[chip_name][chip_layer][
-                'all_subtract_false'].reset_index(inplace=True)
+                'all_subtract_false'] = no_subtract_by_layer[chip_layer]
+
+            # When nothing in layer changed since the last export, reuse all
+            # of its results, including the boolean and the no-cheese.
+            layer_key = self._layer_cache_key(chip_name, chip_layer)
+            cached = self._export_cache.get((chip_name, chip_layer))
+            if cached is not None and cached['key'] == layer_key:
+                self.chip_info[chip_name][chip_layer] = cached['layer_info']
+                continue
+            self._export_cache[(chip_name, chip_layer)] = dict(
+                key=layer_key,
+                layer_info=self.chip_info[chip_name][chip_layer],
+                tiles=cached['tiles'] if cached is not None else dict())
 
             if is_true(fix_short_segments):
                 self._fix_short_segments_within_table(chip_name, chip_layer,
@@ -692,13 +1117,78 @@ class QGDSRenderer(QRenderer):
                 self._fix_short_segments_within_table(chip_name, chip_layer,
                                                       'all_subtract_false')
 
+            is_positive_mask = not self._is_negative_mask(chip_name, chip_layer)
+            if is_true(self.options.hierarchical) and is_positive_mask:
+                self._separate_component_instances(chip_name, chip_layer)
+
             self.chip_info[chip_name][chip_layer][
-                'q_subtract_true'] = self.chip_info[chip_name][chip_layer][
-                    'all_subtract_true'].apply(self._qgeometry_to_gds, axis=1)
+                'q_subtract_true'] = self._qgeometry_table_to_gds(
+                    self.chip_info[chip_name][chip_layer]['all_subtract_true'])
 
             self.chip_info[chip_name][chip_layer][
-                'q_subtract_false'] = self.chip_info[chip_name][chip_layer][
-                    'all_subtract_false'].apply(self._qgeometry_to_gds, axis=1)
+                'q_subtract_false'] = self._qgeometry_table_to_gds(
+                    self.chip_info[chip_name][chip_layer]['all_subtract_false'])
+
+        for key in list(self._export_cache):
+            if key[0] == chip_name and key[1] not in all_layers:
+                del self._export_cache[key]
+
+    def _layer_cache_key(self, chip_name: str, chip_layer: int) -> str:
+        """Hash everything the results of a chip and layer depend on: the
+        rows of the layer, the options of the renderer, the subtract-rectangle
+        of the chip, and if the mask is negative.
+
+        Args:
+            chip_name (str): Name of chip to render.
+            chip_layer (int): Layer of the chip to render.
+
+        Returns:
+            str: Key for self._export_cache.
+        """
+        try:
+            options = json.dumps(self.options, sort_keys=True, default=str)
+        except TypeError:
+            # Keys of mixed types can not be sorted.
+            options = repr(self.options)
+        digest = hashlib.sha1()
+        digest.update(options.encode())
+        digest.update(
+            repr((chip_name, chip_layer,
+                  self.dict_bounds[chip_name]['for_subtract'],
+                  self._is_negative_mask(chip_name, chip_layer))).encode())
+        for table_name in ['all_subtract_true', 'all_subtract_false']:
+            digest.update(
+                _table_fingerprint(
+                    self.chip_info[chip_name][chip_layer][table_name]))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _split_tables_by_layer(tables: list, all_layers: list) -> dict:
+        """Concatenate the tables and split the rows by layer.  The rows are
+        copied once in total, not once per layer.  The shapely objects are
+        shared with the QGeometry tables, not copied.
+
+        Args:
+            tables (list): The geopandas.GeoDataFrame of each QGeometry table.
+            all_layers (list): Layers to split into.
+
+        Returns:
+            dict: key=layer, value=geopandas.GeoDataFrame with the rows of
+            the layer.  The index is reset, and the index of the row in the
+            QGeometry table is kept in column 'index'.
+        """
+        # Group as a plain DataFrame; concatenating and slicing GeoDataFrames
+        # is several times slower.
+        combined = pd.concat([pd.DataFrame(table) for table in tables],
+                             ignore_index=False)
+        groups = combined.groupby('layer', sort=False).indices
+
+        by_layer = dict()
+        for chip_layer in all_layers:
+            rows = groups.get(chip_layer, [])
+            by_layer[chip_layer] = geopandas.GeoDataFrame(
+                combined.iloc[rows].reset_index())
+        return by_layer
 
     # Handling Fillet issues.
 
@@ -706,7 +1196,7 @@ class QGDSRenderer(QRenderer):
                                          all_sub_true_or_false: str):
         """Update self.chip_info geopandas.GeoDataFrame.
 
-        Will iterate through the rows to examine the LineString.
+        Will examine the LineStrings of the rows with a fillet, all at once.
         Then determine if there is a segment that is shorter than the critera
         based on default_options. If so, then remove the row, and append
         shorter LineString with no fillet, within the dataframe.
@@ -717,42 +1207,49 @@ class QGDSRenderer(QRenderer):
             all_sub_true_or_false (str): To be used within self.chip_info:
                                 'all_subtract_true' or 'all_subtract_false'.
         """
-        # pylint: disable=too-many-locals
         data_frame = self.chip_info[chip_name][chip_layer][
             all_sub_true_or_false]
         df_fillet = data_frame[-data_frame['fillet'].isnull()]
 
-        if not df_fillet.empty:
-            # Don't edit the table when iterating through the rows.
-            # Save info in dict and then edit the table.
-            edit_index = dict()
-            for index, row in df_fillet.iterrows():
-                # print(
-                #     f'With parse_value: {self.parse_value(row.fillet)}, '
-                #     f'row.fillet: {row.fillet}')
-                status, all_shapelys = self._check_length(
-                    row.geometry, row.fillet)
-                if status > 0:
-                    edit_index[index] = all_shapelys
-
-            df_copy = self.chip_info[chip_name][chip_layer][
-                all_sub_true_or_false].copy(deep=True)
-            for del_key, the_shapes in edit_index.items():
-                # copy row "index" into a new data-frame "status" times.
-                # Then replace the LONG shapely with all_shapelys.
-                # For any entries in edit_index, edit table here.
-                orig_row = df_copy.loc[del_key].copy(deep=True)
-                df_copy = df_copy.drop(index=del_key)
-
-                for dummy_new_row, short_shape in the_shapes.items():
-                    orig_row['geometry'] = short_shape['line']
-                    orig_row['fillet'] = short_shape['fillet']
-                    # Keep ignore_index=False, otherwise,
-                    # the other del_key will not be found.
-                    df_copy = df_copy.append(orig_row, ignore_index=False)
-
-            self.chip_info[chip_name][chip_layer][
-                all_sub_true_or_false] = df_copy.copy(deep=True)
+        if df_fillet.empty:
+            return
+
+        # Only the rows flagged on the packed coordinates can have short
+        # segments; _check_length() decides for them.
+        is_flagged = _has_short_segments(
+            list(df_fillet['geometry']),
+            df_fillet['fillet'].to_numpy(dtype=float),
+            self.design.template_options.PRECISION)
+        df_flagged = df_fillet[is_flagged]
+
+        # Don't edit the table when iterating through the rows.
+        # Gather the replacement rows, then edit the table once.
+        edit_index = list()
+        new_rows = list()
+        for index, geometry, fillet in zip(df_flagged.index,
+                                           df_flagged['geometry'],
+                                           df_flagged['fillet']):
+            status, all_shapelys = self._check_length(geometry, fillet)
+            if status > 0:
+                edit_index.append(index)
+                new_rows.extend(
+                    (index, short_shape['line'], short_shape['fillet'])
+                    for short_shape in all_shapelys.values())
+
+        if not edit_index:
+            return
+
+        # Copy row "index" once for each of its shorter LineStrings,
+        # then replace the LONG shapely and its fillet.
+        new_index, new_geometry, new_fillet = zip(*new_rows)
+        replacements = data_frame.loc[list(new_index)].copy()
+        replacements['geometry'] = list(new_geometry)
+        replacements['fillet'] = list(new_fillet)
+
+        data_frame = pd.concat(
+            [data_frame.drop(index=edit_index), replacements])
+        self.chip_info[chip_name][chip_layer][
+            all_sub_true_or_false] = data_frame
 
     def _check_length(self, a_shapely: shapely.geometry.LineString,
                       a_fillet: float) -> Tuple[int, Dict]:
@@ -969,11 +1466,13 @@ class QGDSRenderer(QRenderer):
 
     # Move data around to be useful for GDS
 
-    def _gather_subtract_elements_and_bounds(self, chip_name: str,
+    def _gather_subtract_elements_and_bounds(self,
+                                             chip_name: str,
                                              table_name: str,
                                              table: geopandas.GeoDataFrame,
                                              all_subtracts: list,
-                                             all_no_subtracts: list):
+                                             all_no_subtracts: list,
+                                             gather_bounds: bool = True):
         """For every chip, and layer, separate the "subtract" and "no_subtract"
         elements and gather bounds for all the elements in qgeometries. Use
         format: f'{chip_name}_{table_name}s'.
@@ -987,13 +1486,16 @@ class QGDSRenderer(QRenderer):
                                     this list.
             all_no_subtracts (list): Pass by reference so method can update
                                     this list.
+            gather_bounds (bool): Add the bounds of table to
+                                    self.dict_bounds.  Defaults to True.
         """
 
-        # Determine bound box and return scalar larger than size.
-        bounds = tuple(self._get_bounds(table))
+        if gather_bounds:
+            # Determine bound box and return scalar larger than size.
+            bounds = tuple(self._get_bounds(table))
 
-        # Add the bounds of each table to list.
-        self.dict_bounds[chip_name]['gather'].append(bounds)
+            # Add the bounds of each table to list.
+            self.dict_bounds[chip_name]['gather'].append(bounds)
 
         if is_true(self.options.ground_plane):
             self._separate_subtract_shapes(chip_name, table_name, table)
@@ -1008,7 +1510,7 @@ class QGDSRenderer(QRenderer):
         # Keep this depreciated code.
         # polys use gdspy.Polygon;    paths use gdspy.LineString
 
-        #q_geometries = table.apply(self._qgeometry_to_gds, axis=1)
+        #q_geometries = self._qgeometry_table_to_gds(table)
         #setattr(self, f'{chip_name}_{table_name}s', q_geometries)
 
     def _get_table(self, table_name: str, unique_qcomponents: list,
@@ -1191,16 +1693,23 @@ class QGDSRenderer(QRenderer):
 
         return code
 
-    def _populate_cheese(self):
+    def _populate_cheese(self, chip_names: list = None):
         """Iterate through each chip, then layer to determine the cheesing
-        geometry."""
+        geometry.
+
+        Args:
+            chip_names (list): Chips to iterate through.  Defaults to None,
+                               which is every chip in self.chip_info.
+        """
 
         # lib = self.lib
         cheese_sub_layer = int(self.parse_value(self.options.cheese.datatype))
         nocheese_sub_layer = int(
             self.parse_value(self.options.no_cheese.datatype))
+        if chip_names is None:
+            chip_names = list(self.chip_info)
 
-        for chip_name in self.chip_info:
+        for chip_name in chip_names:
             layers_in_chip = self.design.qgeometry.get_all_unique_layers(
                 chip_name)
 
@@ -1211,10 +1720,63 @@ class QGDSRenderer(QRenderer):
                     if status == 0:
                         minx, miny, maxx, maxy = chip_box
 
+                        # The holes and the cheesed ground only add cells,
+                        # and references under TOP_<chip>_<layer>.  Keep them
+                        # with the layer, for the next export.
+                        layer_info = self.chip_info[chip_name][chip_layer]
+                        cheese_key = self._cheese_cache_key(
+                            chip_name, chip_layer, chip_box)
+                        top_layer_name = f'TOP_{chip_name}_{chip_layer}'
+                        cached = layer_info.get('cheese_cells')
+                        if cached is not None and cached[0] == cheese_key:
+                            _, cells, references = cached
+                            for cell in cells:
+                                self.lib.add(cell,
+                                             include_dependencies=False,
+                                             overwrite_duplicate=True)
+                            if top_layer_name in self.lib.cells:
+                                self.lib.cells[top_layer_name].add(references)
+                            continue
+
+                        cells_before = set(self.lib.cells)
+                        top_layer = self.lib.cells.get(top_layer_name)
+                        num_references = (len(top_layer.references)
+                                          if top_layer is not None else 0)
                         self._cheese_based_on_shape(minx, miny, maxx, maxy,
                                                     chip_name, chip_layer,
                                                     cheese_sub_layer,
                                                     nocheese_sub_layer)
+                        new_cells = [
+                            cell for name, cell in self.lib.cells.items()
+                            if name not in cells_before
+                        ]
+                        new_references = (top_layer.references[num_references:]
+                                          if top_layer is not None else [])
+                        layer_info['cheese_cells'] = (cheese_key, new_cells,
+                                                      new_references)
+
+    def _cheese_cache_key(self, chip_name: str, chip_layer: int,
+                          chip_box: tuple) -> str:
+        """Hash what the cheesing of a chip and layer depends on, besides
+        what _layer_cache_key() hashes: the size of the chip, and the
+        junctions added to the ground of the layer.
+
+        Args:
+            chip_name (str): Name of chip to render.
+            chip_layer (int): Layer of the chip to render.
+            chip_box (tuple): The box of the chip, (minx, miny, maxx, maxy).
+
+        Returns:
+            str: The digest.
+        """
+        junction = self.chip_info[chip_name]['junction']
+        path_filename = self.options.path_filename
+        digest = hashlib.sha1(
+            repr((tuple(chip_box), os.path.getmtime(path_filename)
+                  if os.path.isfile(path_filename) else None)).encode())
+        digest.update(
+            _table_fingerprint(junction[junction['layer'] == chip_layer]))
+        return digest.hexdigest()
 
     def _cheese_based_on_shape(self, minx: float, miny: float, maxx: float,
                                maxy: float, chip_name: str, chip_layer: int,
@@ -1303,7 +1865,7 @@ class QGDSRenderer(QRenderer):
         if a_cheese is not None:
             dummy_a_lib = a_cheese.apply_cheesing()
 
-    def _populate_no_cheese(self):
+    def _populate_no_cheese(self, chip_names: list = None):
         """Iterate through every chip and layer.  If options choose to have
         either cheese or no-cheese, a MultiPolygon is placed
         self.chip_info[chip_name][chip_layer]['no_cheese'].
@@ -1312,6 +1874,10 @@ class QGDSRenderer(QRenderer):
         cell with no-cheese at
         f'NoCheese_{chip_name}_{chip_layer}_{sub_layer}'.  The sub_layer
         is data_type and denoted in the options.
+
+        Args:
+            chip_names (list): Chips to iterate through.  Defaults to None,
+                               which is every chip in self.chip_info.
         """
 
         # pylint: disable=too-many-nested-blocks
@@ -1320,8 +1886,10 @@ class QGDSRenderer(QRenderer):
             self.options.no_cheese.buffer))
         sub_layer = int(self.parse_value(self.options.no_cheese.datatype))
         lib = self.lib
+        if chip_names is None:
+            chip_names = list(self.chip_info)
 
-        for chip_name in self.chip_info:
+        for chip_name in chip_names:
             layers_in_chip = self.design.qgeometry.get_all_unique_layers(
                 chip_name)
 
@@ -1334,8 +1902,15 @@ class QGDSRenderer(QRenderer):
 
                         sub_df = self.chip_info[chip_name][chip_layer][
                             'all_subtract_true']
-                        no_cheese_multipolygon = self._cheese_buffer_maker(
-                            sub_df, chip_name, no_cheese_buffer)
+                        # Unless computed by _precompute_in_parallel(), or
+                        # kept from the last export.
+                        layer_info = self.chip_info[chip_name][chip_layer]
+                        if 'no_cheese_union' not in layer_info:
+                            layer_info['no_cheese_union'] = _no_cheese_union(
+                                *self._no_cheese_union_args(
+                                    sub_df, no_cheese_buffer))
+                        no_cheese_multipolygon = self._check_no_cheese_bounds(
+                            layer_info['no_cheese_union'], chip_name)
 
                         if no_cheese_multipolygon is not None:
                             self.chip_info[chip_name][chip_layer][
@@ -1370,59 +1945,46 @@ class QGDSRenderer(QRenderer):
                                 else:
                                     lib.remove(no_cheese_cell)
 
-    def _cheese_buffer_maker(
-        self, sub_df: geopandas.GeoDataFrame, chip_name: str,
-        no_cheese_buffer: float
-    ) -> Union[None, shapely.geometry.multipolygon.MultiPolygon]:
-        """For each layer in each chip, and if it has a ground plane
-        (subtract==True), determine the no-cheese buffer and return a shapely
-        object. Before the buffer is created for no-cheese, the LineStrings and
-        Polygons are all combined.
+    def _no_cheese_union_args(self, sub_df: geopandas.GeoDataFrame,
+                              no_cheese_buffer: float) -> tuple:
+        """Gather the arguments of _no_cheese_union() for one chip and layer.
 
         Args:
             sub_df (geopandas.GeoDataFrame): The subset of QGeometry tables
-                                                for each chip, and layer,
-            and only if the layer has a ground plane.
-            chip_name (str): Name of chip.
-            no_cheese_buffer (float): Will be used for fillet and
-                                    size of buffer.
+                                    for a chip and layer with a ground plane.
+            no_cheese_buffer (float): Size of buffer.
 
         Returns:
-            Union[None, shapely.geometry.multipolygon.MultiPolygon]: The
-            shapely which combines the polygons and linestrings and creates
-            buffer as specificed through default_options.
+            tuple: The positional arguments of _no_cheese_union().
         """
-        # pylint: disable=too-many-locals
         style_cap = int(self.parse_value(self.options.no_cheese.cap_style))
         style_join = int(self.parse_value(self.options.no_cheese.join_style))
 
         poly_sub_df = sub_df[sub_df.geometry.apply(
             lambda x: isinstance(x, shapely.geometry.polygon.Polygon))]
-        poly_sub_geo = poly_sub_df['geometry'].tolist()
-
         path_sub_df = sub_df[sub_df.geometry.apply(
             lambda x: isinstance(x, shapely.geometry.linestring.LineString))]
-        path_sub_geo = path_sub_df['geometry'].tolist()
-        path_sub_width = path_sub_df['width'].tolist()
-        #for n in range(len(path_sub_geo)):
-        for index, _ in enumerate(path_sub_geo):
-            path_sub_geo[index] = path_sub_geo[index].buffer(
-                path_sub_width[index] / 2,
-                cap_style=style_cap,
-                join_style=style_join)
-
-        #  Need to add buffer_size, cap style, and join style to default options
-        combo_list = path_sub_geo + poly_sub_geo
-        combo_shapely = draw.union(combo_list)
-
-        if not combo_shapely.is_empty:
-            #Can return either Multipolygon or just one polygon.
-            combo_shapely = combo_shapely.buffer(no_cheese_buffer,
-                                                 cap_style=style_cap,
-                                                 join_style=style_join)
-            if isinstance(combo_shapely, shapely.geometry.polygon.Polygon):
-                combo_shapely = shapely.geometry.MultiPolygon([combo_shapely])
 
+        return (poly_sub_df['geometry'].tolist(),
+                path_sub_df['geometry'].tolist(), path_sub_df['width'].tolist(),
+                no_cheese_buffer, style_cap, style_join)
+
+    def _check_no_cheese_bounds(
+        self, combo_shapely: Union[None,
+                                   shapely.geometry.multipolygon.MultiPolygon],
+        chip_name: str
+    ) -> Union[None, shapely.geometry.multipolygon.MultiPolygon]:
+        """Warn if the no-cheese region is outside of the chip.
+
+        Args:
+            combo_shapely (Union[None, MultiPolygon]): The no-cheese region.
+            chip_name (str): Name of chip.
+
+        Returns:
+            Union[None, shapely.geometry.multipolygon.MultiPolygon]: The
+            unchanged combo_shapely.
+        """
+        if combo_shapely is not None:
             # Check if the buffer went past the chip size.
             chip_box, status = self.design.get_x_y_for_chip(chip_name)
             if status == 0:
@@ -1438,7 +2000,7 @@ class QGDSRenderer(QRenderer):
             else:
                 self.logger.warning(
                     f'design.get_x_y_for_chip() did NOT return a good code for chip={chip_name},'
-                    f'for _cheese_buffer_maker.  The chip boundary will not be tested.'
+                    f'for the no-cheese region.  The chip boundary will not be tested.'
                 )
 
             # The type of combo_shapely will be
@@ -1488,29 +2050,48 @@ class QGDSRenderer(QRenderer):
             all_chips_top = lib.new_cell(all_chips_top_name,
                                          overwrite_duplicate=True)
             for chip_name in self.chip_info:
-                chip_only_top_name = f'TOP_{chip_name}'
-                chip_only_top = lib.new_cell(chip_only_top_name,
-                                             overwrite_duplicate=True)
+                chip_only_top = self._populate_poly_path_for_chip(
+                    lib, chip_name, precision, max_points)
 
-                layers_in_chip, rectangle_points = self._get_rectangle_points(
-                    chip_name)
+                # put all chips into TOP
+                if chip_only_top is not None:
+                    all_chips_top.add(gdspy.CellReference(chip_only_top))
 
-                for chip_layer in layers_in_chip:
-                    self._handle_photo_resist(lib, chip_only_top, chip_name,
-                                              chip_layer, rectangle_points,
-                                              precision, max_points)
+    def _populate_poly_path_for_chip(
+            self, lib: gdspy.GdsLibrary, chip_name: str, precision: float,
+            max_points: int) -> Union[gdspy.Cell, None]:
+        """Populate lib with the cell named f'TOP_{chip_name}', the ground
+        cell of each layer of the chip, and the junctions.
 
-                # If junction table, import the cell and cell to chip_only_top
-                if 'junction' in self.chip_info[chip_name]:
-                    self._import_junctions_to_one_cell(chip_name, lib,
-                                                       chip_only_top,
-                                                       layers_in_chip)
+        Args:
+            lib (gdspy.GdsLibrary): The gdspy library to export.
+            chip_name (str): Name of chip to render.
+            precision (float): Used for gdspy.
+            max_points (int): Used for gdspy. GDSpy uses 199 as the default.
 
-                # put all chips into TOP
-                if chip_only_top.get_bounding_box() is not None:
-                    all_chips_top.add(gdspy.CellReference(chip_only_top))
-                else:
-                    lib.remove(chip_only_top)
+        Returns:
+            Union[gdspy.Cell, None]: The cell f'TOP_{chip_name}',
+            None if it is empty, and then not in lib.
+        """
+        chip_only_top_name = f'TOP_{chip_name}'
+        chip_only_top = lib.new_cell(chip_only_top_name,
+                                     overwrite_duplicate=True)
+
+        layers_in_chip, rectangle_points = self._get_rectangle_points(chip_name)
+
+        for chip_layer in layers_in_chip:
+            self._handle_photo_resist(lib, chip_only_top, chip_name, chip_layer,
+                                      rectangle_points, precision, max_points)
+
+        # If junction table, import the cell and cell to chip_only_top
+        if 'junction' in self.chip_info[chip_name]:
+            self._import_junctions_to_one_cell(chip_name, lib, chip_only_top,
+                                               layers_in_chip)
+
+        if chip_only_top.get_bounding_box() is None:
+            lib.remove(chip_only_top)
+            return None
+        return chip_only_top
 
     def _handle_photo_resist(self, lib: gdspy.GdsLibrary,
                              chip_only_top: gdspy.library.Cell, chip_name: str,
@@ -1577,30 +2158,10 @@ class QGDSRenderer(QRenderer):
         """
         if len(self.chip_info[chip_name][chip_layer]['q_subtract_true']) != 0:
 
-            # When subtract==True for chip and layer.
-            subtract_true_cell_name = f'SUBTRACT_true_{chip_name}_{chip_layer}'
-            subtract_true_cell = lib.new_cell(subtract_true_cell_name,
-                                              overwrite_duplicate=True)
-            subtract_true_cell.add(
-                self.chip_info[chip_name][chip_layer]['q_subtract_true'])
-
-            #When subtract==False for chip and layer.
-            subtract_false_cell_name = f'SUBTRACT_false_{chip_name}_{chip_layer}'
-            subtract_false_cell = lib.new_cell(subtract_false_cell_name,
-                                               overwrite_duplicate=True)
-            subtract_false_cell.add(
-                self.chip_info[chip_name][chip_layer]['q_subtract_false'])
-
             # Difference for True-False.
-            diff_geometry = gdspy.boolean(subtract_true_cell.get_polygons(),
-                                          subtract_false_cell.get_polygons(),
-                                          'not',
-                                          max_points=max_points,
-                                          precision=precision,
-                                          layer=chip_layer)
-
-            lib.remove(subtract_true_cell)
-            lib.remove(subtract_false_cell)
+            diff_geometry = self._get_ground_difference(chip_name, chip_layer,
+                                                        True, precision,
+                                                        max_points)
 
             if diff_geometry is None:
                 self.design.logger.warning(
@@ -1627,27 +2188,14 @@ class QGDSRenderer(QRenderer):
             max_points (int): Used for gdspy. GDSpy uses 199 as the default.
         """
         if len(self.chip_info[chip_name][chip_layer]['q_subtract_true']) != 0:
-            subtract_cell_name = f'SUBTRACT_{chip_name}_{chip_layer}'
-            subtract_cell = lib.new_cell(subtract_cell_name,
-                                         overwrite_duplicate=True)
-            subtract_cell.add(
-                self.chip_info[chip_name][chip_layer]['q_subtract_true'])
-
             # gdspy.boolean() is not documented clearly.  If there are multiple
             # elements to subtract (both poly & path), the way I could
-            # make it work is to put them into a cell, within lib. I used
+            # make it work is to put them into a cell. I used
             # the method cell_name.get_polygons(), which appears to convert
-            # all elements within the cell to poly. After the boolean(),
-            # I deleted the cell from lib. The memory is freed up then.
-            diff_geometry = gdspy.boolean(
-                self.chip_info[chip_name]['subtract_poly'],
-                subtract_cell.get_polygons(),
-                'not',
-                max_points=max_points,
-                precision=precision,
-                layer=chip_layer)
-
-            lib.remove(subtract_cell)
+            # all elements within the cell to poly.
+            diff_geometry = self._get_ground_difference(chip_name, chip_layer,
+                                                        False, precision,
+                                                        max_points)
 
             if diff_geometry is None:
                 self.design.logger.warning(
@@ -1659,6 +2207,185 @@ class QGDSRenderer(QRenderer):
         QGDSRenderer._add_groundcell_to_chip_only_top(lib, chip_only_top,
                                                       ground_cell)
 
+    def _get_ground_difference(
+            self, chip_name: str, chip_layer: int, is_neg_mask: bool,
+            precision: float,
+            max_points: int) -> Union[gdspy.PolygonSet, list, None]:
+        """Boolean the subtract geometries of chip and layer, unless it was
+        already done by _precompute_in_parallel().
+
+        Args:
+            chip_name (str): Name of chip to render.
+            chip_layer (int): Layer of the chip to render.
+            is_neg_mask (bool): Export a negative mask for chip and layer.
+            precision (float): Used for gdspy.
+            max_points (int): Used for gdspy. GDSpy uses 199 as the default.
+
+        Returns:
+            Union[gdspy.PolygonSet, list, None]: The difference, a list with
+            the difference of each tile if options.ground_plane_tiles has
+            more than one tile, None if empty.
+        """
+        layer_info = self.chip_info[chip_name][chip_layer]
+        if 'ground_difference' not in layer_info:
+            jobs = self._ground_difference_jobs(chip_name, chip_layer,
+                                                is_neg_mask, precision,
+                                                max_points)
+            results, keys = self._get_cached_tiles(chip_name, chip_layer, jobs)
+            for index, job in enumerate(jobs):
+                if results[index] is _NOT_COMPUTED:
+                    results[index] = _ground_difference(*job)
+            self._set_cached_tiles(chip_name, chip_layer, keys, results)
+            layer_info['ground_difference'] = _stitch_ground_tiles(results)
+
+        return layer_info['ground_difference']
+
+    def _get_cached_tiles(self, chip_name: str, chip_layer: int,
+                          jobs: list) -> Tuple[list, list]:
+        """Look up the results of the tiles of the ground plane, computed by
+        the last export.
+
+        Args:
+            chip_name (str): Name of chip to render.
+            chip_layer (int): Layer of the chip to render.
+            jobs (list): Return of _ground_difference_jobs().
+
+        Returns:
+            Tuple[list, list]: The result of each job, or _NOT_COMPUTED, and
+            the key of each job.  A job for the whole chip has no key, it is
+            covered by the key of the layer.
+        """
+        if len(jobs) == 1:
+            return [_NOT_COMPUTED], [None]
+
+        tiles = self._export_cache[(chip_name, chip_layer)]['tiles']
+        keys = [_tile_job_key(job) for job in jobs]
+        return [tiles.get(key, _NOT_COMPUTED) for key in keys], keys
+
+    def _set_cached_tiles(self, chip_name: str, chip_layer: int, keys: list,
+                          results: list):
+        """Keep the results of the tiles of the ground plane, for the next
+        export.
+
+        Args:
+            chip_name (str): Name of chip to render.
+            chip_layer (int): Layer of the chip to render.
+            keys (list): Key of each tile, from _get_cached_tiles().
+            results (list): Result of each tile.
+        """
+        self._export_cache[(chip_name, chip_layer)]['tiles'] = {
+            key: result for key, result in zip(keys, results) if key is not None
+        }
+
+    def _ground_difference_jobs(self, chip_name: str, chip_layer: int,
+                                is_neg_mask: bool, precision: float,
+                                max_points: int) -> list:
+        """The arguments of _ground_difference() for chip and layer.  One job
+        for the whole chip, or one job per tile of the grid given by
+        options.ground_plane_tiles.  The memory and time used by each tile
+        depend on the size of tile, not on the number of elements in layer.
+
+        Args:
+            chip_name (str): Name of chip to render.
+            chip_layer (int): Layer of the chip to render.
+            is_neg_mask (bool): Export a negative mask for chip and layer.
+            precision (float): Used for gdspy.
+            max_points (int): Used for gdspy. GDSpy uses 199 as the default.
+
+        Returns:
+            list: Tuple of positional arguments for each job.
+        """
+        layer_info = self.chip_info[chip_name][chip_layer]
+        _, rectangle_points = self._get_rectangle_points(chip_name)
+        tiles_x = int(self.parse_value(self.options.ground_plane_tiles.x))
+        tiles_y = int(self.parse_value(self.options.ground_plane_tiles.y))
+
+        if tiles_x * tiles_y <= 1:
+            return [(rectangle_points, list(layer_info['q_subtract_true']),
+                     list(layer_info['q_subtract_false']), is_neg_mask,
+                     chip_layer, precision, max_points)]
+
+        return [
+            (rectangle_points, subtract_true, subtract_false, is_neg_mask,
+             chip_layer, precision, max_points, tile_points)
+            for tile_points, subtract_true, subtract_false in _ground_tiles(
+                rectangle_points, layer_info['q_subtract_true'],
+                layer_info['q_subtract_false'], is_neg_mask, tiles_x, tiles_y)
+        ]
+
+    def _precompute_in_parallel(self, parallel: int, chip_names: list = None):
+        """Compute the ground-plane boolean and the no-cheese region of every
+        chip and layer in a pool of processes.  The work for each chip and
+        layer, and each tile of the ground plane, is independent until the
+        cells are added to self.lib.  The
+        results are placed in self.chip_info[chip_name][chip_layer] under
+        'ground_difference' and 'no_cheese_union', to be used by
+        _populate_poly_path_for_export() and _populate_no_cheese().
+
+        Args:
+            parallel (int): Maximum number of worker processes.
+            chip_names (list): Chips to iterate through.  Defaults to None,
+                            which is every chip in self.chip_info.
+        """
+        if chip_names is None:
+            chip_names = list(self.chip_info)
+        precision = float(self.parse_value(self.options.precision))
+        max_points = int(self.parse_value(self.options.max_points))
+        no_cheese_buffer = float(self.parse_value(
+            self.options.no_cheese.buffer))
+
+        with ProcessPoolExecutor(max_workers=parallel) as executor:
+            futures = []
+            for chip_name in chip_names:
+                layers_in_chip = self.design.qgeometry.get_all_unique_layers(
+                    chip_name)
+
+                for chip_layer in layers_in_chip:
+                    layer_info = self.chip_info[chip_name][chip_layer]
+                    if (len(layer_info['q_subtract_true']) != 0 and
+                            'ground_difference' not in layer_info):
+                        jobs = self._ground_difference_jobs(
+                            chip_name, chip_layer,
+                            self._is_negative_mask(chip_name, chip_layer),
+                            precision, max_points)
+                        results, keys = self._get_cached_tiles(
+                            chip_name, chip_layer, jobs)
+                        futures.append(
+                            ((chip_name, chip_layer, results, keys),
+                             'ground_difference', [
+                                 executor.submit(_ground_difference, *job)
+                                 if result is _NOT_COMPUTED else None
+                                 for job, result in zip(jobs, results)
+                             ]))
+
+                    # Same condition as _check_either_cheese() in (1, 2, 3).
+                    codes = {
+                        self._check_no_cheese(chip_name, chip_layer),
+                        self._check_cheese(chip_name, chip_layer)
+                    }
+                    if (1 in codes and codes <= {1, 2} and
+                            len(layer_info['all_subtract_true']) != 0 and
+                            'no_cheese_union' not in layer_info):
+                        futures.append((layer_info, 'no_cheese_union', [
+                            executor.submit(
+                                _no_cheese_union,
+                                *self._no_cheese_union_args(
+                                    layer_info['all_subtract_true'],
+                                    no_cheese_buffer))
+                        ]))
+
+            for target, key, layer_futures in futures:
+                if key == 'ground_difference':
+                    chip_name, chip_layer, results, keys = target
+                    for index, future in enumerate(layer_futures):
+                        if future is not None:
+                            results[index] = future.result()
+                    self._set_cached_tiles(chip_name, chip_layer, keys, results)
+                    self.chip_info[chip_name][chip_layer][
+                        key] = _stitch_ground_tiles(results)
+                else:
+                    target[key] = layer_futures[0].result()
+
     def _handle_q_subtract_false(self, chip_name: str, chip_layer: int,
                                  ground_cell: gdspy.library.Cell):
         """For each layer, add the subtract=false components to ground.
@@ -1679,6 +2406,131 @@ class QGDSRenderer(QRenderer):
                 ground_cell.add(
                     self.chip_info[chip_name][chip_layer]['q_subtract_false'])
 
+        self._add_component_instances(chip_name, chip_layer, ground_cell)
+
+    def _component_placement(self, component_id: int) -> Union[tuple, None]:
+        """Fingerprint the local-frame geometry of a QComponent, from its
+        class and parsed options without pos_x, pos_y and orientation.  Two
+        QComponents with the same fingerprint have the same geometry, up to
+        placement.
+
+        Args:
+            component_id (int): Id of QComponent.
+
+        Returns:
+            Union[tuple, None]: (fingerprint, pos_x, pos_y, orientation),
+            None if the QComponent is not placed by pos_x and pos_y.
+        """
+        component = self.design._components.get(component_id)
+        if component is None:
+            return None
+
+        options = self.parse_value(component.options)
+        pos_x = options.pop('pos_x', None)
+        pos_y = options.pop('pos_y', None)
+        orientation = options.pop('orientation', 0)
+        if not all(
+                isinstance(value, numbers.Number)
+                for value in (pos_x, pos_y, orientation)):
+            return None
+
+        component_class = type(component)
+        try:
+            description = json.dumps(options, sort_keys=True, default=str)
+        except TypeError:
+            # Keys of mixed types can not be sorted.
+            return None
+        digest = hashlib.sha1(
+            f'{component_class.__module__}.{component_class.__qualname__}:'
+            f'{description}'.encode()).hexdigest()[:12]
+        return (f'{component_class.__name__}_{digest}', float(pos_x),
+                float(pos_y), float(orientation))
+
+    def _get_placement(self, chip_name: str,
+                       component_id: int) -> Union[tuple, None]:
+        """Return of _component_placement(), computed once per export.
+
+        Args:
+            chip_name (str): Name of chip to render.
+            component_id (int): Id of QComponent.
+
+        Returns:
+            Union[tuple, None]: (fingerprint, pos_x, pos_y, orientation),
+            None if the QComponent is not placed by pos_x and pos_y.
+        """
+        placements = self.chip_info[chip_name].setdefault('placements', dict())
+        if component_id not in placements:
+            placements[component_id] = self._component_placement(component_id)
+        return placements[component_id]
+
+    def _separate_component_instances(self, chip_name: str, chip_layer: int):
+        """For options.hierarchical, move the subtract==False rows of the
+        QComponents that can be placed by a gdspy.CellReference out of
+        self.chip_info[chip_name][chip_layer]['all_subtract_false'], into
+        self.chip_info[chip_name][chip_layer]['instances_subtract_false'].
+
+        Args:
+            chip_name (str): Name of chip to render.
+            chip_layer (int): Layer of the chip to render.
+        """
+        table = self.chip_info[chip_name][chip_layer]['all_subtract_false']
+
+        instance_ids = [
+            component_id for component_id in table['component'].unique()
+            if self._get_placement(chip_name, component_id) is not None
+        ]
+        is_instance = table['component'].isin(instance_ids).to_numpy()
+        self.chip_info[chip_name][chip_layer][
+            'instances_subtract_false'] = table[is_instance]
+        self.chip_info[chip_name][chip_layer]['all_subtract_false'] = table[
+            ~is_instance]
+
+    def _add_component_instances(self, chip_name: str, chip_layer: int,
+                                 ground_cell: gdspy.library.Cell):
+        """For options.hierarchical, add one gdspy.CellReference to ground
+        for each QComponent in
+        self.chip_info[chip_name][chip_layer]['instances_subtract_false'].
+        The cell of a fingerprint is made once, from the local-frame geometry
+        of the first QComponent with that fingerprint, and named
+        f'{fingerprint}_{chip_layer}'.
+
+        Args:
+            chip_name (str): Name of chip to render.
+            chip_layer (int): Layer of the chip to render.
+            ground_cell (gdspy.library.Cell): The cell in lib to add to.
+                                            Cell created for each layer.
+        """
+        layer_info = self.chip_info[chip_name][chip_layer]
+        if 'instances_subtract_false' not in layer_info:
+            return
+
+        for component_id, rows in layer_info[
+                'instances_subtract_false'].groupby('component', sort=False):
+            fingerprint, pos_x, pos_y, orientation = self._get_placement(
+                chip_name, component_id)
+            cell_name = f'{fingerprint}_{chip_layer}'
+
+            if cell_name not in self.lib.cells:
+                local_rows = rows.copy()
+                local_rows['geometry'] = [
+                    shapely.affinity.rotate(
+                        shapely.affinity.translate(geom, -pos_x, -pos_y),
+                        -orientation,
+                        origin=(0, 0)) for geom in rows['geometry']
+                ]
+                component_cell = self.lib.new_cell(cell_name,
+                                                   overwrite_duplicate=True)
+                component_cell.add([
+                    element
+                    for element in self._qgeometry_table_to_gds(local_rows)
+                    if element is not None
+                ])
+
+            ground_cell.add(
+                gdspy.CellReference(self.lib.cells[cell_name],
+                                    origin=(pos_x, pos_y),
+                                    rotation=orientation))
+
     @classmethod
     def _add_groundcell_to_chip_only_top(cls, lib: gdspy.GdsLibrary,
                                          chip_only_top: gdspy.library.Cell,
@@ -1833,7 +2685,13 @@ class QGDSRenderer(QRenderer):
             self.chip_info[chip_name]['junction']['layer'])
 
         if os.path.isfile(self.options.path_filename):
-            lib.read_gds(self.options.path_filename, units='convert')
+            # Reference the cells parsed by an earlier export, if any.
+            for junction_cell in _read_junction_cells(
+                    self.options.path_filename, lib.unit,
+                    lib.precision).values():
+                lib.add(junction_cell,
+                        include_dependencies=False,
+                        overwrite_duplicate=True)
             for iter_layer in layers_in_chip:
                 if self._is_negative_mask(chip_name, iter_layer):
                     # Want to export negative mask
@@ -2054,7 +2912,9 @@ class QGDSRenderer(QRenderer):
 
     def export_to_gds(self,
                       file_name: str,
-                      highlight_qcomponents: list = None) -> int:
+                      highlight_qcomponents: list = None,
+                      parallel: int = None,
+                      stream: bool = False) -> int:
         """Use the design which was used to initialize this class. The
         QGeometry element types of both "path" and "poly", will be used, to
         convert QGeometry to GDS formatted file.
@@ -2065,6 +2925,16 @@ class QGDSRenderer(QRenderer):
             highlight_qcomponents (list): List of strings which denote
                                         the name of QComponents to render.
                                         If empty, render all components in design.
+            parallel (int): If greater than 1, the ground plane and no-cheese
+                            of every chip and layer are computed in a pool of
+                            up to `parallel` processes, then merged into one
+                            library.  Defaults to None, which is sequential.
+            stream (bool): If True, the cells of each chip are written to
+                           file_name as soon as the chip is finished, then
+                           removed from self.lib.  The peak memory is that of
+                           the largest chip, rather than of the whole design.
+                           The results of a streamed chip are not kept for
+                           the next export.  Defaults to False.
 
         Returns:
             int: 0=file_name can not be written, otherwise 1=file_name has been written
@@ -2083,8 +2953,23 @@ class QGDSRenderer(QRenderer):
         # chip_info[chip_name][layer_number][all_no_subtract_elements]
         self.chip_info.clear()
         self.chip_info.update(self._get_chip_names())
+        for key in list(self._export_cache):
+            if key[0] not in self.chip_info:
+                del self._export_cache[key]
+
+        # When streaming, each chip is gathered by _stream_to_gds(), just
+        # before it is written, so only the QComponent names are checked here.
+        chip_names = [] if stream else None
+        if self._create_qgeometry_for_gds(highlight_qcomponents,
+                                          chip_names) == 0:
+            if stream:
+                self._stream_to_gds(file_name, highlight_qcomponents, parallel)
+                return 1
+
+            if parallel is not None and parallel > 1 and is_true(
+                    self.options.ground_plane):
+                self._precompute_in_parallel(parallel)
 
-        if self._create_qgeometry_for_gds(highlight_qcomponents) == 0:
             # Create self.lib and populate path and poly.
             self._populate_poly_path_for_export()
 
@@ -2105,6 +2990,89 @@ class QGDSRenderer(QRenderer):
 
         return 0
 
+    def _stream_to_gds(self,
+                       file_name: str,
+                       highlight_qcomponents: list,
+                       parallel: int = None):
+        """Export chip by chip, with gdspy.GdsWriter.  Each chip is gathered
+        from QGeometry and populated like export_to_gds() does for the whole
+        design.  Then every cell in self.lib, but the 'TOP' cell, is written
+        and removed from self.lib, and the data of the chip is freed before
+        the next chip is gathered.  Cells shared by chips, like the junctions,
+        are written once.  'TOP' refers to the chips by name and is written
+        last.
+
+        Args:
+            file_name (str): File name which can also include directory path.
+            highlight_qcomponents (list): List of strings which denote
+                                        the name of QComponents to render.
+            parallel (int): If greater than 1, the ground plane and no-cheese
+                            of each chip are computed in a pool of up to
+                            `parallel` processes.  Defaults to None.
+        """
+        precision = float(self.parse_value(self.options.precision))
+        max_points = int(self.parse_value(self.options.max_points))
+
+        lib = self.new_gds_library()
+        writer = gdspy.GdsWriter(file_name,
+                                 unit=lib.unit,
+                                 precision=lib.precision)
+        written = set()
+
+        if is_true(self.options.ground_plane):
+            all_chips_top = lib.new_cell('TOP', overwrite_duplicate=True)
+            for chip_name in self.chip_info:
+                self._create_qgeometry_for_gds(highlight_qcomponents,
+                                               [chip_name])
+                if parallel is not None and parallel > 1:
+                    self._precompute_in_parallel(parallel, [chip_name])
+                chip_only_top = self._populate_poly_path_for_chip(
+                    lib, chip_name, precision, max_points)
+                self._populate_no_cheese([chip_name])
+                self._populate_cheese([chip_name])
+
+                for cell_name in list(lib.cells):
+                    if cell_name == 'TOP':
+                        continue
+                    if cell_name not in written:
+                        writer.write_cell(lib.cells[cell_name])
+                        written.add(cell_name)
+                    lib.remove(cell_name, remove_references=False)
+                    # lib.new_cell() also adds the cell to current_library.
+                    gdspy.current_library.cells.pop(cell_name, None)
+
+                # By name, so the cells of the chip can be freed.
+                if chip_only_top is not None:
+                    all_chips_top.add(
+                        gdspy.CellReference(chip_only_top.name,
+                                            ignore_missing=True))
+                self._free_chip(chip_name)
+
+            writer.write_cell(all_chips_top)
+
+        writer.close()
+
+    def _free_chip(self, chip_name: str):
+        """Drop the QGeometry and the gdspy results of a chip, and do not keep
+        them for the next export.
+
+        Args:
+            chip_name (str): Name of chip to render.
+        """
+        for key in list(self._export_cache):
+            if key[0] == chip_name:
+                del self._export_cache[key]
+
+        self.chip_info[chip_name].clear()
+        self.dict_bounds.pop(chip_name, None)
+
+        # Set by _separate_subtract_shapes().
+        for table_name in self.design.qgeometry.get_element_types():
+            for subtract in ['true', 'false']:
+                attribute = f'{chip_name}_{table_name}_subtract_{subtract}'
+                if hasattr(self, attribute):
+                    delattr(self, attribute)
+
     def _multipolygon_to_gds(
             self, multi_poly: shapely.geometry.multipolygon.MultiPolygon,
             layer: int, data_type: int, no_cheese_buffer: float) -> list:
@@ -2166,134 +3134,128 @@ class QGDSRenderer(QRenderer):
                 all_gds.append(exterior_poly)
         return all_gds
 
-    def _qgeometry_to_gds(
-        self, qgeometry_element: pd.Series
-    ) -> Union['gdspy.polygon', 'gdspy.FlexPath', None]:
-        """Convert the design.qgeometry table to format used by GDS renderer.
-        Convert the class to a series of GDSII elements.
+    def _qgeometry_table_to_gds(self, table: pd.DataFrame) -> pd.Series:
+        """Convert a QGeometry table to the format used by GDS renderer.  The
+        options are parsed once per table, and the coordinates of all the rows
+        of same geometry type are read in one pass.
 
         Args:
-            qgeometry_element (pd.Series): Expect a shapely object.
+            table (pd.DataFrame): Rows of QGeometry tables.
 
         Returns:
-            Union['gdspy.polygon' or 'gdspy.FlexPath' or None]: Convert the
-            class to a series of GDSII format on the input pd.Series.
-
+            pd.Series: The gdspy element for each row of table, None if the
+            row was not converted.  Has the same index as table.
 
         *NOTE:*
         GDS:
-            points (array-like[N][2]) – Coordinates of the vertices of
-                                        the polygon.
-            layer (integer) – The GDSII layer number for this
-                                        qgeometry_element.
-            datatype (integer) – The GDSII datatype for this qgeometry_element
-                                (between 0 and 255).
-                                datatype=10 or 11 means only that they are
-                                from a Polygon vs. LineString.
-                                This can be changed.
+            A Polygon becomes a gdspy.Polygon, or a gdspy.PolygonSet if it has
+            holes, with datatype=10.  A LineString becomes a gdspy.FlexPath
+            with datatype=11.  The datatype only tells them apart, and can
+            be changed.
 
         See:
             https://gdspy.readthedocs.io/en/stable/reference.html#polygon
         """
-
         # pylint: disable=too-many-locals
-
         corners = self.options.corners
         tolerance = self.parse_value(self.options.tolerance)
         precision = self.parse_value(self.options.precision)
         max_points = int(self.parse_value(self.options.max_points))
-
-        geom = qgeometry_element.geometry  # type: shapely.geometry.base.BaseGeometry
-
-        if isinstance(geom, shapely.geometry.Polygon):
-            exterior_poly = gdspy.Polygon(
-                list(geom.exterior.coords),
-                layer=qgeometry_element.layer,
-                datatype=10,
-            )
-
-            # If polygons have a holes, need to remove it for gdspy.
-            all_interiors = list()
-            if geom.interiors:
-                for hole in geom.interiors:
-                    interior_coords = list(hole.coords)
-                    all_interiors.append(interior_coords)
-                a_poly_set = gdspy.PolygonSet(all_interiors,
-                                              layer=qgeometry_element.layer,
-                                              datatype=10)
-                # Since there is max_points in boolean, don't need to do this twice.
-                # a_poly_set = a_poly_set.fracture(max_points=max_points)
-                # exterior_poly = exterior_poly.fracture(max_points=max_points)
-                a_poly = gdspy.boolean(exterior_poly,
-                                       a_poly_set,
-                                       'not',
-                                       max_points=max_points,
-                                       layer=qgeometry_element.layer,
-                                       datatype=10)
-                return a_poly
-
-            exterior_poly = exterior_poly.fracture(max_points=max_points)
-            return exterior_poly
-        if isinstance(geom, shapely.geometry.LineString):
-            #class gdspy.FlexPath(points, width, offset=0, corners='natural',
-            #ends='flush', bend_radius=None, tolerance=0.01, precision=0.001,
-            #max_points=199, gdsii_path=False, width_transform=True, layer=0,
-            #datatype=0)
-
-            #Only fillet, if number is greater than zero.
-
-            use_width = self.parse_value(self.options.width_LineString)
-
-            if math.isnan(qgeometry_element.width):
-                qcomponent_id = self.parse_value(qgeometry_element.component)
-                name = self.parse_value(qgeometry_element['name'])
-                layer_num = self.parse_value(qgeometry_element.layer)
-                width = self.parse_value(qgeometry_element.width)
-                self.logger.warning(
-                    f'Since width:{width} for a Path is not a number, '
-                    f'it will be exported using width_LineString:'
-                    f' {use_width}.  The component_id is:{qcomponent_id},'
-                    f' name is:{name}, layer is: {layer_num}')
+        width_linestring = self.parse_value(self.options.width_LineString)
+
+        to_return = [None] * len(table)
+        if len(table) == 0:
+            return pd.Series(to_return, index=table.index, dtype=object)
+
+        geometries = table['geometry'].to_numpy()
+        layers = table['layer'].tolist()
+        is_poly = np.array(
+            [isinstance(geom, shapely.geometry.Polygon) for geom in geometries])
+        is_path = np.array([
+            isinstance(geom, shapely.geometry.LineString) for geom in geometries
+        ])
+
+        # Polygons, the holes need to be removed for gdspy.
+        poly_rows = np.flatnonzero(is_poly)
+        exteriors = _packed_coordinates(
+            [geom.exterior for geom in geometries[poly_rows]])
+        for row, exterior in zip(poly_rows, exteriors):
+            exterior_poly = gdspy.Polygon(exterior,
+                                          layer=layers[row],
+                                          datatype=10)
+            interiors = geometries[row].interiors
+            if interiors:
+                a_poly_set = gdspy.PolygonSet(
+                    [list(hole.coords) for hole in interiors],
+                    layer=layers[row],
+                    datatype=10)
+                to_return[row] = gdspy.boolean(exterior_poly,
+                                               a_poly_set,
+                                               'not',
+                                               max_points=max_points,
+                                               layer=layers[row],
+                                               datatype=10)
             else:
-                use_width = qgeometry_element.width
+                to_return[row] = exterior_poly.fracture(max_points=max_points)
 
-            if 'fillet' in qgeometry_element:
+        # LineStrings, only fillet if the fillet is a number greater than
+        # zero and not less than the width.
+        path_rows = np.flatnonzero(is_path)
+        if len(path_rows) != 0 and 'fillet' not in table.columns:
+            for row in path_rows:
+                self.logger.warning(
+                    f'Linestring did not have fillet in column. '
+                    f'The qgeometry_element was not drawn.\n'
+                    f'The qgeometry_element within table is:\n'
+                    f'{table.iloc[row]}')
+            path_rows = path_rows[:0]
+
+        if len(path_rows) != 0:
+            widths = table['width'].to_numpy(dtype=float)[path_rows]
+            fillets = table['fillet'].to_numpy(dtype=float)[path_rows]
+            with np.errstate(invalid='ignore'):
+                use_fillet = ~(np.isnan(fillets) | (fillets <= 0) |
+                               (fillets < widths))
+
+            for row in path_rows[np.isnan(widths)]:
+                qgeometry_element = table.iloc[row]
+                self.logger.warning(
+                    f'Since width:{qgeometry_element.width} for a Path is not '
+                    f'a number, it will be exported using width_LineString:'
+                    f' {width_linestring}.  The component_id is:'
+                    f'{qgeometry_element.component}, name is:'
+                    f'{qgeometry_element["name"]}, layer is: '
+                    f'{qgeometry_element.layer}')
+            use_widths = np.where(np.isnan(widths), width_linestring,
+                                  widths).tolist()
+            fillets = fillets.tolist()
+
+            all_coords = _packed_coordinates(geometries[path_rows])
+            for index, (row, coords) in enumerate(zip(path_rows, all_coords)):
+                if use_fillet[index]:
+                    to_return[row] = gdspy.FlexPath(coords,
+                                                    use_widths[index],
+                                                    layer=layers[row],
+                                                    datatype=11,
+                                                    max_points=max_points,
+                                                    corners=corners,
+                                                    bend_radius=fillets[index],
+                                                    tolerance=tolerance,
+                                                    precision=precision)
+                else:
+                    to_return[row] = gdspy.FlexPath(coords,
+                                                    use_widths[index],
+                                                    layer=layers[row],
+                                                    max_points=max_points,
+                                                    datatype=11)
 
-                if (math.isnan(qgeometry_element.fillet) or
-                        qgeometry_element.fillet <= 0 or
-                        qgeometry_element.fillet < qgeometry_element.width):
+        for geom in geometries[~(is_poly | is_path)]:
+            self.logger.warning(
+                f'Unexpected shapely object geometry.'
+                f'The variable qgeometry_element is {type(geom)}, '
+                f'method can currently handle Polygon and FlexPath.')
 
-                    to_return = gdspy.FlexPath(list(geom.coords),
-                                               use_width,
-                                               layer=qgeometry_element.layer,
-                                               max_points=max_points,
-                                               datatype=11)
-                else:
-                    to_return = gdspy.FlexPath(
-                        list(geom.coords),
-                        use_width,
-                        layer=qgeometry_element.layer,
-                        datatype=11,
-                        max_points=max_points,
-                        corners=corners,
-                        bend_radius=qgeometry_element.fillet,
-                        tolerance=tolerance,
-                        precision=precision)
-                return to_return
-
-            # Could be junction table with a linestring.
-            # Look for gds_path_filename in column.
-            self.logger.warning(f'Linestring did not have fillet in column. '
-                                f'The qgeometry_element was not drawn.\n'
-                                f'The qgeometry_element within table is:\n'
-                                f'{qgeometry_element}')
-            return None  # Need explicitly to avoid lint warnings.
-
-        self.logger.warning(
-            f'Unexpected shapely object geometry.'
-            f'The variable qgeometry_element is {type(geom)}, '
-            f'method can currently handle Polygon and FlexPath.')
-        return None
+        return pd.Series(to_return, index=table.index, dtype=object)
 
     def _get_chip_names(self) -> Dict:
         """Returns a dict of unique chip names for ALL tables within QGeometry.
@@ -14,9 +14,13 @@
 """ For GDS export, separate the logic for cheesing."""
 
 import logging
-from typing import Union
+from typing import Tuple, Union
 import gdspy
 import shapely
+from shapely.affinity import translate
+from shapely.geometry.base import BaseGeometry
+from shapely.ops import unary_union
+from shapely.strtree import STRtree
 import numpy as np
 
 
@@ -31,6 +35,10 @@ class Cheesing():
     # To be used by QGDSRenderer only.
     # Number of instance attributes is acceptable for this case.
 
+    tile_holes = 16
+    """Number of holes along each side of a tile of the grid.  A tile that
+    does not touch the keepout is placed as one gdspy.CellArray."""
+
     def __init__(
         self,
         multi_poly: shapely.geometry.multipolygon.MultiPolygon,
@@ -155,6 +163,13 @@ class Cheesing():
 
         self.hole = None
 
+        # Holes of each tile of the grid, by (x_index, y_index).  Either the
+        # gdspy.CellArray of the tile, or a list of the holes of an edge tile.
+        self.tile_holes_of = dict()
+
+        # Ground around a single hole, for the tiles fully covered by ground.
+        self.ground_unit_cell = None
+
     def apply_cheesing(self) -> gdspy.GdsLibrary:
         """Prototype, not complete.
 
@@ -270,17 +285,14 @@ class Cheesing():
         return a_poly
 
     def _cell_with_grid(self):
-        """Use the hole at self.one_hole_cell to create a grid.
+        """Use the hole at self.hole to create a grid.
 
-        Then use the no_cheese cell to remove the holes from grid.  The
+        Then use the no_cheese region to remove the holes from grid.  The
         difference will be used subtract from the ground layer with
         geometry. The cells are added to the Top_<chip_name>.
         """
 
-        gather_holes_cell = self._get_all_holes()
-        diff_holes_cell = self._subtract_keepout_from_hole_grid(
-            gather_holes_cell)
-        self.lib.remove(gather_holes_cell)
+        diff_holes_cell = self._subtract_keepout_from_hole_grid()
 
         if self.is_neg_mask:
             #negative mask for given chip and layer
@@ -314,75 +326,213 @@ class Cheesing():
             else:
                 self.lib.remove(diff_holes_cell)
 
-    def _subtract_keepout_from_hole_grid(
-            self, gather_holes_cell: gdspy.library.Cell) -> gdspy.library.Cell:
-        """Given a cell with all the holes, subtract the keepout region.
-        Then return a new cell with the result.
+    def _subtract_keepout_from_hole_grid(self) -> gdspy.library.Cell:
+        """Make the grid of holes, minus the keepout region, in a new cell.
 
-        Args:
-            gather_holes_cell (gdspy.library.Cell): Holds a grid of all
-                                                the holes for cheesing.
+        The grid is split into tiles of tile_holes x tile_holes holes.  Using
+        an R-tree (STRtree) of the keepout region, a tile that is clear of
+        the keepout becomes one gdspy.CellArray, and a tile inside the keepout
+        is dropped.  Only the holes of the remaining tiles, which touch the
+        edge of the keepout, are checked one by one, and only the holes that
+        cross the edge need gdspy.boolean().
 
         Returns:
             gdspy.library.Cell: Newly created cell that holds the difference
                                         of holes minus the keep=out region.
         """
-
-        # subtact the keepout, note, Based on user options,
-        # the keepout (no_cheese) cell may not be in self.lib.
-        temp_keepout_chip_layer_cell = f'temp_keepout_{self.chip_name}_{self.layer}'
-        temp_keepout_cell = self.lib.new_cell(temp_keepout_chip_layer_cell,
-                                              overwrite_duplicate=True)
-        temp_keepout_cell.add(self.nocheese_gds)
-        diff_holes = gdspy.boolean(gather_holes_cell.get_polygonsets(),
-                                   temp_keepout_cell.get_polygonsets(),
-                                   'not',
-                                   max_points=self.max_points,
-                                   precision=self.precision,
-                                   layer=self.layer,
-                                   datatype=self.datatype_cheese + 1)
         diff_holes_cell_name = f'TOP_{self.chip_name}_{self.layer}_Cheese_diff'
         diff_holes_cell = self.lib.new_cell(diff_holes_cell_name,
                                             overwrite_duplicate=True)
-        diff_holes_cell.add(diff_holes)
+        if self.one_hole_cell is None:
+            return diff_holes_cell
+
+        hole_cell = self._get_hole_cell(self.datatype_cheese + 1)
+        x_holes, y_holes = self._get_hole_grid()
+        hole_minx, hole_miny, hole_maxx, hole_maxy = self.hole.bounds
+        keepout, keepout_gds, tree, lookup = self._get_keepout_index()
+
+        for x_index in range(0, len(x_holes), self.tile_holes):
+            x_tile = x_holes[x_index:x_index + self.tile_holes]
+            for y_index in range(0, len(y_holes), self.tile_holes):
+                y_tile = y_holes[y_index:y_index + self.tile_holes]
+                tile_box = shapely.geometry.box(x_tile[0] + hole_minx,
+                                                y_tile[0] + hole_miny,
+                                                x_tile[-1] + hole_maxx,
+                                                y_tile[-1] + hole_maxy)
+
+                near = self._query_keepout(tree, lookup, keepout, tile_box)
+                if not near:
+                    holes = gdspy.CellArray(hole_cell,
+                                            len(x_tile),
+                                            len(y_tile),
+                                            (self.delta_x, self.delta_y),
+                                            origin=(x_tile[0], y_tile[0]))
+                elif not any(
+                        keepout[index].contains(tile_box) for index in near):
+                    holes = self._get_holes_of_edge_tile(
+                        hole_cell, x_tile, y_tile,
+                        [keepout[index] for index in near],
+                        [keepout_gds[index] for index in near]
+                        if keepout_gds is not None else self.nocheese_gds)
+                else:
+                    continue
+                diff_holes_cell.add(holes)
+                self.tile_holes_of[(x_index, y_index)] = holes
+
+        if not diff_holes_cell.references:
+            # No hole is referenced, so do not leave an orphan cell in lib.
+            self.lib.remove(hole_cell)
 
-        self.lib.remove(temp_keepout_chip_layer_cell)
         return diff_holes_cell
 
-    def _get_all_holes(self) -> gdspy.library.Cell:
-        """Return a cell with a grid of holes. The keepout has not been
-        applied yet.
+    def _get_holes_of_edge_tile(self, hole_cell: gdspy.library.Cell,
+                                x_tile: np.ndarray, y_tile: np.ndarray,
+                                near_keepout: list,
+                                near_keepout_gds: list) -> list:
+        """Get the holes of a tile which touches the keepout region.  The holes
+        clear of the keepout are referenced, the holes inside the keepout are
+        dropped, and the holes that cross the edge of the keepout are cut by
+        gdspy.boolean().
+
+        Args:
+            hole_cell (gdspy.library.Cell): Cell with a single hole.
+            x_tile (np.ndarray): x location of the holes in tile.
+            y_tile (np.ndarray): y location of the holes in tile.
+            near_keepout (list): Shapely polygons of the keepout near tile.
+            near_keepout_gds (list): The gdspy elements of near_keepout.
+
+        Returns:
+            list: The gdspy elements of the holes.
+        """
+        local_keepout = unary_union(near_keepout)
+        hole_coords = np.asarray(self.hole.exterior.coords)
+        holes = []
+        cut_holes = []
+
+        for x_loc in x_tile:
+            for y_loc in y_tile:
+                a_hole = translate(self.hole, x_loc, y_loc)
+                if local_keepout.contains(a_hole):
+                    continue
+                if local_keepout.intersects(a_hole):
+                    cut_holes.append(
+                        gdspy.Polygon(hole_coords + (x_loc, y_loc),
+                                      layer=self.layer,
+                                      datatype=self.datatype_cheese + 1))
+                else:
+                    holes.append(
+                        gdspy.CellReference(hole_cell, origin=(x_loc, y_loc)))
+
+        if cut_holes:
+            diff_holes = gdspy.boolean(cut_holes,
+                                       near_keepout_gds,
+                                       'not',
+                                       max_points=self.max_points,
+                                       precision=self.precision,
+                                       layer=self.layer,
+                                       datatype=self.datatype_cheese + 1)
+            if diff_holes is not None:
+                holes.append(diff_holes)
+
+        return holes
+
+    def _get_hole_cell(self, datatype: int) -> gdspy.library.Cell:
+        """Make a cell with a single hole at (0,0), to be referenced by the
+        grid of holes.
+
+        Args:
+            datatype (int): Datatype of the hole.
 
         Returns:
-            gdspy.library.Cell: Cell containing all the holes.
+            gdspy.library.Cell: The cell in self.lib.
         """
-        gather_holes_cell_name = f'Gather_holes_{self.chip_name}_{self.layer}'
-        gather_holes_cell = self.lib.new_cell(gather_holes_cell_name,
-                                              overwrite_duplicate=True)
+        hole_cell_name = f'TOP_{self.chip_name}_{self.layer}_Cheese_hole'
+        hole_cell = self.lib.new_cell(hole_cell_name, overwrite_duplicate=True)
+        hole_cell.add(
+            gdspy.Polygon(
+                list(self.hole.exterior.coords),
+                layer=self.layer,
+                datatype=datatype).fracture(max_points=self.max_points))
+        return hole_cell
+
+    def _get_hole_grid(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Location of the holes, the keepout has not been applied yet.
 
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The x and the y locations.
+        """
         x_holes = np.arange(self.grid_minx,
                             self.grid_maxx,
                             self.delta_x,
-                            dtype=float).tolist()
+                            dtype=float)
         y_holes = np.arange(self.grid_miny,
                             self.grid_maxy,
                             self.delta_y,
-                            dtype=float).tolist()
+                            dtype=float)
+        return x_holes, y_holes
+
+    def _get_keepout_index(self) -> tuple:
+        """Build an R-tree (STRtree) over the polygons of the keepout region.
+
+        Returns:
+            tuple: (keepout, keepout_gds, tree, lookup), where keepout is the
+            list of shapely polygons, keepout_gds is the gdspy element of each
+            or None if they do not match one to one, tree is the STRtree or
+            None if there is no keepout, and lookup maps the id of a polygon
+            to its index in keepout.
+        """
+        if isinstance(self.multi_poly, shapely.geometry.Polygon):
+            keepout = [self.multi_poly]
+        elif isinstance(self.multi_poly, shapely.geometry.MultiPolygon):
+            keepout = list(self.multi_poly.geoms)
+        else:
+            keepout = []
+
+        # QGDSRenderer makes one gdspy element for each polygon.
+        keepout_gds = None
+        if isinstance(self.nocheese_gds, list) and len(
+                self.nocheese_gds) == len(keepout):
+            keepout_gds = self.nocheese_gds
 
-        if self.one_hole_cell is not None:
-            for x_loc in x_holes:
-                for y_loc in y_holes:
-                    gather_holes_cell.add(
-                        gdspy.CellReference(self.one_hole_cell,
-                                            origin=(x_loc, y_loc)))
+        tree = STRtree(keepout) if keepout else None
+        lookup = {id(poly): index for index, poly in enumerate(keepout)}
+        return keepout, keepout_gds, tree, lookup
 
-        return gather_holes_cell
+    @staticmethod
+    def _query_keepout(tree: Union[STRtree, None], lookup: dict, keepout: list,
+                       region: BaseGeometry) -> list:
+        """Find the polygons of the keepout which intersect a region.
+
+        Args:
+            tree (Union[STRtree, None]): R-tree of keepout.
+            lookup (dict): Maps the id of a polygon to its index in keepout.
+            keepout (list): Shapely polygons of the keepout.
+            region (BaseGeometry): Region to search.
+
+        Returns:
+            list: Index in keepout of each polygon that intersects region.
+        """
+        if tree is None:
+            return []
+        candidates = tree.query(region)
+        if len(candidates) == 0:
+            return []
+        if isinstance(candidates[0], BaseGeometry):
+            # shapely < 2.0 returns the polygons
+            indices = [lookup[id(poly)] for poly in candidates]
+        else:
+            # shapely >= 2.0 returns their indices
+            indices = [int(index) for index in candidates]
+        return [
+            index for index in sorted(indices)
+            if keepout[index].intersects(region)
+        ]
 
     def _subtract_holes_from_ground(
             self, diff_holes_cell) -> Union[gdspy.library.Cell, None]:
         """Get reference to ground cell and then subtract the holes from
-        ground. Place the difference into a new cell, which will eventually
-        be added under Top.
+        ground, tile by tile. Place the difference into a new cell, which
+        will eventually be added under Top.
 
         Args:
             diff_holes_cell ([type]): Cell which contains all the holes.
@@ -396,24 +546,133 @@ class Cheesing():
         top_chip_layer_name = f'TOP_{self.chip_name}_{self.layer}'
         if top_chip_layer_name in self.lib.cells.keys():
             ground_cell = self.lib.cells[top_chip_layer_name]
-            ground_cheese = gdspy.boolean(ground_cell.get_polygons(),
-                                          diff_holes_cell.get_polygonsets(),
-                                          'not',
-                                          max_points=self.max_points,
-                                          precision=self.precision,
-                                          layer=self.layer,
-                                          datatype=self.datatype_cheese)
+            cheese_cells = (self.one_hole_cell, diff_holes_cell)
+            # gdspy.slice() only takes the polygons of paths, not the paths
+            # themselves, within a list.
+            ground = ground_cell.polygons + [
+                polygon for path in ground_cell.paths
+                for polygon in path.get_polygons()
+            ] + [
+                reference for reference in ground_cell.references
+                if reference.ref_cell not in cheese_cells
+            ]
             ground_cheese_cell_name = (f'TOP_{self.chip_name}_{self.layer}'
                                        f'_Cheese_{self.datatype_cheese}')
             ground_cheese_cell = self.lib.new_cell(ground_cheese_cell_name,
                                                    overwrite_duplicate=True)
-            return ground_cheese_cell.add(ground_cheese)
+            if ground:
+                self._add_ground_of_tiles(ground_cheese_cell, ground)
+            return ground_cheese_cell
 
         self.logger.warning(
             f'The cell:{top_chip_layer_name} was not found in self.lib. '
             f'Cheesing not implemented.')
         return None
 
+    def _add_ground_of_tiles(self, ground_cheese_cell: gdspy.library.Cell,
+                             ground: list):
+        """Slice the ground along the edges of the tiles of the grid, and
+        subtract from each slice only the holes of its tile.  A tile fully
+        covered by ground, with the holes of a gdspy.CellArray, is added as a
+        gdspy.CellArray of the ground around a single hole.  The ground out
+        of the grid has no holes and is added as it is.
+
+        Args:
+            ground_cheese_cell (gdspy.library.Cell): Cell to add the cheesed
+                                                    ground to.
+            ground (list): The gdspy elements of ground.
+        """
+        x_holes, y_holes = self._get_hole_grid()
+        x_cuts = np.append(x_holes[::self.tile_holes],
+                           x_holes[-1] + self.delta_x) - self.delta_x / 2
+        y_cuts = np.append(y_holes[::self.tile_holes],
+                           y_holes[-1] + self.delta_y) - self.delta_y / 2
+        options = dict(precision=self.precision,
+                       layer=self.layer,
+                       datatype=self.datatype_cheese)
+
+        columns = gdspy.slice(ground, list(x_cuts), 0, **options)
+        clear = [columns[0], columns[-1]]
+        for x_number, column in enumerate(columns[1:-1]):
+            if column is None:
+                continue
+            pieces = gdspy.slice(column, list(y_cuts), 1, **options)
+            clear += [pieces[0], pieces[-1]]
+            for y_number, piece in enumerate(pieces[1:-1]):
+                if piece is None:
+                    continue
+                holes = self.tile_holes_of.get(
+                    (x_number * self.tile_holes, y_number * self.tile_holes))
+                if holes is None:
+                    clear.append(piece)
+                elif isinstance(holes, gdspy.CellArray) and self._covers_tile(
+                        piece, holes):
+                    ground_cheese_cell.add(
+                        gdspy.CellArray(self._get_ground_unit_cell(),
+                                        holes.columns,
+                                        holes.rows,
+                                        holes.spacing,
+                                        origin=holes.origin))
+                else:
+                    ground_cheese = gdspy.boolean(piece,
+                                                  holes,
+                                                  'not',
+                                                  max_points=self.max_points,
+                                                  **options)
+                    if ground_cheese is not None:
+                        ground_cheese_cell.add(ground_cheese)
+
+        for piece in clear:
+            if piece is not None:
+                ground_cheese_cell.add(
+                    piece.fracture(max_points=self.max_points,
+                                   precision=self.precision))
+
+    def _covers_tile(self, piece: gdspy.PolygonSet,
+                     holes: gdspy.CellArray) -> bool:
+        """Check if the ground of a tile covers all of the tile.
+
+        Args:
+            piece (gdspy.PolygonSet): The ground sliced to the tile.
+            holes (gdspy.CellArray): The holes of the tile.
+
+        Returns:
+            bool: True if there is no gap in the ground of the tile.
+        """
+        tile_minx = holes.origin[0] - self.delta_x / 2
+        tile_miny = holes.origin[1] - self.delta_y / 2
+        tile = gdspy.Rectangle((tile_minx, tile_miny),
+                               (tile_minx + holes.columns * self.delta_x,
+                                tile_miny + holes.rows * self.delta_y))
+        return gdspy.boolean(tile, piece, 'not',
+                             precision=self.precision) is None
+
+    def _get_ground_unit_cell(self) -> gdspy.library.Cell:
+        """Make a cell with the ground around a single hole at (0,0), the size
+        of the spacing of the holes, to be referenced by the tiles which are
+        fully covered by ground.
+
+        Returns:
+            gdspy.library.Cell: The cell in self.lib.
+        """
+        if self.ground_unit_cell is None:
+            unit_cell_name = (f'TOP_{self.chip_name}_{self.layer}'
+                              f'_Cheese_{self.datatype_cheese}_unit')
+            self.ground_unit_cell = self.lib.new_cell(unit_cell_name,
+                                                      overwrite_duplicate=True)
+            unit = gdspy.Rectangle((-self.delta_x / 2, -self.delta_y / 2),
+                                   (self.delta_x / 2, self.delta_y / 2))
+            hole = gdspy.Polygon(list(self.hole.exterior.coords))
+            self.ground_unit_cell.add(
+                gdspy.boolean(unit,
+                              hole,
+                              'not',
+                              max_points=self.max_points,
+                              precision=self.precision,
+                              layer=self.layer,
+                              datatype=self.datatype_cheese))
+        return self.ground_unit_cell
+
     def _move_to_under_top_chip_layer_name(self, a_cell: gdspy.library.Cell):
         """Move the cell to under TOP_<chip name>_<layer number>.
 
@@ -13,5 +13,10 @@
 # that they have been altered from the originals.
 """"""
 
+# Qt and matplotlib have to be set up before the mpl renderer is imported
+from ... import _setup_Qt_backend
+
+_setup_Qt_backend()
+
 #from .renderer_mpl import  QRendererMPL
 #from . import toolbox
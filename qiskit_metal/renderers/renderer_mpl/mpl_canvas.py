@@ -13,8 +13,10 @@
 # that they have been altered from the originals.
 """MPL Canvas."""
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 import random
 import sys
+import threading
 from typing import TYPE_CHECKING, List
 
 import matplotlib
@@ -34,7 +36,7 @@ from matplotlib.collections import LineCollection, PatchCollection
 from matplotlib.figure import Figure
 from matplotlib.transforms import Bbox
 from PySide2 import QtCore
-from PySide2.QtCore import QTimer
+from PySide2.QtCore import QTimer, Signal
 from PySide2.QtGui import QIcon
 from PySide2.QtWidgets import (QApplication, QMainWindow, QMenu, QMessageBox,
                                QPushButton, QSizePolicy, QVBoxLayout, QWidget)
@@ -312,6 +314,20 @@ MPL_CONTEXT_DEFAULT = {
     #hatch.linewidth : 1.0
 }
 
+
+def _stop_render_executor(executor: ThreadPoolExecutor,
+                          stopped: threading.Event):
+    """Stop the worker thread of the plots of a PlotCanvas, without waiting
+    for the render in progress, which stops at its next component.
+
+    Args:
+        executor (ThreadPoolExecutor): Worker thread of the canvas
+        stopped (threading.Event): Set to cancel the render in progress
+    """
+    stopped.set()
+    executor.shutdown(wait=False)
+
+
 # TODO: Create an interface class for canvas based on this class
 # This class should then inherit it
 
@@ -325,6 +341,9 @@ class PlotCanvas(FigureCanvas):
         `canvas = gui.canvas`
     """
 
+    # Artists made by the worker thread, see _plot_in_thread()
+    _artists_made = Signal(int, object, object, object)
+
     # See https://github.com/matplotlib/matplotlib/blob/master/lib/matplotlib/backends/backend_qt5agg.py
     # Consider using pyqtgraph https://stackoverflow.com/questions/40126176/fast-live-plotting-in-matplotlib-pyplot.
 
@@ -348,6 +367,8 @@ class PlotCanvas(FigureCanvas):
             path_simplify=True,
             path_simplify_threshold=1.0,
             chunksize=5000,
+            # ms to wait after the last pan or zoom before rendering the view
+            view_update_delay=150,
         )
         # Update with local user config after this
 
@@ -377,6 +398,24 @@ class PlotCanvas(FigureCanvas):
         self.panzoom.logger = self.logger
         self.panzoom._statusbar_label = self.statusbar_label
 
+        # Renders the view again once a pan or zoom is over.
+        self._view_timer = QTimer(self)
+        self._view_timer.setSingleShot(True)
+        self._view_timer.setInterval(self.config.view_update_delay)
+        self._view_timer.timeout.connect(self._update_view)
+
+        # Makes the artists of the plots, one at a time.  See plot().
+        self._render_executor = ThreadPoolExecutor(max_workers=1)
+        self._render_future = None
+        self._render_generation = 0
+        # Set once the canvas is closed or destroyed.
+        self._render_stopped = threading.Event()
+        self._artists_made.connect(self._on_artists_made)
+        # A canvas in a window is destroyed with it, without a close event.
+        # Not a method of self, which is gone by then.
+        executor, stopped = self._render_executor, self._render_stopped
+        self.destroyed.connect(lambda: _stop_render_executor(executor, stopped))
+
         self.setup_figure_and_axes()
 
         self.metal_renderer = QMplRenderer(canvas=self,
@@ -413,6 +452,8 @@ class PlotCanvas(FigureCanvas):
                 self.style_axis(ax, num)
                 ax.set_xlim([-0.5, 0.5])
                 ax.set_ylim([-0.5, 0.5])
+                ax.callbacks.connect('xlim_changed', self._on_view_changed)
+                ax.callbacks.connect('ylim_changed', self._on_view_changed)
 
     def setup_rendering(self):
         """Line segment simplificatio: For plots that have line segments (e.g.
@@ -463,6 +504,11 @@ class PlotCanvas(FigureCanvas):
     def plot(self, clear=True, with_try=True):
         """Render the plot.
 
+        With clear=False, only the components which changed since the last
+        plot are drawn again.  Their artists are made in a worker thread,
+        so that the GUI stays responsive, and then added to the axis by
+        _on_artists_made().  A newer plot cancels the work of an older one.
+
         Args:
             clear (bool): True to clear everything first.  Defaults to True.
             with_try (bool): True to execute in a try-catch block.  Defaults to True.
@@ -470,48 +516,139 @@ class PlotCanvas(FigureCanvas):
         Raises:
             Exception: Plotting error
         """
-        # TODO: Maybe do in a thread?
-        self.hide()
-        # the artist will be removed by the clear axis.
-        self._force_clear_annotations()
+        # the annotations are redrawn by highlight_components().
+        self.clear_annotation()
 
         ax = self.get_axis()
 
-        def prep():
-            # Push state
-            self._state['xlim'] = ax.get_xlim()
-            self._state['ylim'] = ax.get_ylim()
-
         def main_plot():
             # for temporary style
             with mpl.rc_context(rc=self.mpl_context):
-                if clear:
+                if clear or self._state.get('plotted_axis') is not ax:
+                    # Push state
+                    self._state['xlim'] = ax.get_xlim()
+                    self._state['ylim'] = ax.get_ylim()
+                    self.metal_renderer.clear_artists()
                     self.clear_axis(ax)
-                self._plot(ax)
-                self._watermark_axis(ax)
-
-        def final():
-            self.draw()
-            # Restore the state
-            ax.set_xlim(self._state['xlim'])
-            ax.set_ylim(self._state['ylim'])
-            self.show()
+                    self._watermark_axis(ax)
+                    self._state['plotted_axis'] = ax
+                    # Restore the state
+                    ax.set_xlim(self._state['xlim'])
+                    ax.set_ylim(self._state['ylim'])
+                self._plot_in_thread(ax)
 
         if with_try:
             # speed impact?
             try:
-                prep()
                 main_plot()
 
             except Exception as e:
                 log_error_easy(self.logger, post_text=f'Plotting error: {e}')
 
-            finally:
-                final()
-
         else:
             main_plot()
-            final()
+
+        self.draw_idle()
+
+    def _plot_in_thread(self, ax: plt.Axes):
+        """Plan the render of the axis on this thread, make its artists in
+        the worker thread, and add them with _on_artists_made().  Cancels the
+        render in progress, if any.
+
+        Args:
+            ax (plt.Axes): axes
+        """
+        self._render_generation += 1
+        generation = self._render_generation
+        if self._render_future is not None:
+            self._render_future.cancel()
+
+        stopped = self._render_stopped
+
+        def is_cancelled():
+            return stopped.is_set() or generation != self._render_generation
+
+        def emit(future: Future):
+            if is_cancelled():
+                return
+            try:
+                self._artists_made.emit(generation, ax, plan, future)
+            except RuntimeError:
+                pass  # The canvas was destroyed meanwhile
+
+        plan = self.metal_renderer.plan_render(ax)
+        self._render_future = self._render_executor.submit(
+            self.metal_renderer.make_artists, plan, is_cancelled)
+        self._render_future.add_done_callback(emit)
+
+    def _stop_render_thread(self):
+        """Cancel the render in progress, if any, and stop the worker thread
+        of _plot_in_thread() once it is done.  No plot can be made after."""
+        if self._render_future is not None:
+            self._render_future.cancel()
+            self._render_future = None
+        _stop_render_executor(self._render_executor, self._render_stopped)
+
+    def closeEvent(self, event):
+        """Stop the worker thread of the plots when the canvas is closed.
+
+        Args:
+            event (QCloseEvent): The close event
+        """
+        self._stop_render_thread()
+        super().closeEvent(event)
+
+    def _on_artists_made(self, generation: int, ax: plt.Axes, plan: tuple,
+                         future: Future):
+        """Add the artists made by the worker thread to the axis, on the GUI
+        thread, unless a newer plot started since.
+
+        Args:
+            generation (int): Number of the plot which made them
+            ax (plt.Axes): axes
+            plan (tuple): Plan of the render, see QMplRenderer.plan_render()
+            future (Future): Work of the worker thread
+        """
+        if generation != self._render_generation or future.cancelled():
+            return
+
+        try:
+            made = future.result()
+            if made is None:
+                return  # Cancelled
+            xlim, ylim = ax.get_xlim(), ax.get_ylim()
+            with mpl.rc_context(rc=self.mpl_context):
+                self.metal_renderer.apply_artists(ax, plan, made)
+            # Adding collections can autoscale the axis, keep the view.
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+        except Exception as e:
+            log_error_easy(self.logger, post_text=f'Plotting error: {e}')
+        self.draw_idle()
+
+    def _on_view_changed(self, ax: plt.Axes):
+        """Called when the limits of an axis change, such as by a pan or zoom
+        of PanAndZoom.  Restarts the timer of _update_view(), so that a pan
+        renders once, when it is over.
+
+        Args:
+            ax (plt.Axes): axes
+        """
+        self._view_timer.start()
+
+    def _update_view(self):
+        """Render the current axis again if its view needs it, see
+        QMplRenderer.view_needs_render()."""
+        ax = self.get_axis()
+        if self._state.get('plotted_axis') is not ax:
+            return  # Not plotted yet
+        if not self.metal_renderer.view_needs_render(ax):
+            return
+
+        try:
+            self._plot_in_thread(ax)
+        except Exception as e:
+            log_error_easy(self.logger, post_text=f'Plotting error: {e}')
 
     def _watermark_axis(self, ax: plt.Axes):
         """Add a watermark.
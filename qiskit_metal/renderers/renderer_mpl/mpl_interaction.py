@@ -162,8 +162,9 @@ class MplInteraction(object):
         return x_axes, y_axes
 
     def _draw(self):
-        """Conveninent method to redraw the figure."""
-        self.figure.canvas.draw()
+        """Conveninent method to redraw the figure.  The draw is done when the
+        GUI is idle, so that a burst of pan or zoom events draws once."""
+        self.figure.canvas.draw_idle()
 
 
 class ZoomOnWheel(MplInteraction):
@@ -15,6 +15,7 @@
 import logging
 import random
 import sys
+import threading
 from typing import TYPE_CHECKING, List
 
 import matplotlib as mpl
@@ -45,6 +46,7 @@ from .. import config
 if not config.is_building_docs():
     from ...toolbox_python.utility_functions import log_error_easy
     from qiskit_metal.toolbox_python.utility_functions import bad_fillet_idxs
+    from qiskit_metal.toolbox_python.utility_functions import fillet_path_points
 
 if TYPE_CHECKING:
     from ..._gui.main_window import MetalGUI
@@ -56,6 +58,20 @@ __all__ = ['QMplRenderer']
 
 to_poly_patch = np.vectorize(PolygonPatch)
 
+
+class _ArtistMaker():
+    """Stands for the axes in the render functions called by
+    QMplRenderer.make_artists(): the collections are only made, and added to
+    the axes later by QMplRenderer.apply_artists()."""
+
+    @staticmethod
+    def add_collection(collection, **kwargs):
+        """Return the collection, without adding it to any axes."""
+        return collection
+
+
+_ARTIST_MAKER = _ArtistMaker()
+
 # TODO: subclass from QRendererGui - define QRendererGui from this class as interface class
 
 
@@ -81,7 +97,17 @@ class QMplRenderer():
         self.canvas = canvas
         self.ax = None
         self.design = design
-        self.options = Dict(resolution='16',)
+        self.options = Dict(
+            resolution='16',
+            # Only draw the components near the view of the axis.
+            viewport_culling=True,
+            # Also draw this fraction of the size of the view on each side of
+            # it, so that small pans do not need a new render.
+            viewport_margin='0.5',
+            # Simplify the drawn geometry to this fraction of a pixel, 0 to
+            # draw every vertex.
+            simplify_pixels='0.5',
+        )
 
         # Filter view options
         self.hidden_layers = set()
@@ -89,6 +115,33 @@ class QMplRenderer():
         # Set of component ids which are integers.
         self._hidden_components = set()
 
+        # Display polygons of paths and junctions, made from their LineString.
+        # Key is the component id, value is a tuple of the revision of its
+        # qgeometry rows and a dict of
+        # (id(geometry), width, fillet, resolution) -> (geometry, polygon).
+        # See _get_display_polygons().
+        self._render_cache = dict()
+
+        # Artists drawn on self._artists_ax by render_tables().  Key is
+        # (table name, subtracted), value is a dict of component id ->
+        # (revision of its qgeometry rows, list of artists).
+        self._artists = dict()
+        self._artists_ax = None
+        self._artists_state = None
+        # Region (minx, miny, maxx, maxy) of the components drawn, None if
+        # they are not culled.
+        self._artists_region = None
+        # Bounds of the visible rows of each component, for _reset_datalim().
+        # Key is (table name, component id), value is a tuple of the revision
+        # of its qgeometry rows and (minx, miny, maxx, maxy).
+        self._datalim_bounds = dict()
+        # Warnings of the render functions run in a worker thread, logged by
+        # apply_artists() from the GUI thread.
+        self._pending_warnings = []
+        # Guards _render_cache and _pending_warnings, which make_artists()
+        # changes from the worker thread of the canvas.
+        self._lock = threading.Lock()
+
         self.colors = [
             '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b',
             '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
@@ -123,7 +176,7 @@ class QMplRenderer():
             name (str): Component name
         """
         comp_id = self.design.components[name].id
-        self._hidden_components.discard(name)
+        self._hidden_components.discard(comp_id)
 
     def hide_layer(self, name):
         """Hide the layer with the given name.
@@ -155,9 +208,124 @@ class QMplRenderer():
         """Clear all options."""
         self._hidden_components.clear()
         self.hidden_layers.clear()
+        self.clear_render_cache()
+        self.clear_artists()
+
+    def clear_artists(self):
+        """Remove from their axis the artists drawn by render_tables(), so
+        that the next call draws every component again."""
+        for artists in self._artists.values():
+            for _, component_artists in artists.values():
+                self._remove_artists(component_artists)
+        self._artists.clear()
+        self._artists_ax = None
+        self._artists_state = None
+        self._artists_region = None
+        self._datalim_bounds.clear()
+
+    @staticmethod
+    def _remove_artists(artists: list):
+        """Remove artists from their axis, if they are still on it.
+
+        Args:
+            artists (list): The artists
+        """
+        for artist in artists:
+            try:
+                artist.remove()
+            except (ValueError, NotImplementedError):
+                pass  # The axis was cleared already
+
+    def clear_render_cache(self, component_id: int = None):
+        """Forget the display polygons made for the paths and junctions.  They
+        are also forgotten when the component is rebuilt.
+
+        Args:
+            component_id (int): Only forget those of this component.
+                                Defaults to None, which is every component.
+        """
+        with self._lock:
+            if component_id is None:
+                self._render_cache.clear()
+            else:
+                self._render_cache.pop(component_id, None)
+
+    def _log_warning(self, message: str):
+        """Log a warning.  From a worker thread, it is kept for
+        apply_artists() instead, since the log window is not thread safe.
+
+        Args:
+            message (str): The warning
+        """
+        if threading.current_thread() is threading.main_thread():
+            self.logger.warning(message)
+        else:
+            with self._lock:
+                self._pending_warnings.append(message)
+
+    def _get_display_polygons(self, table: pd.DataFrame, fillet: bool) -> list:
+        """Buffer the LineString of each row by half of its width, after
+        filleting it if fillet is True and the row has a fillet.  The polygons
+        are kept until the component of the row is rebuilt, so an unchanged
+        design is not buffered again on every replot.
+
+        Args:
+            table (DataFrame): Rows of the path or junction table, with a
+                               width which is not zero.
+            fillet (bool): True to fillet the rows with a fillet.
+
+        Returns:
+            list: The polygon of each row.
+        """
+        resolution = int(self.options['resolution'])
+        fillets = table['fillet'] if fillet else [np.nan] * len(table)
+
+        polygons = []
+        for component_id, geometry, width, radius in zip(
+                table['component'], table['geometry'], table['width'], fillets):
+            cache = self._get_component_render_cache(component_id)
+            radius = None if pd.isnull(radius) else radius
+            key = (id(geometry), float(width), radius, resolution)
+            with self._lock:
+                cached = cache.get(key)
+            # Holding the geometry keeps its id from being reused.
+            if cached is None or cached[0] is not geometry:
+                line = geometry
+                if radius is not None:
+                    line = self.fillet_path(
+                        dict(geometry=geometry, fillet=radius))
+                polygon = line.buffer(distance=float(width) / 2.,
+                                      cap_style=CAP_STYLE.flat,
+                                      join_style=JOIN_STYLE.mitre,
+                                      resolution=resolution)
+                cached = (geometry, polygon)
+                with self._lock:
+                    cache[key] = cached
+            polygons.append(cached[1])
+        return polygons
+
+    def _get_component_render_cache(self, component_id: int) -> dict:
+        """Get the display polygons kept for a component, emptied when the
+        component has been rebuilt since they were made.
+
+        Args:
+            component_id (int): Id of the component.
+
+        Returns:
+            dict: (id(geometry), width, fillet, resolution) ->
+            (geometry, polygon).
+        """
+        revision = self.qgeometry.get_component_revision(component_id)
+        with self._lock:
+            cached = self._render_cache.get(component_id)
+            if cached is None or cached[0] != revision:
+                cached = (revision, dict())
+                self._render_cache[component_id] = cached
+        return cached[1]
 
     def render(self, ax: Axes):
-        """Assumes that the axis has been cleared already and so on.
+        """Render the tables on the axis.  Only what changed since the last
+        render on the same axis is drawn again.
 
         Args:
             ax (matplotlib.axes.Axes): mpl axis to draw on
@@ -185,17 +353,25 @@ class QMplRenderer():
 
         return ~mask  # not
 
-    def _render_poly_array(self, ax: Axes, poly_array: np.array, mpl_kw: dict):
+    def _render_poly_array(self, ax: Axes, poly_array: np.array,
+                           mpl_kw: dict) -> list:
         """Render the poly array.
 
         Args:
             ax (Axes): The axis
             poly_array (np.array): The poly
             mpl_kw (dict): The parameters dictionary
+
+        Returns:
+            list: The artists added to the axis
         """
         if len(poly_array) > 0:
+            tolerance = self._artists_state[2] if self._artists_state else 0
+            if tolerance > 0:
+                poly_array = [poly.simplify(tolerance) for poly in poly_array]
             poly_array = to_poly_patch(poly_array)
-            ax.add_collection(PatchCollection(poly_array, **mpl_kw))
+            return [ax.add_collection(PatchCollection(poly_array, **mpl_kw))]
+        return []
 
     @property
     def qgeometry(self) -> 'QGeometryTables':
@@ -253,17 +429,67 @@ class QMplRenderer():
     def render_tables(self, ax: Axes):
         """Render the tables.
 
+        Each component has its own artists for each table and subtract.  On
+        the same axis, only the artists of the components which were rebuilt,
+        deleted, hidden or shown since the last call are replaced.
+
+        With the option viewport_culling, only the components near the view
+        are drawn, see view_needs_render().  The geometry is simplified to
+        the option simplify_pixels times the size of a pixel.
+
+        This is plan_render(), make_artists() and apply_artists() in a row.
+        The canvas calls make_artists() in a worker thread instead.
+
+        Args:
+            ax (Axes): The axes
+        """
+        plan = self.plan_render(ax)
+        self.apply_artists(ax, plan, self.make_artists(plan))
+
+    def plan_render(self, ax: Axes) -> tuple:
+        """Find what render_tables() has to draw and remove on the axis.
+        Nothing is drawn yet.
+
         Args:
             ax (Axes): The axes
+
+        Returns:
+            tuple: (removed, jobs), where removed is a list of the
+            ((table name, subtracted), component id) whose artists are to be
+            removed, and jobs a list of ((table name, subtracted), component
+            id, revision, table, row positions, render function) to make the
+            artists of.
         """
+        state = (frozenset(self.hidden_layers), self.options['resolution'],
+                 self._get_simplify_tolerance(ax))
+        if ax is not self._artists_ax or state != self._artists_state:
+            self.clear_artists()
+            self._artists_ax = ax
+            self._artists_state = state
+
+        # The artists are added later, so autoscale runs on the bounds of
+        # the design rather than on those of the artists.
+        self._reset_datalim(ax)
+
+        visible = None
+        if self.options['viewport_culling']:
+            self._artists_region = self._get_view_region(ax)
+            visible = self.qgeometry.query_components(self._artists_region)
+        else:
+            self._artists_region = None
+
+        removed, jobs = [], []
         for element_type, table in self.qgeometry.tables.items():
             # Mask the table
             table = table[self.get_mask(table)]
+            if visible is not None:
+                table = table[table['component'].isin(visible)]
 
             # subtracted
             mask = table['subtract'] == True
             render_func = getattr(self, f'render_{element_type}')
-            render_func(table[mask], ax, subtracted=True)
+            self._plan_changed_components(table[mask], (element_type, True),
+                                          render_func, removed, jobs)
 
             # non-subtracted
             table1 = table[~mask]
@@ -272,7 +498,196 @@ class QMplRenderer():
 
             # TODO: Check that the function exists
             render_func = getattr(self, f'render_{element_type}')
-            render_func(table1, ax, subtracted=False)
+            self._plan_changed_components(table1, (element_type, False),
+                                          render_func, removed, jobs)
+        return removed, jobs
+
+    def _plan_changed_components(self, table: pd.DataFrame, key: tuple,
+                                 render_func, removed: list, jobs: list):
+        """Plan to replace the artists of the components of the table whose
+        rows changed since they were drawn, and to remove those of the
+        components which are no longer in the table.
+
+        Args:
+            table (DataFrame): Visible rows of the table
+            key (tuple): (table name, subtracted)
+            render_func (function): Render function of the table
+            removed (list): Appended with the (key, component id) to remove
+            jobs (list): Appended with the jobs to make artists, see
+                plan_render()
+        """
+        artists = self._artists.get(key, dict())
+        revisions = {
+            component_id: self.qgeometry.get_component_revision(component_id)
+            for component_id in table['component'].unique()
+        }
+
+        drawn = []
+        for component_id, (revision, _) in artists.items():
+            if revision == revisions.get(component_id):
+                drawn.append(component_id)
+            else:
+                removed.append((key, component_id))
+
+        # The rows are taken by make_artists(), off the GUI thread.  As a
+        # plain DataFrame, since taking the rows of each component out of a
+        # GeoDataFrame costs more than drawing them.
+        changed = pd.DataFrame(table[~table['component'].isin(drawn)])
+        groups = changed.groupby('component', sort=False).indices
+        for component_id, positions in groups.items():
+            jobs.append((key, component_id, revisions[component_id], changed,
+                         positions, render_func))
+
+    def make_artists(self, plan: tuple, is_cancelled=None) -> list:
+        """Make the artists of the jobs of a plan, without adding them to an
+        axis.  This can run in a worker thread: it does not change the axis,
+        and the warnings are logged by apply_artists().
+
+        Args:
+            plan (tuple): Return of plan_render()
+            is_cancelled (function): Called between the jobs, returns True to
+                stop.  Defaults to None.
+
+        Returns:
+            list: The artists of each job, or None if cancelled
+        """
+        made = []
+        for key, _, _, table, positions, render_func in plan[1]:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            made.append(
+                render_func(table.iloc[positions],
+                            _ARTIST_MAKER,
+                            subtracted=key[1]))
+        return made
+
+    def apply_artists(self, ax: Axes, plan: tuple, made: list):
+        """Remove the artists of a plan and add those made by make_artists()
+        to the axis.
+
+        Args:
+            ax (Axes): The axes
+            plan (tuple): Return of plan_render()
+            made (list): Return of make_artists()
+        """
+        with self._lock:
+            messages = self._pending_warnings
+            self._pending_warnings = []
+        for message in messages:
+            self.logger.warning(message)
+        if ax is not self._artists_ax:
+            return  # Cleared since the plan
+
+        removed, jobs = plan
+        for key, component_id in removed:
+            artists = self._artists.get(key, dict())
+            if component_id in artists:
+                self._remove_artists(artists.pop(component_id)[1])
+
+        for (key, component_id, revision, *_), artists in zip(jobs, made):
+            artists = artists or []
+            for artist in artists:
+                ax.add_collection(artist)
+            drawn = self._artists.setdefault(key, dict())
+            drawn[component_id] = (revision, artists)
+
+    def view_needs_render(self, ax: Axes) -> bool:
+        """Tell if the view of the axis changed since the last render enough
+        to need a new one: it left the region of the drawn components, or
+        zoomed to a different simplification tolerance.
+
+        Args:
+            ax (Axes): The axes
+
+        Returns:
+            bool: True to call render_tables() again.
+        """
+        if ax is not self._artists_ax or self._artists_state is None:
+            return True
+        if self._get_simplify_tolerance(ax) != self._artists_state[2]:
+            return True
+        if self.options['viewport_culling']:
+            return self._get_view_region(ax) != self._artists_region
+        return False
+
+    def _get_view_region(self, ax: Axes) -> tuple:
+        """Get the region to draw for the view of the axis.  This is the
+        region drawn last time if the view is still within it, so that it
+        does not change on every pan.
+
+        Args:
+            ax (Axes): The axes
+
+        Returns:
+            tuple: (minx, miny, maxx, maxy)
+        """
+        minx, maxx = sorted(ax.get_xlim())
+        miny, maxy = sorted(ax.get_ylim())
+        region = self._artists_region
+        if region is not None:
+            region_minx, region_miny, region_maxx, region_maxy = region
+            if (region_minx <= minx and maxx <= region_maxx and
+                    region_miny <= miny and maxy <= region_maxy):
+                return region
+
+        margin = float(self.options['viewport_margin'])
+        margin_x = (maxx - minx) * margin
+        margin_y = (maxy - miny) * margin
+        return (minx - margin_x, miny - margin_y, maxx + margin_x,
+                maxy + margin_y)
+
+    def _get_simplify_tolerance(self, ax: Axes) -> float:
+        """Get the tolerance to simplify the geometry with, from the size of a
+        pixel of the axis.  It is rounded down to a power of 2, so that it
+        changes only when zooming by 2x.
+
+        Args:
+            ax (Axes): The axes
+
+        Returns:
+            float: The tolerance in the units of the design, 0 to not simplify
+        """
+        pixels = float(self.options['simplify_pixels'])
+        minx, maxx = ax.get_xlim()
+        width = ax.get_window_extent().width
+        if pixels <= 0 or width <= 0 or minx == maxx:
+            return 0.
+        tolerance = abs(maxx - minx) / width * pixels
+        return 2.**np.floor(np.log2(tolerance))
+
+    def _reset_datalim(self, ax: Axes):
+        """Set the data limits of the axis to the bounds of the components
+        which are not hidden, so that autoscale shows the components which
+        are not drawn yet, and not the ones deleted since the last render.
+
+        Args:
+            ax (Axes): The axes
+        """
+        ax.dataLim.set_points(Bbox.null().get_points())
+
+        # Only the bounds of the components rebuilt since the last call are
+        # computed again.
+        datalim_bounds = dict()
+        for element_type, table in self.qgeometry.tables.items():
+            table = table[self.get_mask(table)]
+            groups = pd.DataFrame(table['component']).groupby(
+                'component', sort=False).indices
+            for component_id, positions in groups.items():
+                key = (element_type, component_id)
+                revision = self.qgeometry.get_component_revision(component_id)
+                cached = self._datalim_bounds.get(key)
+                if cached is None or cached[0] != revision:
+                    cached = (revision,
+                              table.geometry.iloc[positions].total_bounds)
+                datalim_bounds[key] = cached
+        self._datalim_bounds = datalim_bounds
+
+        bounds = np.array([bounds for _, bounds in datalim_bounds.values()])
+        if len(bounds) > 0:
+            bounds = bounds[np.isfinite(bounds).all(axis=1)]
+        if len(bounds) > 0:
+            ax.update_datalim(
+                [bounds[:, :2].min(axis=0), bounds[:, 2:].max(axis=0)])
 
     def render_junction(self,
                         table: pd.DataFrame,
@@ -286,27 +701,30 @@ class QMplRenderer():
             table (DataFrame): Element table
             ax (matplotlib.axes.Axes): Axis to render on
             extra_kw (dict): Style params
+
+        Returns:
+            list: The artists added to the axis
         """
+        artists = []
         if len(table) > 0:
             mask = (table.width == 0) | table.width.isna()
-            table1 = table[~mask]
+            table1 = table[~mask].copy()
             if len(table1) > 0:
-                table1.geometry = table1[['geometry', 'width']].apply(
-                    lambda x: x[0].buffer(distance=float(x[1]) / 2.,
-                                          cap_style=CAP_STYLE.flat,
-                                          join_style=JOIN_STYLE.mitre,
-                                          resolution=int(self.options[
-                                              'resolution'])),
-                    axis=1)
+                table1['geometry'] = self._get_display_polygons(table1,
+                                                                fillet=False)
                 kw = self.get_style('poly',
                                     subtracted=subtracted,
                                     extra=extra_kw)
-                self.render_poly(table1, ax, subtracted=subtracted, extra_kw=kw)
+                artists += self.render_poly(table1,
+                                            ax,
+                                            subtracted=subtracted,
+                                            extra_kw=kw)
             table1 = table[mask]
             if len(table1) > 0:
-                self.logger.warning(
+                self._log_warning(
                     'One or more junctions have zero width. Consider changing this.'
                 )
+        return artists
 
     def render_poly(self,
                     table: pd.DataFrame,
@@ -319,12 +737,15 @@ class QMplRenderer():
             table (DataFrame): Element table
             ax (matplotlib.axes.Axes): Axis to render on
             kw (dict): Style params
+
+        Returns:
+            list: The artists added to the axis
         """
         if len(table) < 1:
-            return
+            return []
 
         kw = self.get_style('poly', subtracted=subtracted, extra=extra_kw)
-        self._render_poly_array(ax, table.geometry, kw)
+        return self._render_poly_array(ax, table.geometry, kw)
 
     def render_fillet(self, table):
         """Renders fillet path.
@@ -350,85 +771,16 @@ class QMplRenderer():
         if row["fillet"] == 0:  # zero radius, no need to fillet
             return row["geometry"]
         path = row["geometry"].coords
-        newpath = np.array([path[0]])
 
         # Get list of vertices that can't be filleted
         no_fillet = bad_fillet_idxs(path, row["fillet"],
                                     self.design.template_options.PRECISION)
 
-        # Iterate through every three-vertex corner
-        for (i, (start, corner, end)) in enumerate(zip(path, path[1:],
-                                                       path[2:])):
-            if i + 1 in no_fillet:  # don't fillet this corner
-                newpath = np.concatenate((newpath, np.array([corner])))
-            else:
-                fillet = self._calc_fillet(np.array(start), np.array(corner),
-                                           np.array(end), row["fillet"],
-                                           int(self.options['resolution']))
-                if fillet is not False:
-                    newpath = np.concatenate((newpath, fillet))
-                else:
-                    newpath = np.concatenate((newpath, np.array([corner])))
-        newpath = np.concatenate((newpath, np.array([end])))
+        # Every three-vertex corner at once
+        newpath = fillet_path_points(np.asarray(path), row["fillet"], no_fillet,
+                                     int(self.options['resolution']))
         return LineString(newpath)
 
-    def _calc_fillet(self,
-                     vertex_start,
-                     vertex_corner,
-                     vertex_end,
-                     radius,
-                     points=16):
-        """Returns the filleted path based on the start, corner, and end
-        vertices and the fillet radius.
-
-        Args:
-            vertex_start (np.ndarray): x-y coordinates of starting vertex.
-            vertex_corner (np.ndarray): x-y coordinates of corner vertex.
-            vertex_end (np.ndarray): x-y coordinates of end vertex.
-            radius (float): Fillet radius.
-            points (int): Number of points to draw in the fillet corner.
-        """
-        if np.array_equal(vertex_start, vertex_corner) or np.array_equal(
-                vertex_end, vertex_corner):
-            return False
-
-        fillet_start = (radius / np.linalg.norm(vertex_start - vertex_corner) *
-                        (vertex_start - vertex_corner) + vertex_corner)
-        path = np.array([fillet_start])
-        # Calculate the angle of the corner, which is not necessarily 90 degrees
-        end_angle = np.arccos(
-            np.dot(vertex_start - vertex_corner, vertex_end - vertex_corner) /
-            (np.linalg.norm(vertex_start - vertex_corner) *
-             np.linalg.norm(vertex_end - vertex_corner)))
-        if end_angle == 0 or end_angle == np.pi:
-            return False
-        # Determine direction so we know which way to fillet
-        # TODO - replace with generalized code accounting for different rotations
-        direction = [
-            np.argmax(abs(vertex_start - vertex_corner)),
-            1 - np.argmax(abs(vertex_start - vertex_corner)),
-        ]
-        sign = np.array([
-            np.argmax([vertex_start[direction[0]],
-                       vertex_corner[direction[0]]]),
-            np.argmax([vertex_corner[direction[1]], vertex_end[direction[1]]]),
-        ])
-        if direction[0] == 1 and sign[0] != sign[1]:
-            sign = 1 - sign
-        sign = sign * 2 - 1
-
-        # Populate the fillet corner, skipping the start point since it's already added
-        for theta in np.arange(0, end_angle, end_angle / points)[1:]:
-            diff = [np.sin(theta) * radius, radius - np.cos(theta) * radius]
-            path = np.concatenate((
-                path,
-                np.array([[
-                    fillet_start[0] + sign[0] * diff[direction[0]],
-                    fillet_start[1] + sign[1] * diff[direction[1]],
-                ]]),
-            ))
-        return path
-
     def render_path(self,
                     table: pd.DataFrame,
                     ax: Axes,
@@ -440,9 +792,13 @@ class QMplRenderer():
             table (DataFrame): Element table
             ax (matplotlib.axes.Axes): Axis to render on
             kw (dict): Style params
+
+        Returns:
+            list: The artists added to the axis
         """
+        artists = []
         if len(table) < 1:
-            return
+            return artists
 
         # mask for all non zero width paths
         # TODO: could there be a problem with float vs int here?
@@ -452,25 +808,19 @@ class QMplRenderer():
         # display(imask)
 
         # convert to polys - handle non zero width
-        table1 = table[~mask]
-
-        # if any are fillet, alter the path separately
-        table1.loc[table1.fillet.notnull(),
-                   'geometry'] = table1[table1.fillet.notnull()].apply(
-                       self.fillet_path, axis=1)
+        # if any are fillet, alter the path first
+        table1 = table[~mask].copy()
 
         if len(table1) > 0:
-            table1.geometry = table1[['geometry', 'width']].apply(lambda x: x[
-                0].buffer(distance=float(x[1]) / 2.,
-                          cap_style=CAP_STYLE.flat,
-                          join_style=JOIN_STYLE.mitre,
-                          resolution=int(self.options['resolution'])),
-                                                                  axis=1)
+            table1['geometry'] = self._get_display_polygons(table1, fillet=True)
 
             kw = self.get_style('poly', subtracted=subtracted, extra=extra_kw)
 
             # render components
-            self.render_poly(table1, ax, subtracted=subtracted, extra_kw=kw)
+            artists += self.render_poly(table1,
+                                        ax,
+                                        subtracted=subtracted,
+                                        extra_kw=kw)
 
         # handle zero width
         table1 = table[mask]
@@ -479,7 +829,9 @@ class QMplRenderer():
         if len(table1) > 0:
             kw = self.get_style('path', subtracted=subtracted, extra=extra_kw)
             line_segments = LineCollection(table1.geometry)
-            ax.add_collection(line_segments)
+            artists.append(ax.add_collection(line_segments))
+
+        return artists
 
 
 # DEFAULT['renderer_mpl'] = Dict(
@@ -21,7 +21,10 @@
 # pylint: disable-msg=import-error
 """Qiskit Metal unit tests analyses functionality."""
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 import pandas as pd
 
 from qiskit_metal.designs.design_base import QDesign
@@ -30,6 +33,7 @@ from qiskit_metal.designs.interface_components import Components
 from qiskit_metal.designs.net_info import QNet
 from qiskit_metal.qlibrary.core import QComponent
 from qiskit_metal.qlibrary.qubits.transmon_pocket import TransmonPocket
+from qiskit_metal.qlibrary.tlines.straight_path import RouteStraight
 from qiskit_metal.tests.assertions import AssertionsMixin
 
 from qiskit_metal.qlibrary.lumped.resonator_coil_rect import ResonatorCoilRect
@@ -465,6 +469,142 @@ class TestDesign(unittest.TestCase, AssertionsMixin):
         self.assertEqual(pf['pin_name'][0], 'p1')
         self.assertEqual(pf['pin_name'][1], 'p2')
 
+    def test_design_dependencies(self):
+        """Test add_dependency, remove_dependency and update_component in
+        design_base.py."""
+        design = DesignPlanar()
+        pads = dict(connection_pads=dict(a=dict()))
+        q_1 = TransmonPocket(design, 'Q1', options=dict(**pads))
+        q_2 = TransmonPocket(design, 'Q2', options=dict(pos_x='2mm', **pads))
+        q_3 = TransmonPocket(design, 'Q3', options=dict(pos_x='4mm', **pads))
+        route = RouteStraight(
+            design,
+            'R1',
+            options=dict(
+                pin_inputs=dict(start_pin=dict(component='Q1', pin='a'),
+                                end_pin=dict(component='Q2', pin='a'))))
+
+        # The route depends on the components named in its pin_inputs.
+        self.assertEqual(design._get_downstream_ids(q_1.id), {route.id})
+        self.assertEqual(design._get_downstream_ids(q_2.id), {route.id})
+        self.assertEqual(design._get_downstream_ids(q_3.id), set())
+
+        # Cycles are not added.
+        design.add_dependency('R1', 'Q1')
+        self.assertEqual(design._get_downstream_ids(route.id), set())
+
+        design.add_dependency('Q3', 'Q1')
+        self.assertEqual(design._get_downstream_ids(q_3.id), {q_1.id, route.id})
+        self.assertEqual(
+            design._topological_order([route.id, q_1.id, q_2.id, q_3.id]),
+            [q_2.id, q_3.id, q_1.id, route.id])
+        design.remove_dependency('Q3', 'Q1')
+        self.assertEqual(design._get_downstream_ids(q_3.id), set())
+
+        # Only the qubit and its route are remade, and the route follows.
+        q_1.options.pos_y = '1mm'
+        with mock.patch.object(TransmonPocket,
+                               'make',
+                               autospec=True,
+                               side_effect=TransmonPocket.make) as qubit_make:
+            with mock.patch.object(
+                    RouteStraight,
+                    'make',
+                    autospec=True,
+                    side_effect=RouteStraight.make) as route_make:
+                design.update_component('Q1')
+        self.assertEqual(
+            [call[0][0].name for call in qubit_make.call_args_list], ['Q1'])
+        self.assertEqual(route_make.call_count, 1)
+        self.assertAlmostEqual(route.pins['start'].middle[1],
+                               q_1.pins['a'].middle[1])
+
+        design.delete_component('R1')
+        self.assertEqual(design._get_downstream_ids(q_1.id), set())
+
+    def test_design_set_variable(self):
+        """Test set_variable and get_components_using_variable in
+        design_base.py."""
+        design = DesignPlanar()
+        design.variables['pad_gap'] = '30um'
+        pads = dict(connection_pads=dict(a=dict()))
+        q_1 = TransmonPocket(design,
+                             'Q1',
+                             options=dict(pad_gap='pad_gap', **pads))
+        TransmonPocket(design, 'Q2', options=dict(pos_x='2mm', **pads))
+        RouteStraight(
+            design,
+            'R1',
+            options=dict(
+                pin_inputs=dict(start_pin=dict(component='Q1', pin='a'),
+                                end_pin=dict(component='Q2', pin='a'))))
+
+        self.assertEqual(design.get_components_using_variable('pad_gap'),
+                         ['Q1'])
+        self.assertEqual(design.get_components_using_variable('unused'), [])
+
+        # The qubit that reads the variable is remade, then its route.
+        self.assertEqual(design.set_variable('pad_gap', '40um'), ['Q1', 'R1'])
+        self.assertAlmostEqual(q_1.parse_options().pad_gap, 0.04)
+        self.assertEqual(design.set_variable('unused', '1um'), [])
+        self.assertEqual(design.set_variable('pad_gap', '40um', rebuild=False),
+                         [])
+
+        design.delete_component('Q1')
+        self.assertEqual(design.get_components_using_variable('pad_gap'), [])
+
+    def test_design_save_load_structured(self):
+        """Test save_design(structured=True) and load_design in
+        design_base.py."""
+        design = DesignPlanar()
+        design.variables['pad_gap'] = '40um'
+        pads = dict(connection_pads=dict(a=dict()))
+        TransmonPocket(design, 'Q1', options=dict(pad_gap='pad_gap', **pads))
+        TransmonPocket(design, 'Q2', options=dict(pos_x='2mm', **pads))
+        TransmonPocket(design, 'Q3', options=dict(pos_x='4mm'))
+        design.delete_component('Q3')
+        RouteStraight(
+            design,
+            'R1',
+            options=dict(
+                pin_inputs=dict(start_pin=dict(component='Q1', pin='a'),
+                                end_pin=dict(component='Q2', pin='a'))))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'design.zip')
+            self.assertTrue(design.save_design(path, structured=True))
+            with mock.patch.object(TransmonPocket, 'make') as qubit_make:
+                loaded = DesignPlanar.load_design(path)
+            rebuilt = DesignPlanar.load_design(path, rebuild=True)
+
+        # The tables are restored without make().
+        qubit_make.assert_not_called()
+        self.assertEqual(loaded.variables, design.variables)
+        self.assertEqual(loaded.all_component_names_id(),
+                         design.all_component_names_id())
+        for table_name, table in design.qgeometry.tables.items():
+            loaded_table = loaded.qgeometry.tables[table_name]
+            self.assertEqual(list(loaded_table.columns), list(table.columns))
+            self.assertEqual(loaded_table['component'].tolist(),
+                             table['component'].tolist())
+            self.assertTrue(
+                all(
+                    a.equals(b)
+                    for a, b in zip(loaded_table.geometry, table.geometry)))
+        self.assertEqual(loaded.components['R1'].pins['start'].net_id,
+                         design.components['R1'].pins['start'].net_id)
+        self.assertEqual(loaded.net_info['net_id'].tolist(),
+                         design.net_info['net_id'].tolist())
+        self.assertEqual(loaded.get_components_using_variable('pad_gap'),
+                         ['Q1'])
+        self.assertEqual(loaded.set_variable('pad_gap', '30um'), ['Q1', 'R1'])
+
+        # Or rebuilt from the options.
+        self.assertEqual(len(rebuilt.qgeometry.tables['poly']),
+                         len(design.qgeometry.tables['poly']))
+        self.assertEqual(rebuilt.components['Q2'].id,
+                         design.components['Q2'].id)
+
     def test_design_delete_all_pins(self):
         """Test delete_all_pins functionality in design_base.py."""
         design = DesignPlanar()
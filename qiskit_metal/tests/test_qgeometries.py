@@ -259,6 +259,156 @@ class TestElements(unittest.TestCase):
         self.assertEqual(len(qgt.tables['path']), 0)
         self.assertEqual(len(qgt.tables['poly']), 0)
 
+    def test_qgeometry_q_element_get_component_revision(self):
+        """Test get_component_revision in QGeometryTables class in
+        qgeometries_handler.py."""
+        design = designs.DesignPlanar()
+        first = TransmonPocket(design, 'Q1')
+        second = TransmonPocket(design, 'Q2')
+        qgeometry = design.qgeometry
+
+        first_revision = qgeometry.get_component_revision(first.id)
+        second_revision = qgeometry.get_component_revision(second.id)
+
+        first.rebuild()
+        self.assertNotEqual(qgeometry.get_component_revision(first.id),
+                            first_revision)
+        self.assertEqual(qgeometry.get_component_revision(second.id),
+                         second_revision)
+
+        first_revision = qgeometry.get_component_revision(first.id)
+        qgeometry.clear_all_tables()
+        self.assertNotEqual(qgeometry.get_component_revision(first.id),
+                            first_revision)
+        self.assertNotEqual(qgeometry.get_component_revision(second.id),
+                            second_revision)
+
+    def test_qgeometry_q_element_flush_buffers(self):
+        """Test the buffered rows of add_qgeometry in QGeometryTables class in
+        element_handler.py."""
+        design = designs.DesignPlanar()
+        qgt = QGeometryTables(design)
+        qgt.clear_all_tables()
+
+        a_linestring = draw.LineString([[0, 0], [0, 1]])
+        qgt.add_qgeometry('path',
+                          'id_1', {
+                              'a': a_linestring,
+                              'b': a_linestring
+                          },
+                          width=1.0)
+        qgt.add_qgeometry('path',
+                          'id_2', {'c': a_linestring},
+                          width=2.0,
+                          fillet=0.1)
+        qgt.add_qgeometry('path', 'id_3', {'d': a_linestring}, width=3.0)
+
+        # Delete a component whose rows are still in the buffer.
+        qgt.delete_component_id('id_1')
+
+        table = qgt.tables['path']
+        self.assertEqual(list(table['name']), ['c', 'd'])
+        self.assertEqual(list(table['component']), ['id_2', 'id_3'])
+        self.assertEqual(list(table['width']), [2.0, 3.0])
+        self.assertEqual(table['fillet'].iloc[0], 0.1)
+        self.assertEqual(str(table['fillet'].iloc[1]), str(np.nan))
+        self.assertTrue(isinstance(table, GeoDataFrame))
+
+        # Reading the tables empties the buffer.
+        qgt.add_qgeometry('path', 'id_4', {'e': a_linestring}, width=4.0)
+        self.assertEqual(len(qgt.tables['path']), 3)
+        self.assertEqual(len(qgt.tables['path']), 3)
+
+    def test_qgeometry_q_element_add_unknown_kind(self):
+        """Test add_qgeometry in QGeometryTables class in element_handler.py
+        logs an error for an unknown kind, and adds nothing."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1')
+        num_rows = len(design.qgeometry.tables['poly'])
+
+        with self.assertLogs(design.logger, 'ERROR'):
+            design.qgeometry.add_qgeometry('not_a_kind', 'id_1',
+                                           {'a': draw.rectangle(1, 1)})
+
+        self.assertNotIn('not_a_kind', design.qgeometry.tables)
+        self.assertEqual(len(design.qgeometry.tables['poly']), num_rows)
+
+    def test_qgeometry_q_element_rebuild_keeps_rows_of_no_component(self):
+        """Test rebuild in design_base.py replaces the rows of the components,
+        and keeps the rows that were added directly to the QGeometryTables."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1')
+        num_rows = len(design.qgeometry.tables['poly'])
+        design.qgeometry.add_qgeometry('poly', 'not_a_component',
+                                       {'a': draw.rectangle(1, 1)})
+
+        design.rebuild()
+
+        table = design.qgeometry.tables['poly']
+        self.assertEqual(len(table), num_rows + 1)
+        self.assertEqual(list(table['component']).count('not_a_component'), 1)
+
+    def test_qgeometry_q_element_component_row_index(self):
+        """Test that the component row index in QGeometryTables class in
+        element_handler.py follows add, delete and rebuild."""
+        design = designs.DesignPlanar()
+        q_1 = TransmonPocket(design, 'Q1')
+        q_2 = TransmonPocket(design, 'Q2', options=dict(pos_x='1mm'))
+        qgt = design.qgeometry
+
+        def by_mask(table_name, comp_id):
+            table = qgt.tables[table_name]
+            return table[table.component == comp_id]
+
+        for table_name in qgt.get_element_types():
+            self.assertTrue(
+                qgt.get_component('Q1', table_name).equals(
+                    by_mask(table_name, q_1.id)))
+
+        num_poly = len(qgt.tables['poly'])
+        q_1.rebuild()
+        q_1.rebuild()
+        self.assertEqual(len(qgt.get_component('Q1', 'poly')),
+                         len(by_mask('poly', q_1.id)))
+        self.assertEqual(len(qgt.tables['poly']), num_poly)
+        self.assertEqual(
+            list(qgt.get_component_geometry_dict('Q2', 'poly').keys()),
+            list(by_mask('poly', q_2.id).name))
+
+        design.delete_component('Q1')
+        self.assertEqual(len(by_mask('poly', q_1.id)), 0)
+        self.assertEqual(len(qgt.get_component('Q2', 'poly')), num_poly // 2)
+        self.assertEqual(len(qgt.tables['poly']), num_poly // 2)
+
+    def test_qgeometry_q_element_query(self):
+        """Test query and query_components in QGeometryTables class in
+        element_handler.py."""
+        design = designs.DesignPlanar()
+        qgt = QGeometryTables(design)
+        qgt.clear_all_tables()
+
+        qgt.add_qgeometry('poly', 1, {'a': draw.rectangle(1, 1, 0, 0)})
+        qgt.add_qgeometry('poly', 2, {'b': draw.rectangle(1, 1, 5, 0)}, layer=2)
+        qgt.add_qgeometry('path',
+                          3, {'c': draw.LineString([[0, 3], [5, 3]])},
+                          width=2.0)
+
+        self.assertEqual(list(qgt.query((-1, -1, 1, 1), 'poly').name), ['a'])
+        self.assertEqual(list(qgt.query((4, -1, 6, 1), 'poly').name), ['b'])
+        self.assertEqual(len(qgt.query((4, -1, 6, 1), 'poly', layer=1)), 0)
+        self.assertEqual(len(qgt.query((4, -1, 6, 1), 'poly', chip='fake')), 0)
+        self.assertEqual(len(qgt.query((10, 10, 11, 11), 'poly')), 0)
+
+        # The width of the path counts, its line alone is not in the box.
+        self.assertEqual(list(qgt.query((1, 1.5, 2, 2.5), 'path').name), ['c'])
+        self.assertEqual(qgt.query_components((-1, -1, 6, 2.5)), [1, 2, 3])
+        self.assertEqual(qgt.query_components(draw.Point(5, 0)), [2])
+
+        # The index follows changes to the tables.
+        qgt.delete_component_id(1)
+        qgt.add_qgeometry('poly', 4, {'d': draw.rectangle(1, 1, 0, 0)})
+        self.assertEqual(qgt.query_components((-1, -1, 1, 1), 'poly'), [4])
+
     def test_qgeometry_get_all_unique_layers(self):
         """Test get_all_unique_layers functionality in elment_handler.py."""
         design = designs.DesignPlanar()
@@ -19,9 +19,21 @@
 # pylint: disable-msg=protected-access
 """Qiskit Metal unit tests analyses functionality."""
 
+import logging
+import os
+import tempfile
+import threading
 import unittest
+import gdspy
+import geopandas
 import matplotlib.pyplot as _plt
+import numpy as np
+import pandas as pd
+import shapely
+import shapely.ops
+from shapely.geometry import LineString
 
+from qiskit_metal import config
 from qiskit_metal import designs
 from qiskit_metal.renderers import setup_default
 from qiskit_metal.renderers.renderer_ansys.ansys_renderer import QAnsysRenderer
@@ -30,15 +42,77 @@ from qiskit_metal.renderers.renderer_ansys.hfss_renderer import QHFSSRenderer
 from qiskit_metal.renderers.renderer_base.renderer_base import QRenderer
 from qiskit_metal.renderers.renderer_base.renderer_gui_base import QRendererGui
 from qiskit_metal.renderers.renderer_gds.gds_renderer import QGDSRenderer
+from qiskit_metal.renderers.renderer_gds.make_cheese import Cheesing
 from qiskit_metal.renderers.renderer_mpl.mpl_interaction import MplInteraction
+from qiskit_metal.renderers.renderer_mpl.mpl_renderer import QMplRenderer
 
 from qiskit_metal.renderers.renderer_ansys import ansys_renderer
+from qiskit_metal.renderers.renderer_gds import gds_renderer
 
 from qiskit_metal.qgeometries.qgeometries_handler import QGeometryTables
 from qiskit_metal.qlibrary.qubits.transmon_pocket import TransmonPocket
+from qiskit_metal.qlibrary.sample_shapes.rectangle import Rectangle
 from qiskit_metal import draw
 
 
+def _qgeometry_to_gds(renderer: QGDSRenderer, qgeometry_element: pd.Series):
+    """Convert one row of a QGeometry table to gdspy, row by row, as the GDS
+    renderer did before _qgeometry_table_to_gds().  Reference for the tests.
+
+    Args:
+        renderer (QGDSRenderer): The renderer, for its options
+        qgeometry_element (pd.Series): Row of a QGeometry table
+
+    Returns:
+        Union[gdspy.Polygon, gdspy.PolygonSet, gdspy.FlexPath, None]: The
+        element, None if it can not be converted.
+    """
+    max_points = int(renderer.parse_value(renderer.options.max_points))
+    geom = qgeometry_element.geometry
+    layer = qgeometry_element.layer
+
+    if isinstance(geom, shapely.geometry.Polygon):
+        exterior_poly = gdspy.Polygon(list(geom.exterior.coords),
+                                      layer=layer,
+                                      datatype=10)
+        if geom.interiors:
+            a_poly_set = gdspy.PolygonSet(
+                [list(hole.coords) for hole in geom.interiors],
+                layer=layer,
+                datatype=10)
+            return gdspy.boolean(exterior_poly,
+                                 a_poly_set,
+                                 'not',
+                                 max_points=max_points,
+                                 layer=layer,
+                                 datatype=10)
+        return exterior_poly.fracture(max_points=max_points)
+
+    if (isinstance(geom, shapely.geometry.LineString) and
+            'fillet' in qgeometry_element):
+        width = qgeometry_element.width
+        if np.isnan(width):
+            width = renderer.parse_value(renderer.options.width_LineString)
+        fillet = qgeometry_element.fillet
+        if np.isnan(fillet) or fillet <= 0 or fillet < qgeometry_element.width:
+            return gdspy.FlexPath(list(geom.coords),
+                                  width,
+                                  layer=layer,
+                                  max_points=max_points,
+                                  datatype=11)
+        return gdspy.FlexPath(
+            list(geom.coords),
+            width,
+            layer=layer,
+            datatype=11,
+            max_points=max_points,
+            corners=renderer.options.corners,
+            bend_radius=fillet,
+            tolerance=renderer.parse_value(renderer.options.tolerance),
+            precision=renderer.parse_value(renderer.options.precision))
+    return None
+
+
 class TestRenderers(unittest.TestCase):
     """Unit test class."""
 
@@ -266,12 +340,15 @@ class TestRenderers(unittest.TestCase):
         renderer = QGDSRenderer(design)
         options = renderer.default_options
 
-        self.assertEqual(len(options), 16)
+        self.assertEqual(len(options), 18)
         self.assertEqual(options['short_segments_to_not_fillet'], 'True')
         self.assertEqual(options['check_short_segments_by_scaling_fillet'],
                          '2.0')
         self.assertEqual(options['gds_unit'], '1')
         self.assertEqual(options['ground_plane'], 'True')
+        self.assertEqual(options['ground_plane_tiles']['x'], '1')
+        self.assertEqual(options['ground_plane_tiles']['y'], '1')
+        self.assertEqual(options['hierarchical'], 'False')
         self.assertEqual(options['negative_mask']['main'], [])
         self.assertEqual(options['corners'], 'circular bend')
         self.assertEqual(options['tolerance'], '0.00001')
@@ -413,6 +490,16 @@ class TestRenderers(unittest.TestCase):
         self.assertEqual(etd['junction']['resistance'], 0)
         self.assertEqual(etd['junction']['mesh_kw_jj'], 7e-06)
 
+        # The columns of a deferred renderer are declared without importing
+        # it, so they are not derived from its default_options.
+        options = renderer.default_options
+        self.assertEqual(etd['junction']['inductance'], options['Lj'])
+        self.assertEqual(etd['junction']['capacitance'], options['Cj'])
+        self.assertEqual(etd['junction']['resistance'], options['_Rj'])
+        self.assertEqual(
+            etd['junction']['mesh_kw_jj'],
+            ansys_renderer.parse_units(options['max_mesh_length_jj']))
+
     def test_renderer_gdsrenderer_high_level(self):
         """Test that high level defaults were not accidentally changed in
         gds_renderer.py."""
@@ -426,6 +513,39 @@ class TestRenderers(unittest.TestCase):
         self.assertEqual(element_table_data['junction']['cell_name'],
                          'my_other_junction')
 
+    def test_renderer_config_element_table_data(self):
+        """Test that the element_table_data declared in config for deferred
+        renderers is the same as the one of the renderer classes."""
+        classes = dict(hfss=QHFSSRenderer, q3d=QQ3DRenderer, gds=QGDSRenderer)
+        for name, import_info in config.renderers_to_load.items():
+            with self.subTest(renderer=name):
+                self.assertEqual(classes[name].name, name)
+                self.assertEqual(import_info.element_table_data,
+                                 classes[name].element_table_data)
+
+    def test_renderer_design_renderers_mapping(self):
+        """Test the renderers Mapping of the design."""
+        design = designs.DesignPlanar()
+        renderers = design.renderers
+        self.assertEqual(sorted(renderers), ['gds', 'hfss', 'q3d'])
+        # Deferred, though the module of QGDSRenderer is already imported.
+        self.assertFalse(renderers.is_instantiated('gds'))
+        self.assertIs(renderers.gds, renderers['gds'])
+        self.assertTrue(renderers.is_instantiated('gds'))
+        self.assertIsInstance(renderers.gds, QGDSRenderer)
+        self.assertIn('gds_cell_name',
+                      design.qgeometry.tables['junction'].columns)
+        with self.assertRaises(AttributeError):
+            renderers.not_a_renderer
+
+        # The element_table_data declared in config is checked on first access.
+        design = designs.DesignPlanar()
+        design.renderers.register_deferred(
+            'gds', 'qiskit_metal.renderers.renderer_gds.gds_renderer',
+            'QGDSRenderer', dict(junction=dict(cell_name='not_the_default')))
+        with self.assertLogs(design.logger, 'WARNING'):
+            self.assertIsInstance(design.renderers.gds, QGDSRenderer)
+
     def test_renderer_gdsrenderer_update_units(self):
         """Test update_units in gds_renderer.py."""
         design = designs.DesignPlanar()
@@ -474,6 +594,219 @@ class TestRenderers(unittest.TestCase):
         mpl.disconnect()
         self.assertEqual(mpl.figure, None)
 
+    def test_renderer_mpl_render_cache(self):
+        """Test QMplRenderer in mpl_renderer.py buffers the paths and junctions
+        of a component again only after the component is rebuilt."""
+        design = designs.DesignPlanar()
+        pads = dict(connection_pads=dict(a=dict(), b=dict(loc_W=-1)))
+        first = TransmonPocket(design, 'Q1', options=pads)
+        second = TransmonPocket(design, 'Q2', options=dict(pos_x='2mm', **pads))
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        figure, axis = _plt.subplots()
+        axis.set_xlim(-1, 3)
+        axis.set_ylim(-1, 1)
+
+        renderer.render_tables(axis)
+        first_cache = renderer._render_cache[first.id][1]
+        second_cache = renderer._render_cache[second.id][1]
+        polygons = renderer._get_display_polygons(
+            design.qgeometry.tables['path'], fillet=True)
+        self.assertGreater(len(first_cache), 0)
+
+        renderer.render_tables(axis)
+        self.assertIs(renderer._render_cache[first.id][1], first_cache)
+        for polygon, cached_polygon in zip(
+                renderer._get_display_polygons(design.qgeometry.tables['path'],
+                                               fillet=True), polygons):
+            self.assertIs(polygon, cached_polygon)
+
+        first.options.pad_width = '300um'
+        first.rebuild()
+        renderer.render_tables(axis)
+        self.assertIsNot(renderer._render_cache[first.id][1], first_cache)
+        self.assertIs(renderer._render_cache[second.id][1], second_cache)
+        _plt.close(figure)
+
+    def test_renderer_mpl_render_changed_components(self):
+        """Test QMplRenderer in mpl_renderer.py replaces only the artists of
+        the components which were rebuilt, deleted or hidden."""
+        design = designs.DesignPlanar()
+        first = TransmonPocket(design, 'Q1')
+        second = TransmonPocket(design, 'Q2', options=dict(pos_x='2mm'))
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        figure, axis = _plt.subplots()
+        axis.set_xlim(-1, 3)
+        axis.set_ylim(-1, 1)
+
+        renderer.render_tables(axis)
+        artists = renderer._artists[('poly', False)]
+        first_artists = artists[first.id][1]
+        second_artists = artists[second.id][1]
+        self.assertEqual(len(axis.collections), 6)
+
+        first.options.pad_width = '300um'
+        first.rebuild()
+        renderer.render_tables(axis)
+        self.assertIsNot(artists[first.id][1], first_artists)
+        self.assertIs(artists[second.id][1], second_artists)
+        self.assertEqual(len(axis.collections), 6)
+        for artist in first_artists:
+            self.assertNotIn(artist, axis.collections)
+
+        renderer.hide_component('Q1')
+        renderer.render_tables(axis)
+        self.assertNotIn(first.id, artists)
+        self.assertEqual(len(axis.collections), 3)
+
+        renderer.show_component('Q1')
+        design.delete_component('Q2')
+        renderer.render_tables(axis)
+        self.assertEqual(list(artists), [first.id])
+        self.assertEqual(len(axis.collections), 3)
+
+        renderer.clear_artists()
+        self.assertEqual(len(axis.collections), 0)
+        _plt.close(figure)
+
+    def test_renderer_mpl_datalim_after_delete(self):
+        """Test QMplRenderer in mpl_renderer.py shrinks the data limits of the
+        axis when a far component is deleted, before the artists are added,
+        so that autoscale does not show where it was."""
+        for viewport_culling in [True, False]:
+            with self.subTest(viewport_culling=viewport_culling):
+                design = designs.DesignPlanar()
+                TransmonPocket(design, 'Q1')
+                TransmonPocket(design, 'Q2', options=dict(pos_x='10mm'))
+                renderer = QMplRenderer(None, design, logging.getLogger())
+                renderer.options.viewport_culling = viewport_culling
+                figure, axis = _plt.subplots()
+                axis.set_xlim(-1, 1)
+                axis.set_ylim(-1, 1)
+
+                renderer.render_tables(axis)
+                self.assertGreaterEqual(axis.dataLim.x1, 10)
+
+                design.delete_component('Q2')
+                renderer.plan_render(axis)
+                self.assertLess(axis.dataLim.x1, 1)
+                _plt.close(figure)
+
+    def test_renderer_mpl_datalim_after_rebuild(self):
+        """Test QMplRenderer in mpl_renderer.py updates the data limits of the
+        axis when a component is moved or hidden."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1')
+        second = TransmonPocket(design, 'Q2', options=dict(pos_x='10mm'))
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        figure, axis = _plt.subplots()
+
+        renderer.render_tables(axis)
+        self.assertLess(axis.dataLim.x1, 11)
+
+        second.options.pos_x = '20mm'
+        second.rebuild()
+        renderer.plan_render(axis)
+        self.assertGreaterEqual(axis.dataLim.x1, 20)
+
+        renderer.hide_component('Q2')
+        renderer.plan_render(axis)
+        self.assertLess(axis.dataLim.x1, 1)
+        _plt.close(figure)
+
+    def test_renderer_mpl_viewport_culling(self):
+        """Test QMplRenderer in mpl_renderer.py draws only the components near
+        the view, and simplifies to the size of a pixel."""
+        design = designs.DesignPlanar()
+        first = TransmonPocket(design, 'Q1')
+        second = TransmonPocket(design, 'Q2', options=dict(pos_x='10mm'))
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        figure, axis = _plt.subplots()
+        axis.set_xlim(-1, 1)
+        axis.set_ylim(-1, 1)
+
+        renderer.render_tables(axis)
+        artists = renderer._artists[('poly', False)]
+        self.assertEqual(list(artists), [first.id])
+        self.assertGreaterEqual(axis.dataLim.x1, 10)
+        self.assertFalse(renderer.view_needs_render(axis))
+
+        # A small pan stays within the margin.
+        axis.set_xlim(-0.5, 1.5)
+        self.assertFalse(renderer.view_needs_render(axis))
+
+        axis.set_xlim(9, 11)
+        self.assertTrue(renderer.view_needs_render(axis))
+        renderer.render_tables(axis)
+        self.assertEqual(list(artists), [second.id])
+
+        tolerance = renderer._get_simplify_tolerance(axis)
+        pixel = 2 / axis.get_window_extent().width
+        self.assertLessEqual(tolerance, pixel / 2)
+        self.assertGreater(tolerance, pixel / 4)
+        axis.set_xlim(9.5, 10.5)
+        self.assertTrue(renderer.view_needs_render(axis))
+
+        renderer.options.simplify_pixels = '0'
+        self.assertEqual(renderer._get_simplify_tolerance(axis), 0)
+        _plt.close(figure)
+
+    def test_renderer_mpl_make_artists_in_thread(self):
+        """Test QMplRenderer in mpl_renderer.py makes the artists in a worker
+        thread and adds them to the axis only in apply_artists()."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1')
+        TransmonPocket(design,
+                       'Q2',
+                       options=dict(pos_x='1mm', inductor_width='0um'))
+        logger = logging.getLogger('test_mpl_make_artists')
+        renderer = QMplRenderer(None, design, logger)
+        figure, axis = _plt.subplots()
+        axis.set_xlim(-1, 2)
+        axis.set_ylim(-1, 1)
+
+        plan = renderer.plan_render(axis)
+        made = []
+        thread = threading.Thread(
+            target=lambda: made.append(renderer.make_artists(plan)))
+        thread.start()
+        thread.join()
+        self.assertEqual(len(axis.collections), 0)
+        self.assertEqual(len(renderer._pending_warnings), 1)
+
+        with self.assertLogs(logger, 'WARNING'):
+            renderer.apply_artists(axis, plan, made[0])
+        # The junction of Q2 has no width, so is not drawn.
+        self.assertEqual(len(axis.collections), 5)
+
+        self.assertIsNone(renderer.make_artists(plan, lambda: True))
+        _plt.close(figure)
+
+    def test_renderer_mpl_make_artists_locks_render_cache(self):
+        """Test QMplRenderer in mpl_renderer.py changes its render cache from
+        a worker thread only while holding its lock, so that the GUI thread
+        can clear the cache meanwhile."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1')
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        figure, axis = _plt.subplots()
+
+        plan = renderer.plan_render(axis)
+        made = []
+        thread = threading.Thread(
+            target=lambda: made.append(renderer.make_artists(plan)))
+        with renderer._lock:
+            thread.start()
+            thread.join(0.5)
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(made, [])
+        thread.join()
+        self.assertEqual(len(made), 1)
+        self.assertIn(design.components['Q1'].id, renderer._render_cache)
+
+        renderer.clear_render_cache()
+        self.assertEqual(renderer._render_cache, {})
+        _plt.close(figure)
+
     def test_renderer_gds_check_cheese(self):
         """Test check_cheese in gds_renderer.py."""
         design = designs.DesignPlanar()
@@ -501,6 +834,465 @@ class TestRenderers(unittest.TestCase):
         self.assertEqual(renderer._check_either_cheese('main', 1), 1)
         self.assertEqual(renderer._check_either_cheese('fake', 0), 5)
 
+    def test_renderer_gds_export_parallel(self):
+        """Test export_to_gds(parallel=2) in gds_renderer.py gives the same
+        cells as the sequential export."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1', options=dict(pos_x='-1mm'))
+        TransmonPocket(design, 'Q2', options=dict(pos_x='1mm'))
+        poly = design.qgeometry.tables['poly']
+        poly['layer'] = np.where(poly['component'] == 1, 1, 2)
+
+        bounds = []
+        with tempfile.TemporaryDirectory() as directory:
+            for parallel in [None, 2]:
+                # A new renderer, so nothing is kept from the last export.
+                renderer = QGDSRenderer(design)
+                path = os.path.join(directory, f'{parallel}.gds')
+                self.assertEqual(
+                    renderer.export_to_gds(path, parallel=parallel), 1)
+                bounds.append({
+                    name: cell.get_bounding_box()
+                    for name, cell in renderer.lib.cells.items()
+                })
+
+        self.assertIn('TOP_main_2', bounds[0])
+        self.assertEqual(bounds[0].keys(), bounds[1].keys())
+        for name, box in bounds[0].items():
+            if box is None:
+                self.assertIsNone(bounds[1][name])
+            else:
+                self.assertTrue(np.allclose(box, bounds[1][name]))
+
+    def test_renderer_gds_export_stream(self):
+        """Test export_to_gds(stream=True) in gds_renderer.py writes the same
+        cells as the export of the whole library."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1', options=dict(pos_x='-1mm'))
+        TransmonPocket(design, 'Q2', options=dict(pos_x='1mm'))
+
+        libraries = []
+        with tempfile.TemporaryDirectory() as directory:
+            for stream in [False, True]:
+                renderer = QGDSRenderer(design)
+                path = os.path.join(directory, f'{stream}.gds')
+                self.assertEqual(renderer.export_to_gds(path, stream=stream), 1)
+                libraries.append(gdspy.GdsLibrary(infile=path))
+
+        self.assertEqual(list(renderer.lib.cells), ['TOP'])
+        self.assertEqual(libraries[0].cells.keys(), libraries[1].cells.keys())
+        self.assertTrue(
+            np.allclose(libraries[0].cells['TOP'].get_bounding_box(),
+                        libraries[1].cells['TOP'].get_bounding_box()))
+        self.assertAlmostEqual(libraries[0].cells['TOP'].area(),
+                               libraries[1].cells['TOP'].area(),
+                               places=6)
+
+    def test_renderer_gds_export_stream_one_chip(self):
+        """Test export_to_gds(stream=True) in gds_renderer.py frees the data of
+        a chip before the next chip is gathered."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1', options=dict(pos_x='-1mm'))
+        TransmonPocket(design, 'Q2', options=dict(pos_x='1mm'))
+        for table in design.qgeometry.tables.values():
+            table.loc[table['component'] == design.components['Q2'].id,
+                      'chip'] = 'chip_2'
+
+        renderer = QGDSRenderer(design)
+        create_qgeometry = renderer._create_qgeometry_for_gds
+        gathered = []
+
+        def create_qgeometry_for_gds(highlight_qcomponents, chip_names):
+            gathered.append([
+                name for name in renderer.chip_info if renderer.chip_info[name]
+            ])
+            return create_qgeometry(highlight_qcomponents, chip_names)
+
+        renderer._create_qgeometry_for_gds = create_qgeometry_for_gds
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stream.gds')
+            self.assertEqual(renderer.export_to_gds(path, stream=True), 1)
+            library = gdspy.GdsLibrary(infile=path)
+
+        # Once to check the names, then once for each chip, with no chip
+        # left over from the one before.
+        self.assertEqual(gathered, [[], [], []])
+        self.assertIn('TOP_main', library.cells)
+        self.assertIn('TOP_chip_2', library.cells)
+
+    def test_renderer_gds_qgeometry_table_to_gds(self):
+        """Test _qgeometry_table_to_gds in gds_renderer.py gives the same
+        elements as converting row by row."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1')
+        renderer = QGDSRenderer(design)
+
+        for table_name in ['path', 'poly']:
+            table = design.qgeometry.tables[table_name]
+            expected = table.apply(lambda row: _qgeometry_to_gds(renderer, row),
+                                   axis=1)
+            result = renderer._qgeometry_table_to_gds(table)
+
+            self.assertEqual(list(result.index), list(expected.index))
+            for element, expected_element in zip(result, expected):
+                self.assertIs(type(element), type(expected_element))
+                self.assertTrue(
+                    np.allclose(element.get_bounding_box(),
+                                expected_element.get_bounding_box()))
+
+    def test_renderer_gds_fix_short_segments_within_table(self):
+        """Test _fix_short_segments_within_table in gds_renderer.py splits the
+        same rows into the same LineStrings as the row by row version."""
+        design = designs.DesignPlanar()
+        renderer = QGDSRenderer(design)
+        table = geopandas.GeoDataFrame(
+            dict(component=[1, 1, 2, 2, 3, 3],
+                 fillet=[0.05, 0.05, 0.05, np.nan, 0.05, 0.1],
+                 width=0.01,
+                 geometry=[
+                     LineString([(0, 0), (1, 0), (1, 0.02), (2, 0.02), (2, 1)]),
+                     LineString([(0, 0), (0.01, 0), (0.01, 1), (1, 1)]),
+                     LineString([(0, 0), (1, 0), (1, 1), (2, 1), (2, 2)]),
+                     LineString([(0, 0), (0.01, 0), (0.01, 1)]),
+                     LineString([(0, 0), (1, 0), (1, 1), (1.02, 1)]),
+                     LineString([(0, 0), (0.1, 0), (0.1, 0.1), (0.2, 0.1),
+                                 (0.2, 0.3), (1, 0.3), (1, 2), (2, 2)])
+                 ]))
+
+        def fix_row_by_row(data_frame):
+            # Copies the table for each row it replaces.
+            result = data_frame.copy()
+            df_fillet = data_frame[-data_frame['fillet'].isnull()]
+            for index, row in df_fillet.iterrows():
+                status, all_shapelys = renderer._check_length(
+                    row.geometry, row.fillet)
+                if status > 0:
+                    orig_row = result.loc[index].copy()
+                    result = result.drop(index=index)
+                    for short_shape in all_shapelys.values():
+                        orig_row['geometry'] = short_shape['line']
+                        orig_row['fillet'] = short_shape['fillet']
+                        result = pd.concat([result, orig_row.to_frame().T])
+            return result
+
+        expected = fix_row_by_row(table)
+        renderer.chip_info['main'] = {1: {'all_subtract_true': table}}
+        renderer._fix_short_segments_within_table('main', 1,
+                                                  'all_subtract_true')
+        result = renderer.chip_info['main'][1]['all_subtract_true']
+
+        self.assertGreater(len(result), len(table))
+        self.assertEqual(list(result.index), list(expected.index))
+        for geometry, expected_geometry in zip(result['geometry'],
+                                               expected['geometry']):
+            self.assertTrue(geometry.equals(expected_geometry))
+        self.assertTrue(
+            np.allclose(result['fillet'].astype(float),
+                        expected['fillet'].astype(float),
+                        equal_nan=True))
+
+    def test_renderer_gds_read_junction_cells(self):
+        """Test _read_junction_cells in gds_renderer.py parses a junction file
+        once, and again after the file changes."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'junctions.gds')
+            junction_lib = gdspy.GdsLibrary()
+            junction_lib.new_cell('my_other_junction').add(
+                gdspy.Rectangle((0, 0), (1, 2)))
+            junction_lib.write_gds(path)
+
+            cells = gds_renderer._read_junction_cells(path, 1e-6, 1e-9)
+            self.assertIn('my_other_junction', cells)
+            self.assertIs(gds_renderer._read_junction_cells(path, 1e-6, 1e-9),
+                          cells)
+            self.assertIsNot(
+                gds_renderer._read_junction_cells(path, 1e-3, 1e-9), cells)
+
+            modified = os.path.getmtime(path) + 10
+            os.utime(path, (modified, modified))
+            self.assertIsNot(
+                gds_renderer._read_junction_cells(path, 1e-6, 1e-9), cells)
+
+    def test_renderer_gds_table_fingerprint(self):
+        """Test _table_fingerprint in gds_renderer.py hashes the rows as a set,
+        including the bool, int, float and object columns."""
+        table = geopandas.GeoDataFrame(
+            dict(component=[1, 2],
+                 name=['pad', 'pocket'],
+                 geometry=[
+                     shapely.geometry.box(0, 0, 1, 1),
+                     shapely.geometry.box(1, 1, 2, 2)
+                 ],
+                 layer=[1, 1],
+                 subtract=[False, True],
+                 helper=np.array([False, False]),
+                 width=[0.0, 0.5],
+                 fillet=[np.nan, 0.1]))
+        fingerprint = gds_renderer._table_fingerprint(table)
+
+        self.assertEqual(gds_renderer._table_fingerprint(table.iloc[::-1]),
+                         fingerprint)
+        self.assertEqual(gds_renderer._table_fingerprint(table.reset_index()),
+                         fingerprint)
+        self.assertEqual(gds_renderer._table_fingerprint(table.iloc[0:0]),
+                         b'empty')
+
+        for column, values in [('subtract', [True, True]),
+                               ('helper', [False, True]), ('name', ['a', 'b']),
+                               ('width', [0.0, 0.25])]:
+            changed = table.copy()
+            changed[column] = values
+            self.assertNotEqual(gds_renderer._table_fingerprint(changed),
+                                fingerprint, column)
+
+    def test_renderer_gds_cheesing_tiles(self):
+        """Test Cheesing in make_cheese.py removes the keepout from the grid of
+        holes, with tiles of the grid as gdspy.CellArray."""
+        QGDSRenderer._clear_library()
+        lib = gdspy.GdsLibrary()
+        lib.new_cell('TOP_main_1')
+        keepout = shapely.geometry.MultiPolygon(
+            [shapely.geometry.box(0.31, 0.31, 0.62, 0.57)])
+        keepout_gds = [
+            gdspy.Rectangle((0.31, 0.31), (0.62, 0.57), layer=1, datatype=99)
+        ]
+        a_cheese = Cheesing(keepout,
+                            keepout_gds,
+                            lib,
+                            0,
+                            0,
+                            2,
+                            2,
+                            'main',
+                            0.1,
+                            1,
+                            True,
+                            100,
+                            99,
+                            logging.getLogger(),
+                            199,
+                            1e-9,
+                            shape_0_x=0.025,
+                            shape_0_y=0.025,
+                            delta_x=0.05,
+                            delta_y=0.05)
+        a_cheese.apply_cheesing()
+
+        diff_holes_cell = lib.cells['TOP_main_1_Cheese_diff']
+        self.assertTrue(
+            any(
+                isinstance(reference, gdspy.CellArray)
+                for reference in diff_holes_cell.references))
+
+        holes = shapely.ops.unary_union([
+            shapely.geometry.box(x - 0.0125, y - 0.0125, x + 0.0125, y + 0.0125)
+            for x in np.arange(0.1, 1.9, 0.05)
+            for y in np.arange(0.1, 1.9, 0.05)
+        ])
+        self.assertAlmostEqual(diff_holes_cell.area(),
+                               holes.difference(keepout).area,
+                               places=6)
+
+    def test_renderer_gds_cheesing_ground_tiles(self):
+        """Test Cheesing in make_cheese.py subtracts the holes from the ground
+        of a positive mask, polygons and paths, tile by tile, with the same
+        result as a single boolean."""
+        QGDSRenderer._clear_library()
+        lib = gdspy.GdsLibrary()
+        ground = gdspy.boolean(gdspy.Rectangle((0, 0), (2, 2)),
+                               gdspy.Rectangle((0.8, 0.8), (1.1, 1.3)),
+                               'not',
+                               layer=1)
+        path = gdspy.FlexPath([(1.5, 0.2), (1.5, 1.8)], 0.1, layer=1)
+        lib.new_cell('TOP_main_1').add([ground, path])
+        keepout = shapely.geometry.MultiPolygon(
+            [shapely.geometry.box(0.31, 0.31, 0.62, 0.57)])
+        keepout_gds = [
+            gdspy.Rectangle((0.31, 0.31), (0.62, 0.57), layer=1, datatype=99)
+        ]
+        a_cheese = Cheesing(keepout,
+                            keepout_gds,
+                            lib,
+                            0,
+                            0,
+                            2,
+                            2,
+                            'main',
+                            0.1,
+                            1,
+                            False,
+                            100,
+                            99,
+                            logging.getLogger(),
+                            199,
+                            1e-9,
+                            shape_0_x=0.025,
+                            shape_0_y=0.025,
+                            delta_x=0.05,
+                            delta_y=0.05)
+        a_cheese.tile_holes = 4
+        a_cheese.apply_cheesing()
+
+        ground_cheese_cell = lib.cells['TOP_main_1_Cheese_100']
+        self.assertTrue(
+            any(
+                isinstance(reference, gdspy.CellArray)
+                for reference in ground_cheese_cell.references))
+
+        expected = gdspy.boolean(
+            gdspy.boolean(ground, path.get_polygons(), 'or', precision=1e-9),
+            lib.cells['TOP_main_1_Cheese_diff'].get_polygons(),
+            'not',
+            precision=1e-9)
+        actual = gdspy.boolean(ground_cheese_cell.get_polygons(),
+                               None,
+                               'or',
+                               precision=1e-9)
+        self.assertAlmostEqual(actual.area(), expected.area(), places=6)
+        self.assertIsNone(gdspy.boolean(actual, expected, 'xor',
+                                        precision=1e-9))
+
+    def test_renderer_gds_cheesing_in_keepout(self):
+        """Test Cheesing in make_cheese.py leaves no cell of holes in the
+        library when the keepout covers the whole chip."""
+        keepout = shapely.geometry.MultiPolygon(
+            [shapely.geometry.box(0, 0, 2, 2)])
+        keepout_gds = [gdspy.Rectangle((0, 0), (2, 2), layer=1, datatype=99)]
+        for is_neg_mask in [True, False]:
+            QGDSRenderer._clear_library()
+            lib = gdspy.GdsLibrary()
+            lib.new_cell('TOP_main_1').add(gdspy.Rectangle((0, 0), (2, 2)))
+            a_cheese = Cheesing(keepout,
+                                keepout_gds,
+                                lib,
+                                0,
+                                0,
+                                2,
+                                2,
+                                'main',
+                                0.1,
+                                1,
+                                is_neg_mask,
+                                100,
+                                99,
+                                logging.getLogger(),
+                                199,
+                                1e-9,
+                                shape_0_x=0.025,
+                                shape_0_y=0.025,
+                                delta_x=0.05,
+                                delta_y=0.05)
+            a_cheese.apply_cheesing()
+
+            self.assertNotIn('TOP_main_1_Cheese_diff', lib.cells)
+            self.assertNotIn('TOP_main_1_Cheese_hole', lib.cells)
+
+    def test_renderer_gds_ground_plane_tiles(self):
+        """Test the tiled ground plane in gds_renderer.py has the same area as
+        the ground plane from a single boolean."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1', options=dict(pos_x='-1mm'))
+        TransmonPocket(design, 'Q2', options=dict(pos_x='1mm'))
+        renderer = QGDSRenderer(design)
+
+        areas = []
+        with tempfile.TemporaryDirectory() as directory:
+            for tiles in ['1', '3']:
+                renderer.options.ground_plane_tiles.x = tiles
+                renderer.options.ground_plane_tiles.y = tiles
+                path = os.path.join(directory, f'{tiles}.gds')
+                self.assertEqual(renderer.export_to_gds(path), 1)
+                areas.append(renderer.lib.cells['TOP_main_1'].area())
+
+        self.assertAlmostEqual(areas[0], areas[1], places=6)
+
+    def test_renderer_gds_hierarchical(self):
+        """Test the hierarchical export in gds_renderer.py places identical
+        QComponents by reference to one cell, with the same geometry as the
+        flat export."""
+        design = designs.DesignPlanar()
+        TransmonPocket(design, 'Q1', options=dict(pos_x='-2mm'))
+        TransmonPocket(design,
+                       'Q2',
+                       options=dict(pos_x='0mm', orientation='90'))
+        TransmonPocket(design,
+                       'Q3',
+                       options=dict(pos_x='2mm', pad_width='300um'))
+        renderer = QGDSRenderer(design)
+
+        areas = []
+        with tempfile.TemporaryDirectory() as directory:
+            for hierarchical in ['False', 'True']:
+                renderer.options.hierarchical = hierarchical
+                path = os.path.join(directory, f'{hierarchical}.gds')
+                self.assertEqual(renderer.export_to_gds(path), 1)
+                areas.append(renderer.lib.cells['TOP_main_1'].area())
+
+        component_cells = [
+            name for name in renderer.lib.cells
+            if name.startswith('TransmonPocket_')
+        ]
+        self.assertEqual(len(component_cells), 2)
+        references = [
+            reference.ref_cell.name
+            for reference in renderer.lib.cells['TOP_main_1'].references
+        ]
+        self.assertEqual(
+            sorted(references.count(name) for name in component_cells), [1, 2])
+        self.assertAlmostEqual(areas[0], areas[1], places=6)
+
+    def test_renderer_gds_hierarchical_mixed_option_keys(self):
+        """Test a QComponent whose options have keys of mixed types is not
+        placed by reference in gds_renderer.py."""
+        design = designs.DesignPlanar()
+        qubit = TransmonPocket(design,
+                               'Q1',
+                               options=dict(notes={
+                                   1: 'one',
+                                   'two': 2
+                               }))
+        renderer = QGDSRenderer(design)
+        renderer.options.hierarchical = 'True'
+
+        self.assertIsNone(renderer._component_placement(qubit.id))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'design.gds')
+            self.assertEqual(renderer.export_to_gds(path), 1)
+
+    def test_renderer_gds_export_reuses_unchanged_layers(self):
+        """Test a second export in gds_renderer.py reuses the results of the
+        layers that did not change, and gives the same geometry as a new
+        renderer for the layers that did."""
+        design = designs.DesignPlanar()
+        qubit = TransmonPocket(design, 'Q1')
+        Rectangle(design,
+                  'R1',
+                  options=dict(pos_x='2mm', subtract='True', layer='2'))
+        renderer = QGDSRenderer(design)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'first.gds')
+            self.assertEqual(renderer.export_to_gds(path), 1)
+            layer_1 = renderer.chip_info['main'][1]
+            layer_2 = renderer.chip_info['main'][2]
+
+            self.assertEqual(renderer.export_to_gds(path), 1)
+            self.assertIs(renderer.chip_info['main'][1], layer_1)
+            self.assertIs(renderer.chip_info['main'][2], layer_2)
+
+            qubit.options.pad_width = '300um'
+            design.rebuild()
+            self.assertEqual(renderer.export_to_gds(path), 1)
+            self.assertIsNot(renderer.chip_info['main'][1], layer_1)
+            self.assertIs(renderer.chip_info['main'][2], layer_2)
+            area = renderer.lib.cells['TOP_main_1'].area()
+
+            fresh_renderer = QGDSRenderer(design)
+            path = os.path.join(directory, 'fresh.gds')
+            self.assertEqual(fresh_renderer.export_to_gds(path), 1)
+            self.assertAlmostEqual(
+                area, fresh_renderer.lib.cells['TOP_main_1'].area(), places=6)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
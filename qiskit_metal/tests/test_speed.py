@@ -18,9 +18,73 @@
 # pylint: disable-msg=import-error
 """Qiskit Metal unit tests for speed."""
 
+from copy import deepcopy
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
 import unittest
 import time
+import logging
+import gdspy
+import geopandas
+import matplotlib.pyplot as plt
+from matplotlib.collections import Collection
+import numpy as np
+import pandas as pd
+import shapely
+import shapely.affinity
+import shapely.ops
+from shapely.geometry import LineString
 from qiskit_metal.tests.custom_decorators import timeout
+from qiskit_metal.tests.test_renderers import _qgeometry_to_gds
+
+from qiskit_metal import designs
+from qiskit_metal.toolbox_metal import parsing
+from qiskit_metal.toolbox_python import utility_functions
+from qiskit_metal.qlibrary.qubits.transmon_pocket import TransmonPocket
+from qiskit_metal.renderers.renderer_gds import gds_renderer
+from qiskit_metal.renderers.renderer_mpl.mpl_renderer import QMplRenderer
+from qiskit_metal.renderers.renderer_gds.make_cheese import Cheesing
+
+
+def _design_with_qubits(num_qubits: int,
+                        connection_pads: bool = False) -> designs.DesignPlanar:
+    """Make a design with a grid of num_qubits TransmonPockets, 20 per row,
+    2mm apart.
+
+    Args:
+        num_qubits (int): Number of qubits to add
+        connection_pads (bool): Give each qubit three connection pads.
+            Defaults to False.
+
+    Returns:
+        DesignPlanar: The design
+    """
+    design = designs.DesignPlanar()
+    options = dict()
+    if connection_pads:
+        options['connection_pads'] = dict(a=dict(),
+                                          b=dict(loc_W=-1),
+                                          c=dict(loc_H=-1))
+    for i in range(num_qubits):
+        TransmonPocket(design,
+                       f'Q{i}',
+                       options=dict(pos_x=f'{(i % 20) * 2}mm',
+                                    pos_y=f'{(i // 20) * 2}mm',
+                                    **options))
+    return design
+
+
+def _time_it(function, repeat: int = 3) -> float:
+    """Best of `repeat` wall times of function(), in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
 
 
 class TestSpeed(unittest.TestCase):
@@ -42,6 +106,511 @@ class TestSpeed(unittest.TestCase):
         time.sleep(4)
         self.assertEqual(4, 2 + 2)
 
+    def test_speed_design_rebuild_is_linear(self):
+        """Test that design.rebuild() grows linearly with the number of
+        components."""
+        small = _design_with_qubits(25)
+        large = _design_with_qubits(100)
+
+        time_small = _time_it(small.rebuild)
+        time_large = _time_it(large.rebuild)
+
+        # 4x the components, allow for noise but not for quadratic growth (16x).
+        self.assertLess(time_large / time_small, 8)
+        self.assertEqual(len(large.qgeometry.tables['poly']),
+                         4 * len(small.qgeometry.tables['poly']))
+
+    def test_speed_component_lookup_does_not_scan(self):
+        """Test that per-component reads and deletes of the qgeometry tables do
+        not grow with the size of the tables."""
+        small = _design_with_qubits(25)
+        large = _design_with_qubits(200)
+        # Flush the append buffers before timing.
+        self.assertGreater(len(large.qgeometry.tables['poly']),
+                           len(small.qgeometry.tables['poly']))
+
+        def read_and_rebuild(design):
+            qgeometry = design.qgeometry
+            for name in ['Q1', 'Q2', 'Q3', 'Q4']:
+                qgeometry.get_component_geometry_list(name)
+                qgeometry.delete_component_id(design.components[name].id)
+
+        time_small = _time_it(lambda: read_and_rebuild(small), repeat=1)
+        time_large = _time_it(lambda: read_and_rebuild(large), repeat=1)
+
+        # 8x the rows, the lookups should stay about the same.
+        self.assertLess(time_large / time_small, 3)
+
+    def test_speed_rebuild_parses_from_cache(self):
+        """Test that repeated rebuilds take the option values from the
+        parse_value cache."""
+        design = _design_with_qubits(20)
+        parsing.parse_cache_clear()
+        design.rebuild()
+        before = parsing.parse_cache_info()
+
+        design.rebuild()
+        info = parsing.parse_cache_info()
+        hits = info.hits - before.hits
+        misses = info.misses - before.misses
+        self.assertGreater(hits, 0)
+        # Only values that are not cached, such as lists, are parsed again.
+        self.assertLess(misses, hits / 10)
+
+    def test_speed_parse_string_to_float_fast_path(self):
+        """Micro-benchmark of the pint-free path of _parse_string_to_float."""
+        strings = ['0.25mm', '10 um', '-1e6 nm', '100mm', '.1um', '2 m'] * 100
+
+        time_fast = _time_it(
+            lambda: [parsing._parse_string_to_float(s) for s in strings])
+        time_pint = _time_it(
+            lambda:
+            [parsing._parse_string_to_float_with_pint(s) for s in strings])
+
+        self.assertLess(time_fast, time_pint / 5)
+
+    def test_speed_import_is_lazy(self):
+        """Test that importing qiskit_metal does not import the GUI, Qt,
+        matplotlib or the analyses, and stays fast.  Neither does making a
+        design, as in a headless batch worker."""
+        code = (
+            'import sys, time\n'
+            'start = time.perf_counter()\n'
+            'import qiskit_metal\n'
+            'print(time.perf_counter() - start)\n'
+            'for name in ["PySide2", "matplotlib", "qiskit_metal._gui",\n'
+            '             "qiskit_metal.analyses", "qiskit_metal.renderers"]:\n'
+            '    print(name in sys.modules)\n')
+        output = subprocess.run([sys.executable, '-c', code],
+                                check=True,
+                                capture_output=True,
+                                text=True).stdout.split()
+
+        self.assertLess(float(output[0]), 5)
+        self.assertEqual(output[1:], ['False'] * 5)
+
+        code = ('import sys\n'
+                'import qiskit_metal\n'
+                'from qiskit_metal import designs\n'
+                'designs.DesignPlanar()\n'
+                'for name in ["PySide2", "matplotlib.pyplot",\n'
+                '             "qiskit_metal.renderers.renderer_mpl"]:\n'
+                '    print(name in sys.modules)\n'
+                'print(qiskit_metal._QT_BACKEND_IS_SET)\n')
+        output = subprocess.run([sys.executable, '-c', code],
+                                check=True,
+                                capture_output=True,
+                                text=True).stdout.split()
+
+        self.assertEqual(output, ['False'] * 4)
+
+    def test_speed_design_defers_renderers(self):
+        """Test that creating a design does not import the renderers, until
+        they are used."""
+        code = (
+            'import sys\n'
+            'from qiskit_metal import designs\n'
+            'design = designs.DesignPlanar()\n'
+            'print("gdspy" in sys.modules, "pyEPR" in sys.modules)\n'
+            'print("gds_cell_name" in design.qgeometry.tables["junction"])\n'
+            'print(design.renderers.gds.name, "gdspy" in sys.modules)\n')
+        output = subprocess.run([sys.executable, '-c', code],
+                                check=True,
+                                capture_output=True,
+                                text=True).stdout.split()
+
+        self.assertEqual(output, ['False', 'False', 'True', 'gds', 'True'])
+
+    def test_speed_load_structured_design(self):
+        """Test that loading a structured design restores the tables faster
+        than making the components."""
+        design = _design_with_qubits(100)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'design.zip')
+            self.assertTrue(design.save_design(path, structured=True))
+
+            time_load = _time_it(lambda: designs.DesignPlanar.load_design(path))
+            time_rebuild = _time_it(
+                lambda: designs.DesignPlanar.load_design(path, rebuild=True))
+
+        self.assertLess(time_load, time_rebuild)
+
+    def test_speed_gds_export_parallel(self):
+        """Test that exporting a 6-layer design with export_to_gds(parallel=N)
+        is faster than the sequential export."""
+        if (os.cpu_count() or 1) < 4:
+            self.skipTest('Needs at least 4 cores.')
+
+        design = _design_with_qubits(120)
+        for table in design.qgeometry.tables.values():
+            table['layer'] = table['component'] % 6 + 1
+
+        def export(path, parallel=None):
+            # A new renderer, so nothing is kept from the last export.
+            renderer = gds_renderer.QGDSRenderer(design)
+            renderer.export_to_gds(path, parallel=parallel)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'design.gds')
+            time_serial = _time_it(lambda: export(path), repeat=1)
+            time_parallel = _time_it(lambda: export(path, parallel=4),
+                                     repeat=1)
+
+        self.assertLess(time_parallel, time_serial)
+
+    def test_speed_gds_ground_plane_memory_is_flat_in_layers(self):
+        """Test that the memory used to split the QGeometry tables by layer
+        for the ground plane of a 10-layer design stays about the same as for
+        a 1-layer design."""
+
+        def peak_memory(num_layers):
+            design = _design_with_qubits(100)
+            for table in design.qgeometry.tables.values():
+                table['layer'] = table['component'] % num_layers + 1
+            renderer = design.renderers.gds
+            renderer.chip_info.clear()
+            renderer.chip_info.update(renderer._get_chip_names())
+
+            tracemalloc.start()
+            renderer._create_qgeometry_for_gds()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        # Each layer used to deep-copy every table, about 10x the memory.
+        self.assertLess(peak_memory(10) / peak_memory(1), 2)
+
+    def test_speed_gds_qgeometry_table_to_gds(self):
+        """Test that converting a 50k-row path table to gdspy in one batch is
+        at least 5x faster than converting row by row, 2x without shapely 2."""
+        design = designs.DesignPlanar()
+        renderer = design.renderers.gds
+        num_rows = 50000
+        table = geopandas.GeoDataFrame(
+            dict(component=[1] * num_rows,
+                 name=[f'trace_{i}' for i in range(num_rows)],
+                 layer=[1] * num_rows,
+                 width=[0.01] * num_rows,
+                 fillet=[0.05 if i % 2 else np.nan for i in range(num_rows)],
+                 geometry=[
+                     LineString([(i, 0), (i, 0.2), (i + 0.2, 0.2)])
+                     for i in range(num_rows)
+                 ]))
+
+        def convert_row_by_row():
+            return table.apply(lambda row: _qgeometry_to_gds(renderer, row),
+                               axis=1)
+
+        time_rows = _time_it(convert_row_by_row, repeat=1)
+        time_batch = _time_it(lambda: renderer._qgeometry_table_to_gds(table),
+                              repeat=1)
+
+        # Before shapely 2, the coordinates are read one geometry at a time
+        # in the batch too.
+        speedup = 5 if hasattr(shapely, 'get_coordinates') else 2
+        self.assertLess(time_batch * speedup, time_rows)
+
+    def test_speed_gds_cheesing_10mm_chip(self):
+        """Test that cheesing a 10mm chip at 50um pitch, 40k holes, takes
+        seconds."""
+        keepout = shapely.ops.unary_union([
+            LineString([(1, y), (9, y), (9, y + 0.5)]).buffer(0.05)
+            for y in np.arange(1, 9, 1.0)
+        ])
+        if isinstance(keepout, shapely.geometry.Polygon):
+            keepout = shapely.geometry.MultiPolygon([keepout])
+        keepout_gds = [
+            gdspy.Polygon(list(poly.exterior.coords), layer=1, datatype=99)
+            for poly in keepout.geoms
+        ]
+
+        def cheese():
+            lib = gdspy.GdsLibrary()
+            lib.new_cell('TOP_main_1')
+            Cheesing(keepout,
+                     keepout_gds,
+                     lib,
+                     0,
+                     0,
+                     10,
+                     10,
+                     'main',
+                     0,
+                     1,
+                     True,
+                     100,
+                     99,
+                     logging.getLogger(),
+                     199,
+                     1e-9,
+                     shape_0_x=0.025,
+                     shape_0_y=0.025,
+                     delta_x=0.05,
+                     delta_y=0.05).apply_cheesing()
+
+        self.assertLess(_time_it(cheese, repeat=1), 10)
+
+    def test_speed_gds_ground_plane_tiles(self):
+        """Test that with a tiled ground plane, each boolean only has the
+        elements near its tile."""
+        design = _design_with_qubits(100)
+        design.chips.main.size.update(center_x='19mm',
+                                      center_y='4mm',
+                                      size_x='40mm',
+                                      size_y='10mm')
+        renderer = design.renderers.gds
+        renderer.options.ground_plane_tiles.x = '4'
+        renderer.options.ground_plane_tiles.y = '4'
+        renderer.chip_info.clear()
+        renderer.chip_info.update(renderer._get_chip_names())
+        renderer._create_qgeometry_for_gds()
+
+        jobs = renderer._ground_difference_jobs('main', 1, False, 1e-9, 199)
+        polygons_per_tile = [
+            sum(len(polygon_set.polygons) for polygon_set in job[1])
+            for job in jobs
+        ]
+        all_polygons = gds_renderer._element_polygons(
+            renderer.chip_info['main'][1]['q_subtract_true'])
+
+        self.assertEqual(len(jobs), 16)
+        self.assertLess(max(polygons_per_tile), len(all_polygons) / 4)
+
+    def test_speed_gds_hierarchical_reuses_cells(self):
+        """Test that the hierarchical export of 100 identical qubits makes one
+        cell per layer for the qubits, and writes a smaller file."""
+        design = _design_with_qubits(100)
+        renderer = design.renderers.gds
+
+        sizes = []
+        with tempfile.TemporaryDirectory() as directory:
+            for hierarchical in ['False', 'True']:
+                renderer.options.hierarchical = hierarchical
+                path = os.path.join(directory, f'{hierarchical}.gds')
+                renderer.export_to_gds(path)
+                sizes.append(os.path.getsize(path))
+
+        component_cells = [
+            name for name in renderer.lib.cells
+            if name.startswith('TransmonPocket_')
+        ]
+        self.assertEqual(len(component_cells), 1)
+        self.assertLess(sizes[1], sizes[0])
+
+    def test_speed_gds_export_after_one_edit(self):
+        """Test that exporting a 6-layer design again after editing one qubit
+        takes a fraction of the time of the first export.  The qubits have
+        connection pads, so that most of the time of an export is in the
+        layers, not in writing the file."""
+        design = _design_with_qubits(120, connection_pads=True)
+        for table in design.qgeometry.tables.values():
+            table['layer'] = table['component'] % 6 + 1
+        renderer = design.renderers.gds
+
+        def edit_one_qubit():
+            table = design.qgeometry.tables['poly']
+            first_row = table.index[table['component'] == 1][0]
+            table.at[first_row, 'geometry'] = shapely.affinity.translate(
+                table.at[first_row, 'geometry'], 0.001)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'design.gds')
+            time_full = _time_it(lambda: renderer.export_to_gds(path), repeat=1)
+            edit_one_qubit()
+            time_edit = _time_it(lambda: renderer.export_to_gds(path), repeat=1)
+
+        self.assertLess(time_edit, time_full / 2)
+
+    def test_speed_gds_fix_short_segments_within_table(self):
+        """Test that _fix_short_segments_within_table on 3,000 meanders of 40
+        vertices is at least 5x faster than checking and replacing the rows
+        one by one."""
+        design = designs.DesignPlanar()
+        renderer = gds_renderer.QGDSRenderer(design)
+
+        meanders = []
+        for i in range(3000):
+            x_values = np.repeat(np.arange(20) * 0.2, 2)
+            y_values = np.tile([0, 1, 1, 0], 10) + i * 2
+            if i % 10 == 0:
+                # One short segment, too short to fillet.
+                x_values[22:] += 0.01 - 0.2
+            meanders.append(LineString(np.column_stack([x_values, y_values])))
+        table = geopandas.GeoDataFrame(
+            dict(component=np.arange(3000),
+                 fillet=0.05,
+                 width=0.01,
+                 geometry=meanders))
+
+        def fix_row_by_row():
+            result = table.copy()
+            for index, row in table.iterrows():
+                status, all_shapelys = renderer._check_length(
+                    row.geometry, row.fillet)
+                if status > 0:
+                    orig_row = result.loc[index].copy()
+                    result = result.drop(index=index)
+                    for short_shape in all_shapelys.values():
+                        orig_row['geometry'] = short_shape['line']
+                        orig_row['fillet'] = short_shape['fillet']
+                        result = pd.concat([result, orig_row.to_frame().T])
+            return result
+
+        def fix_batch():
+            renderer.chip_info['main'] = {1: {'all_subtract_true': table}}
+            renderer._fix_short_segments_within_table('main', 1,
+                                                      'all_subtract_true')
+            return renderer.chip_info['main'][1]['all_subtract_true']
+
+        self.assertEqual(len(fix_batch()), len(fix_row_by_row()))
+        time_row_by_row = _time_it(fix_row_by_row, repeat=1)
+        time_batch = _time_it(fix_batch)
+
+        self.assertLess(time_batch * 5, time_row_by_row)
+
+    def test_speed_gds_export_stream_memory(self):
+        """Test that the peak memory of export_to_gds(stream=True) for a design
+        of 4 chips is well below that of the export of the whole library."""
+        design = _design_with_qubits(80)
+        for row in range(4):
+            design.chips[f'chip_{row}'] = deepcopy(design.chips.main)
+            design.chips[f'chip_{row}'].size.update(center_x='19mm',
+                                                    center_y=f'{row * 2}mm',
+                                                    size_x='42mm',
+                                                    size_y='2mm')
+        for table in design.qgeometry.tables.values():
+            table['chip'] = [
+                f'chip_{(component - 1) // 20}'
+                for component in table['component']
+            ]
+
+        def peak_memory(stream):
+            renderer = gds_renderer.QGDSRenderer(design)
+            with tempfile.TemporaryDirectory() as directory:
+                tracemalloc.start()
+                renderer.export_to_gds(os.path.join(directory, 'design.gds'),
+                                       stream=stream)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            return peak
+
+        self.assertLess(peak_memory(True), peak_memory(False) * 0.6)
+
+    def test_speed_mpl_replot_unchanged_design(self):
+        """Test that getting the display polygons of the paths of an unchanged
+        design of 100 qubits with connection pads again is at least 5x faster
+        than filleting and buffering them."""
+        design = _design_with_qubits(100, connection_pads=True)
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        table = design.qgeometry.tables['path']
+        table = table[table['width'] > 0]
+
+        def buffer_paths():
+            renderer.clear_render_cache()
+            renderer._get_display_polygons(table, fillet=True)
+
+        time_buffer = _time_it(buffer_paths)
+        time_again = _time_it(
+            lambda: renderer._get_display_polygons(table, fillet=True))
+
+        self.assertLess(time_again * 5, time_buffer)
+
+    def test_speed_mpl_render_after_one_edit(self):
+        """Test that rendering a design of 500 qubits again after editing one
+        of them is at least 10x faster than the first render."""
+        design = _design_with_qubits(500)
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        figure, axis = plt.subplots()
+        axis.set_xlim(-1, 39)
+        axis.set_ylim(-1, 49)
+        qubit = design.components['Q0']
+        pad_gaps = iter(['31um', '32um', '33um'])
+
+        def edit_one_qubit():
+            qubit.options.pad_gap = next(pad_gaps)
+            qubit.rebuild()
+            renderer.render_tables(axis)
+
+        time_first = _time_it(lambda: renderer.render_tables(axis), repeat=1)
+        time_edit = _time_it(edit_one_qubit)
+        plt.close(figure)
+
+        self.assertLess(time_edit * 10, time_first)
+
+    def test_speed_mpl_viewport_culling(self):
+        """Test that rendering a view of a few qubits of a design of 400
+        qubits draws less than a fifth of the components drawn without
+        viewport culling."""
+        design = _design_with_qubits(400)
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        figure, axis = plt.subplots()
+        axis.set_xlim(-1, 3)
+        axis.set_ylim(-1, 3)
+
+        def num_drawn(viewport_culling):
+            renderer.options.viewport_culling = viewport_culling
+            renderer.clear_artists()
+            renderer.render_tables(axis)
+            figure.canvas.draw()
+            return len(renderer._artists[('poly', False)])
+
+        num_all = num_drawn(False)
+        num_view = num_drawn(True)
+        plt.close(figure)
+
+        self.assertEqual(num_all, 400)
+        self.assertGreater(num_view, 0)
+        self.assertLess(num_view * 5, num_all)
+
+    def test_speed_mpl_gui_thread_share(self):
+        """Test that a render of 200 qubits with connection pads leaves only
+        the adding of the collections to the GUI thread: make_artists() does
+        not touch the axis, and apply_artists() only adds the collections it
+        made."""
+        design = _design_with_qubits(200, connection_pads=True)
+        renderer = QMplRenderer(None, design, logging.getLogger())
+        renderer.options.viewport_culling = False
+        figure, axis = plt.subplots()
+
+        plan = renderer.plan_render(axis)
+        children = axis.get_children()
+        made = renderer.make_artists(plan)
+        self.assertEqual(axis.get_children(), children)
+
+        artists = [artist for artists in made for artist in artists or []]
+        self.assertEqual(len(made), len(plan[1]))
+        self.assertGreater(len(artists), 200)
+        for artist in artists:
+            self.assertIsInstance(artist, Collection)
+            self.assertIsNone(artist.axes)
+
+        renderer.apply_artists(axis, plan, made)
+        self.assertCountEqual(axis.get_children(), children + artists)
+        plt.close(figure)
+
+    def test_speed_fillet_path_points(self):
+        """Test that filleting a meander of 2000 vertices in one call is at
+        least 10x faster than filleting it one corner at a time."""
+        x_values = np.repeat(np.arange(1000) * 0.2, 2)
+        y_values = np.tile([0, 1, 1, 0], 500)
+        coords = np.column_stack([x_values, y_values])
+
+        def fillet_by_corner():
+            newpath = [coords[:1]]
+            for i in range(1, len(coords) - 1):
+                arc = utility_functions.fillet_path_points(
+                    coords[i - 1:i + 2], 0.05)
+                newpath.append(arc[1:-1])
+            newpath.append(coords[-1:])
+            return np.concatenate(newpath)
+
+        def fillet_at_once():
+            return utility_functions.fillet_path_points(coords, 0.05)
+
+        np.testing.assert_allclose(fillet_by_corner(), fillet_at_once())
+        self.assertLess(
+            _time_it(fillet_at_once) * 10, _time_it(fillet_by_corner))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
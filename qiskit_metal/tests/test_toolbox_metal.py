@@ -20,8 +20,11 @@
 
 import unittest
 import numpy as np
+from geopandas import GeoDataFrame
+from shapely.geometry import LineString, Polygon
 
 from qiskit_metal.toolbox_metal import about
+from qiskit_metal.toolbox_metal import import_export
 from qiskit_metal.toolbox_metal import parsing
 from qiskit_metal.toolbox_metal import math_and_overrides
 from qiskit_metal.toolbox_metal.exceptions import QiskitMetalExceptions
@@ -153,6 +156,32 @@ class TestToolboxMetal(unittest.TestCase, AssertionsMixin):
         self.assertEqual(parsing._parse_string_to_float(12), 12)
         self.assertEqual(parsing._parse_string_to_float('12.2.3'), '12.2.3')
 
+    def test_toolbox_metal_parse_string_to_float_fast_path(self):
+        """Test that _parse_string_to_float gives the same values as pint, for
+        the strings of the parsing module docstring."""
+        strings = [
+            '1', '1.', '+1.', '-1.', '1.0', '1mm', ' 1  mm ', '100mm', '1.mm',
+            '1.0mm', '1um', '+1um', '-1um', '-0.1um', '.1um', '  0.1  m',
+            '-1E6 nm', '-1e6 nm', '.1e6 nm', ' - .1e6nm ', ' - .1e6 nm ',
+            ' - 1e6 nm ', '- 1e6 nm ', ' - 1. ', ' + 1. ', '1 .', '2*1',
+            '2*10mm', '-2 * 1e5 nm', '1m', '1nm', '4e-6mm', '2mm', '100um',
+            '5um', ' -0.1e6 nm', '3 miles'
+        ]
+        for string in strings:
+            with self.subTest(string=string):
+                expected = parsing._parse_string_to_float_with_pint(string)
+                actual = parsing._parse_string_to_float(string)
+                self.assertEqual(type(actual), type(expected))
+                if isinstance(expected, float):
+                    self.assertAlmostEqualRel(actual, expected, rel_tol=1e-12)
+                else:
+                    self.assertEqual(actual, expected)
+
+        # Arithmetic and unknown units are left to pint.
+        self.assertIsNone(parsing._parse_string_to_float_fast('2*10mm'))
+        self.assertIsNone(parsing._parse_string_to_float_fast('3 miles'))
+        self.assertIsNone(parsing._parse_string_to_float_fast('1 Mm'))
+
     def test_toolbox_metal_is_variable_name(self):
         """Test is_variable_name in toolbox_metal.py."""
         self.assertTrue(parsing.is_variable_name('ok'))
@@ -256,6 +285,74 @@ class TestToolboxMetal(unittest.TestCase, AssertionsMixin):
                                           expected[x][i],
                                           rel_tol=1e-3)
 
+    def test_toolbox_metal_parse_value_cached(self):
+        """Test parse_value_cached and VariablesDict in toolbox_metal.py."""
+        parsing.parse_cache_clear()
+        variables = parsing.VariablesDict(cpw_width='10um')
+
+        self.assertAlmostEqual(
+            parsing.parse_value_cached('cpw_width', variables), 0.01)
+        self.assertAlmostEqual(
+            parsing.parse_value_cached('cpw_width', variables), 0.01)
+        info = parsing.parse_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+        # A change to the variables gives a new version, so a new entry.
+        version = variables._version
+        variables['cpw_width'] = '20um'
+        self.assertNotEqual(variables._version, version)
+        self.assertAlmostEqual(
+            parsing.parse_value_cached('cpw_width', variables), 0.02)
+        self.assertEqual(parsing.parse_cache_info().misses, 2)
+
+        # The variables looked up are recorded on hits as well as misses.
+        used = set()
+        parsing.parse_value_cached('cpw_width',
+                                   parsing.VariableUseRecorder(variables, used))
+        self.assertEqual(used, {'cpw_width'})
+        self.assertEqual(parsing.parse_cache_info().hits, 2)
+
+        # Lists are parsed every time, and plain dicts are not cached.
+        self.assertEqual(parsing.parse_value_cached('[1, 2]', variables),
+                         [1, 2])
+        self.assertEqual(parsing.parse_value_cached('1mm', {}), 1)
+        self.assertEqual(parsing.parse_cache_info().currsize, 2)
+
+        # Strings which look like names but are not variables are not
+        # recorded.
+        self.assertEqual(
+            parsing.parse_value_cached(
+                'left', parsing.VariableUseRecorder(variables, used)), 'left')
+        self.assertEqual(used, {'cpw_width'})
+
+        parsing.parse_cache_clear()
+        info = parsing.parse_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+    def test_toolbox_metal_table_npz(self):
+        """Test _table_to_npz and _table_from_npz in import_export.py give back
+        the table, with a missing and an empty geometry."""
+        table = GeoDataFrame(
+            dict(component=[1, 2, 3, 4],
+                 name=['a', 'b', 'c', 'd'],
+                 geometry=[
+                     LineString([(0, 0), (1, 1)]), None,
+                     Polygon(),
+                     Polygon([(0, 0), (1, 0), (1, 1)])
+                 ]))
+
+        data, json_columns = import_export._table_to_npz(table)
+        result = import_export._table_from_npz(data, list(table.columns),
+                                               json_columns)
+
+        self.assertEqual(list(result.columns), list(table.columns))
+        self.assertEqual(result['component'].tolist(), [1, 2, 3, 4])
+        self.assertEqual(result['name'].tolist(), ['a', 'b', 'c', 'd'])
+        self.assertTrue(result.geometry[0].equals(table.geometry[0]))
+        self.assertIsNone(result.geometry[1])
+        self.assertTrue(result.geometry[2].is_empty)
+        self.assertTrue(result.geometry[3].equals(table.geometry[3]))
+
     def test_toolbox_metal_set_decimal_precision(self):
         """Test functionality of set_decimal_precision in toolbox_metal.py."""
         self.assertEqual(math_and_overrides.DECIMAL_PRECISION, 10)
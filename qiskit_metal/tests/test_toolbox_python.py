@@ -18,6 +18,7 @@
 """Qiskit Metal unit tests analyses functionality."""
 
 import unittest
+import numpy as np
 from qiskit_metal.toolbox_python.display import Headings
 from qiskit_metal.toolbox_python.display import Color
 from qiskit_metal.toolbox_python.display import MetalTutorialMagics
@@ -149,6 +150,41 @@ class TestToolboxPython(unittest.TestCase):
                                                     0.1)
         self.assertEqual(results, [1, 2])
 
+    def test_utility_fillet_path_points(self):
+        """Test functionality of fillet_path_points in utility_functions.py."""
+        coords = [(0, 0), (1, 0), (1, 1), (2, 1)]
+        result = utility_functions.fillet_path_points(coords, 0.1, points=4)
+        self.assertEqual(result.shape, (10, 2))
+        self.assertEqual(result[0].tolist(), [0, 0])
+        self.assertEqual(result[-1].tolist(), [2, 1])
+
+        # The first arc starts 0.1 before the corner and stays 0.1 away from
+        # the center of the fillet.
+        self.assertAlmostEqual(result[1][0], 0.9)
+        self.assertAlmostEqual(result[1][1], 0)
+        distances = np.hypot(result[1:5, 0] - 0.9, result[1:5, 1] - 0.1)
+        for distance in distances:
+            self.assertAlmostEqual(distance, 0.1)
+
+        # A corner which is not square has `points` vertices too, even where
+        # end_angle / (end_angle / points) rounds above points.
+        result = utility_functions.fillet_path_points([(0, 0), (1, 0), (3, 3)],
+                                                      0.1,
+                                                      points=7)
+        self.assertEqual(result.shape, (9, 2))
+        end_angle = np.arccos(-2 / np.hypot(2, 3))
+        theta = np.arange(7) * end_angle / 7
+        np.testing.assert_allclose(
+            result[1:8],
+            np.column_stack(
+                [0.9 + np.sin(theta) * 0.1, 0.1 - np.cos(theta) * 0.1]))
+
+        # Skipped corners and short linestrings are kept as they are.
+        result = utility_functions.fillet_path_points(coords, 0.1, [1, 2])
+        self.assertEqual(result.tolist(), [[0, 0], [1, 0], [1, 1], [2, 1]])
+        result = utility_functions.fillet_path_points(coords[:2], 0.1)
+        self.assertEqual(result.tolist(), [[0, 0], [1, 0]])
+
     def test_utility_clean_name(self):
         """Test clean_name in utility_function.py."""
         self.assertEqual(
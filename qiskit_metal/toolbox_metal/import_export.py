@@ -15,13 +15,47 @@
 # pylint: disable=protected-access
 # pylint: disable-msg=relative-beyond-top-level
 # pylint: disable-msg=broad-except
-"""Saving and load metal data."""
+"""Saving and load metal data.
 
+Designs can be saved in two formats:
+
+    * A pickle of the QDesign, see save_metal and load_metal_design.
+    * A zip archive, see save_metal_archive and load_metal_archive, with
+
+        * ``design.json``: the variables, chips, metadata, the class, options and
+          pins of each component, the net table and the dependencies.
+        * ``qgeometry/<table>.npz``: each QGeometry table as columnar numpy
+          arrays, with the geometries as WKB. Columns that are not numbers are
+          stored in ``design.json``.
+
+      The archive can be loaded without the classes of the design being pickled,
+      and without calling the make() of every component.
+"""
+
+import importlib
+import io
+import json
 import pickle
+import zipfile
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import wkb
+from geopandas import GeoDataFrame
+
 #from ..designs.base
+from .. import Dict
 from ..toolbox_python.utility_functions import log_error_easy
+from .parsing import VariablesDict
+
+__all__ = [
+    'save_metal', 'load_metal_design', 'save_metal_archive',
+    'load_metal_archive'
+]
 
-__all__ = ['save_metal', 'load_metal_design']
+# Version of the layout of the archive written by save_metal_archive
+METAL_ARCHIVE_VERSION = 1
 
 
 def save_metal(filename: str, design):
@@ -83,3 +117,292 @@ def load_metal_design(filename: str):
     design.logger = logger  #TODO: fix from save pikcle
 
     return design
+
+
+def _to_json(obj):
+    """Default of json.dump, for the numpy and other types found in options.
+
+    Args:
+        obj (object): Object that json cannot serialize
+
+    Returns:
+        object: A json serializable version of obj
+
+    Raises:
+        TypeError: obj cannot be serialized
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(
+        f'Object of type {type(obj).__name__} cannot be saved to json.')
+
+
+def _import_class(full_class_name: str):
+    """Import a class from its module and name.
+
+    Args:
+        full_class_name (str): Such as 'qiskit_metal.designs.design_planar.DesignPlanar'
+
+    Returns:
+        type: The class
+    """
+    module_name, class_name = full_class_name.rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _table_to_npz(table: GeoDataFrame) -> tuple:
+    """Convert a QGeometry table to columnar arrays.
+
+    Args:
+        table (GeoDataFrame): The table
+
+    Returns:
+        tuple: bytes of the npz of the geometries and numerical columns,
+        and dict of the columns stored in json.  A missing geometry is
+        stored with no bytes.
+    """
+    geometries = [
+        b'' if geometry is None else wkb.dumps(geometry)
+        for geometry in table.geometry
+    ]
+    arrays = dict(__geometry__=np.frombuffer(b''.join(geometries),
+                                             dtype=np.uint8),
+                  __geometry_offsets__=np.cumsum([0] +
+                                                 [len(g) for g in geometries],
+                                                 dtype=np.int64))
+    json_columns = dict()
+    for column in table.columns:
+        if column == 'geometry':
+            continue
+        values = table[column].to_numpy()
+        if values.dtype.kind in 'biuf':
+            arrays[column] = values
+        else:
+            json_columns[column] = values.tolist()
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue(), json_columns
+
+
+def _table_from_npz(data: bytes, columns: list,
+                    json_columns: dict) -> GeoDataFrame:
+    """Convert columnar arrays back to a QGeometry table.
+
+    Args:
+        data (bytes): npz written by _table_to_npz
+        columns (list): Names of the columns, in order
+        json_columns (dict): Columns stored in json
+
+    Returns:
+        GeoDataFrame: The table
+    """
+    arrays = np.load(io.BytesIO(data), allow_pickle=False)
+    buffer = arrays['__geometry__'].tobytes()
+    offsets = arrays['__geometry_offsets__']
+    # No bytes is a missing geometry
+    blobs = [
+        buffer[start:end] or None
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
+    if hasattr(shapely, 'from_wkb'):
+        # shapely 2 decodes all the geometries in one call
+        geometries = list(shapely.from_wkb(blobs))
+    else:
+        geometries = [
+            None if blob is None else wkb.loads(blob) for blob in blobs
+        ]
+
+    data_columns = dict()
+    for column in columns:
+        if column == 'geometry':
+            data_columns[column] = geometries
+        elif column in json_columns:
+            data_columns[column] = pd.Series(json_columns[column], dtype=object)
+        else:
+            data_columns[column] = arrays[column]
+    return GeoDataFrame(data_columns, columns=columns)
+
+
+def _component_to_json(component) -> dict:
+    """Describe a component for design.json.
+
+    Args:
+        component (QComponent): The component
+
+    Returns:
+        dict: id, name, class, options, metadata and pins of the component
+    """
+    return dict(id=component.id,
+                name=component.name,
+                class_name=component.class_name,
+                made=component._made,
+                status=component.status,
+                options=component.options,
+                metadata=component.metadata,
+                pins=component.pins,
+                qgeometry_table_usage=component.qgeometry_table_usage)
+
+
+def save_metal_archive(filename: str, design) -> bool:
+    """Save a design as a zip archive of json and columnar QGeometry tables.
+    See the module docstring for the layout.
+
+    Args:
+        filename (str): File path
+        design (QDesign): Design to save
+
+    Returns:
+        bool: True is sucessful, False otherwise
+    """
+    qgeometry = design.qgeometry
+    tables = qgeometry.tables  # flushed and compacted
+    net_info = design._qnet._net_info
+
+    content = dict(
+        version=METAL_ARCHIVE_VERSION,
+        design_class=
+        f'{design.__class__.__module__}.{design.__class__.__name__}',
+        overwrite_enabled=design.overwrite_enabled,
+        metadata=design.metadata,
+        variables=design.variables,
+        chips=design.chips,
+        latest_assigned_id=design._qcomponent_latest_assigned_id,
+        latest_name_id=design._qcomponent_latest_name_id,
+        components=[
+            _component_to_json(design._components[component_id])
+            for component_id in sorted(design._components)
+        ],
+        net_info=dict(net_id=net_info['net_id'].tolist(),
+                      component_id=net_info['component_id'].tolist(),
+                      pin_name=net_info['pin_name'].tolist()),
+        qnet_latest_assigned_id=design._qnet._qnet_latest_assigned_id,
+        dependency_parents={
+            str(child_id): sorted(parents)
+            for child_id, parents in design._dependency_parents.items()
+            if parents
+        },
+        pin_input_parents={
+            str(child_id): sorted(parents)
+            for child_id, parents in design._pin_input_parents.items()
+        },
+        component_variables={
+            str(component_id): sorted(names)
+            for component_id, names in design._component_variables.items()
+        },
+        qgeometry=dict())
+
+    try:
+        with zipfile.ZipFile(filename, 'w',
+                             compression=zipfile.ZIP_STORED) as archive:
+            for table_name, table in tables.items():
+                data, json_columns = _table_to_npz(table)
+                archive.writestr(f'qgeometry/{table_name}.npz', data)
+                content['qgeometry'][table_name] = dict(
+                    columns=list(table.columns), json_columns=json_columns)
+            archive.writestr('design.json', json.dumps(content,
+                                                       default=_to_json))
+    except Exception as e:
+        text = f'ERROR WHILE SAVING: {e}'
+        log_error_easy(design.logger, post_text=text)
+        return False
+    return True
+
+
+def load_metal_archive(filename: str, rebuild: bool = False):
+    """Load a design saved by save_metal_archive.
+
+    The components are created from their class and options without calling
+    make(). Their pins, the net table and the QGeometry tables are restored
+    from the archive. If rebuild is True, the components are instead made from
+    their options, in the order they were created.
+
+    Args:
+        filename (str): File path
+        rebuild (bool): Make the components from their options instead of
+                        restoring the QGeometry tables.  Defaults to False.
+
+    Returns:
+        QDesign: The design
+    """
+    with zipfile.ZipFile(filename, 'r') as archive:
+        content = json.loads(archive.read('design.json'))
+        table_data = {
+            table_name: archive.read(f'qgeometry/{table_name}.npz')
+            for table_name in content['qgeometry']
+        }
+
+    design = _import_class(content['design_class'])(
+        metadata=content['metadata'],
+        overwrite_enabled=content['overwrite_enabled'])
+    design._variables = VariablesDict(content['variables'])
+    design._chips = Dict(content['chips'])
+
+    # Create the components with their original ids
+    net_ids = dict()
+    for saved in content['components']:
+        design._qcomponent_latest_assigned_id = saved['id'] - 1
+        component = _import_class(saved['class_name'])(design,
+                                                       saved['name'],
+                                                       options=saved['options'],
+                                                       make=rebuild)
+        if component.id != saved['id']:
+            design.logger.warning(
+                f'Component {saved["name"]} could not be loaded. '
+                f'{component._error_message}')
+            continue
+        component.metadata = Dict(saved['metadata'])
+        if rebuild:
+            continue
+
+        component.qgeometry_table_usage = Dict(saved['qgeometry_table_usage'])
+        for pin_name, pin in saved['pins'].items():
+            pin = Dict(pin)
+            for key in ['points', 'middle', 'normal', 'tangent']:
+                pin[key] = np.array(pin[key])
+            # Pins are connected after all the components are created, so that
+            # the pin_inputs of the components can be checked.
+            net_ids[(component.id, pin_name)] = pin.net_id
+            pin.net_id = 0
+            component.pins[pin_name] = pin
+        component._made = saved['made']
+        component.status = saved['status']
+
+    design._qcomponent_latest_assigned_id = content['latest_assigned_id']
+    design._qcomponent_latest_name_id = Dict(content['latest_name_id'])
+
+    # Dependencies added with add_dependency, the others come from pin_inputs
+    for child_id, parents in content['dependency_parents'].items():
+        for parent_id in parents:
+            if parent_id in design._components and int(
+                    child_id) in design._components:
+                design._add_dependency_id(parent_id, int(child_id))
+
+    if not rebuild:
+        for (component_id, pin_name), net_id in net_ids.items():
+            design._components[component_id].pins[pin_name].net_id = net_id
+        design._qnet._net_info = pd.DataFrame(content['net_info'],
+                                              columns=design._qnet.column_names)
+        design._qnet._qnet_latest_assigned_id = content[
+            'qnet_latest_assigned_id']
+
+        design._pin_input_parents = {
+            int(child_id): set(parents)
+            for child_id, parents in content['pin_input_parents'].items()
+        }
+        for component_id, names in content['component_variables'].items():
+            design._set_variables_read_by_component(int(component_id),
+                                                    set(names))
+
+        qgeometry = design.qgeometry
+        for table_name, table_info in content['qgeometry'].items():
+            qgeometry._tables[table_name] = _table_from_npz(
+                table_data[table_name], table_info['columns'],
+                table_info['json_columns'])
+
+    design.save_path = str(filename)
+    return design
@@ -169,12 +169,16 @@ Returns:
         'dict1': {'key1': 4e-06, '2mm': 0.1}}
 """
 
+from collections import OrderedDict
 from collections.abc import Iterable
 from collections.abc import Mapping
 from numbers import Number
 from typing import Union
 
 import ast
+import itertools
+import re
+import threading
 import numpy as np
 import pint
 
@@ -186,7 +190,12 @@ __all__ = [
     'is_numeric_possible',
     'is_for_ast_eval',
     'is_true',
-    'parse_options'
+    'parse_options',
+    'parse_value_cached',  # Memoized parse_value
+    'parse_cache_info',
+    'parse_cache_clear',
+    'VariablesDict',
+    'VariableUseRecorder'
 ]
 
 #########################################################################
@@ -219,6 +228,65 @@ UREG = pint.UnitRegistry()
 
 units = config.DefaultMetalOptions.default_generic.units
 
+# A number followed by an optional length unit, such as '0.25mm', '10 um' or '-1e6 nm'.
+# The sign has to be next to the number; other strings are left to pint.
+_NUMBER_WITH_UNIT = re.compile(
+    r'^\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)\s*([a-zA-Z]*)\s*$')
+
+# Power of ten of the length units in meters, for the units that can be converted
+# without pint. Unit names are case sensitive, as in pint ('Mm' is a megameter).
+_LENGTH_UNIT_EXPONENTS = {
+    'km': 3,
+    'm': 0,
+    'meter': 0,
+    'meters': 0,
+    'cm': -2,
+    'mm': -3,
+    'um': -6,
+    'micron': -6,
+    'microns': -6,
+    'nm': -9,
+    'pm': -12,
+}
+
+
+def _parse_string_to_float_fast(expr: str):
+    """Convert a number with an optional length unit, such as '0.25mm',
+    without pint.
+
+    Args:
+        expr (str): String expression such as '1nm'.
+
+    Returns:
+        float: Converted value, or None if the string has to be parsed by pint,
+        such as arithmetic ('2*10mm') or units not in _LENGTH_UNIT_EXPONENTS.
+    """
+    match = _NUMBER_WITH_UNIT.match(expr)
+    if match is None:
+        return None
+    number, unit = match.groups()
+
+    if not unit:
+        # As float(expr), since pint cannot convert a dimensionless number
+        return float(number)
+
+    if unit not in _LENGTH_UNIT_EXPONENTS or units not in _LENGTH_UNIT_EXPONENTS:
+        return None
+
+    if '.' in number or 'e' in number or 'E' in number:
+        magnitude = float(number)
+    else:
+        magnitude = int(number)
+
+    exponent = _LENGTH_UNIT_EXPONENTS[unit] - _LENGTH_UNIT_EXPONENTS[units]
+    if exponent == 0:
+        # Like pint, keep ints as ints: '100mm' is 100 when units are mm
+        return magnitude
+    if exponent > 0:
+        return magnitude * 10.0**exponent
+    # Dividing by the exact power of ten rounds better than multiplying by 1e-n
+    return magnitude / 10.0**-exponent
+
 
 def _parse_string_to_float(expr: str):
     """Extract the value of a string.
@@ -245,6 +313,23 @@ def _parse_string_to_float(expr: str):
     Raises:
         Exception: Errors in parsing
     """
+    if isinstance(expr, str):
+        # Most values are a number with a length unit, which do not need pint
+        value = _parse_string_to_float_fast(expr)
+        if value is not None:
+            return value
+    return _parse_string_to_float_with_pint(expr)
+
+
+def _parse_string_to_float_with_pint(expr: str):
+    """Extract the value of a string with pint. See _parse_string_to_float.
+
+    Args:
+        expr (str): String expression such as '2*130um'.
+
+    Returns:
+        float: Converted value, or expr if it is not convertable
+    """
     try:
         return UREG.Quantity(expr).to(units).magnitude
 
@@ -412,6 +497,183 @@ def parse_value(value: str, variable_dict: dict):
     return value
 
 
+#########################################################################
+# Memoized parsing
+
+# Source of the versions of all the VariablesDict. Versions are never reused, so
+# a version identifies the content of the variables across designs.
+_VERSIONS = itertools.count(1)
+
+
+class VariablesDict(Dict):
+    """Dict of design variables that gets a new `_version` whenever it is
+    changed.
+
+    The version is used as part of the key of the parse_value_cached cache, so
+    that the cached values are not used after a variable changes.
+    """
+
+    # Version of an empty dict that was not created by __init__, as in unpickling
+    _version = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._bump_version()
+
+    def _bump_version(self):
+        # Dict turns attribute assignments into items
+        object.__setattr__(self, '_version', next(_VERSIONS))
+
+    def __setitem__(self, name, value):
+        super().__setitem__(name, value)
+        self._bump_version()
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        self._bump_version()
+
+    def clear(self):
+        super().clear()
+        self._bump_version()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._bump_version()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._bump_version()
+        return item
+
+
+class VariableUseRecorder(Mapping):
+    """Read-only view of a dict of variables that records the names of the
+    variables that were looked up by parse_value.  Strings which look like
+    names, such as 'left', but are not variables are not recorded.
+    """
+
+    def __init__(self, variables: dict, used: set):
+        """
+        Args:
+            variables (dict): The variables.
+            used (set): Set to which the names of the variables looked up
+                        are added.
+        """
+        self.variables = variables
+        self.used = used
+
+    def __contains__(self, name):
+        if name in self.variables:
+            self.used.add(name)
+            return True
+        return False
+
+    def __getitem__(self, name):
+        value = self.variables[name]
+        self.used.add(name)
+        return value
+
+    def __iter__(self):
+        return iter(self.variables)
+
+    def __len__(self):
+        return len(self.variables)
+
+
+#: Maximum number of strings kept by parse_value_cached
+PARSE_CACHE_MAXSIZE = 8192
+
+# (value, units, variables version) -> (parsed value, names of the variables looked up)
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+_PARSE_CACHE_STATS = dict(hits=0, misses=0)
+
+
+def parse_value_cached(value: str, variable_dict: dict):
+    """Memoized version of parse_value.
+
+    Strings are looked up in a bounded LRU cache keyed on the string, the units
+    and the version of the variables. Mappings, lists and tuples are parsed
+    item by item. Only used when variable_dict is a
+    VariablesDict (or a VariableUseRecorder of one), since other dicts have no
+    version. Only numbers and strings are cached, since lists and dicts could be
+    changed by the caller.
+
+    Args:
+        value (str): String to parse
+        variable_dict (dict): dict pointer of variables
+
+    Return:
+        str, float, list, tuple, or ast eval: Parsed value, as parse_value
+    """
+    if isinstance(variable_dict, VariableUseRecorder):
+        recorder = variable_dict
+        variables = variable_dict.variables
+    else:
+        recorder = None
+        variables = variable_dict
+
+    if not isinstance(variables, VariablesDict):
+        return parse_value(value, variable_dict)
+
+    if isinstance(value, Mapping):
+        # Nested options, such as connection_pads
+        return Dict([key, parse_value_cached(item, variable_dict)]
+                    for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value)(
+            [parse_value_cached(item, variable_dict) for item in value])
+    if not isinstance(value, str):
+        return parse_value(value, variable_dict)
+
+    key = (value, units, variables._version)  # pylint: disable=protected-access
+    with _PARSE_CACHE_LOCK:
+        entry = _PARSE_CACHE.get(key)
+        if entry is not None:
+            _PARSE_CACHE.move_to_end(key)
+            _PARSE_CACHE_STATS['hits'] += 1
+        else:
+            _PARSE_CACHE_STATS['misses'] += 1
+
+    if entry is None:
+        used = set()
+        result = parse_value(value, VariableUseRecorder(variables, used))
+        if isinstance(result, (Number, str)):
+            with _PARSE_CACHE_LOCK:
+                _PARSE_CACHE[key] = (result, frozenset(used))
+                if len(_PARSE_CACHE) > PARSE_CACHE_MAXSIZE:
+                    _PARSE_CACHE.popitem(last=False)
+    else:
+        result, used = entry
+
+    if recorder is not None:
+        # The variables looked up are recorded on hits as well
+        recorder.used.update(used)
+    return result
+
+
+def parse_cache_info() -> Dict:
+    """Statistics of the parse_value_cached cache.
+
+    Returns:
+        Dict: hits, misses, currsize and maxsize of the cache
+    """
+    with _PARSE_CACHE_LOCK:
+        return Dict(hits=_PARSE_CACHE_STATS['hits'],
+                    misses=_PARSE_CACHE_STATS['misses'],
+                    currsize=len(_PARSE_CACHE),
+                    maxsize=PARSE_CACHE_MAXSIZE)
+
+
+def parse_cache_clear():
+    """Empty the parse_value_cached cache and reset its statistics."""
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE.clear()
+        _PARSE_CACHE_STATS['hits'] = 0
+        _PARSE_CACHE_STATS['misses'] = 0
+
+
 def parse_options(params: dict, parse_names: str, variable_dict=None):
     """
     Calls parse_value to extract from a dictionary a small subset of values.
@@ -439,6 +701,6 @@ def parse_options(params: dict, parse_names: str, variable_dict=None):
             continue
 
         # option_dict[name] should be a string
-        res += [parse_value(params[name], variable_dict)]
+        res += [parse_value_cached(params[name], variable_dict)]
 
     return res
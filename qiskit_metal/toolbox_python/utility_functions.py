@@ -24,6 +24,7 @@ import warnings
 from copy import deepcopy
 from typing import TYPE_CHECKING, Tuple
 
+import numpy as np
 import pandas as pd
 
 from qiskit_metal.draw import Vector
@@ -36,7 +37,8 @@ __all__ = [
     'enable_warning_traceback', 'get_traceback', 'print_traceback_easy',
     'log_error_easy', 'monkey_patch', 'can_write_to_path',
     'can_write_to_path_with_warning', 'toggle_numbers', 'bad_fillet_idxs',
-    'compress_vertex_list', 'get_range_of_vertex_to_not_fillet'
+    'compress_vertex_list', 'get_range_of_vertex_to_not_fillet',
+    'fillet_path_points'
 ]
 
 ####################################################################################
@@ -441,6 +443,82 @@ def get_range_of_vertex_to_not_fillet(coords: list,
     return compressed_vertex
 
 
+def fillet_path_points(coords: np.ndarray,
+                       fradius: float,
+                       skip: list = (),
+                       points: int = 16) -> np.ndarray:
+    """Replace every corner of a linestring by an arc of the fillet radius,
+    for all the corners at once.
+
+    The arc of a corner starts at fradius from the corner, on the segment
+    before it, and has `points` vertices.  A corner is kept as is if its index
+    is in skip, if a segment next to it has no length, or if it is straight.
+
+    Args:
+        coords (np.ndarray): Vertices of the linestring, of shape (N, 2).
+        fradius (float): Fillet radius.
+        skip (list): Indices of the corners not to fillet, such as the
+            return of bad_fillet_idxs().  Defaults to ().
+        points (int): Number of vertices in the arc of a corner.
+            Defaults to 16.
+
+    Returns:
+        np.ndarray: Vertices of the filleted linestring, of shape (M, 2).
+    """
+    # pylint: disable=too-many-locals
+    coords = np.asarray(coords, dtype=float)
+    if len(coords) < 3:
+        return coords.copy()
+
+    start, corner, end = coords[:-2], coords[1:-1], coords[2:]
+    incoming = start - corner
+    outgoing = end - corner
+    len_in = np.hypot(incoming[:, 0], incoming[:, 1])
+    len_out = np.hypot(outgoing[:, 0], outgoing[:, 1])
+
+    # Angle between the two segments of the corner.
+    is_fillet = (len_in > 0) & (len_out > 0)
+    end_angle = np.zeros(len(corner))
+    end_angle[is_fillet] = np.arccos(
+        np.einsum('ij,ij->i', incoming[is_fillet], outgoing[is_fillet]) /
+        (len_in[is_fillet] * len_out[is_fillet]))
+    is_straight = (end_angle == 0) | (end_angle == np.pi)
+    is_fillet &= ~is_straight & np.isfinite(end_angle)
+    skip = np.asarray(skip, dtype=int) - 1
+    is_fillet[skip[(skip >= 0) & (skip < len(corner))]] = False
+
+    # The arc is along the axis of the segment before the corner, then turns
+    # to the other axis.
+    rows = np.arange(len(corner))
+    axis = np.argmax(np.abs(incoming), axis=1)
+    other = 1 - axis
+    goes_along = corner[rows, axis] > start[rows, axis]
+    goes_across = end[rows, other] > corner[rows, other]
+    sign = np.column_stack([goes_along, goes_across])
+    flip = (axis == 1) & (sign[:, 0] != sign[:, 1])
+    sign[flip] = ~sign[flip]
+    sign = sign * 2 - 1
+
+    safe_len_in = np.where(is_fillet, len_in, 1)
+    fillet_start = fradius / safe_len_in[:, None] * incoming + corner
+    step = np.where(is_fillet, end_angle / points, 1)
+    sizes = np.where(is_fillet, points, 1)
+
+    # One row per vertex of the output, between the two endpoints.
+    owner = np.repeat(rows, sizes)
+    theta = (np.arange(len(owner)) -
+             (np.cumsum(sizes) - sizes)[owner]) * step[owner]
+    along = np.sin(theta) * fradius
+    across = fradius - np.cos(theta) * fradius
+    delta = np.where((axis[owner] == 0)[:, None],
+                     np.column_stack([along, across]),
+                     np.column_stack([across, along]))
+    arcs = fillet_start[owner] + sign[owner] * delta
+    arcs[~is_fillet[owner]] = corner[owner][~is_fillet[owner]]
+
+    return np.concatenate([coords[:1], arcs, coords[-1:]])
+
+
 def compress_vertex_list(individual_vertex: list) -> list:
     """Given a list of vertices that should not be fillet'd, search for a range
     and make them one compressed list. If the vertex is a point and not a line